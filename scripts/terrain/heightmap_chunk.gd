@@ -205,7 +205,11 @@ func _create_material(data: HeightmapData, splatmap2_img: Image, splatmap3_img:
 			mat.set_shader_parameter("albedo_" + suffix, layer.albedo_texture)
 		if layer.normal_texture:
 			mat.set_shader_parameter("normal_" + suffix, layer.normal_texture)
-		if layer.roughness_texture:
+		if layer.orm_texture:
+			# Baked ORM: roughness lives in G, no separate roughness map
+			mat.set_shader_parameter("roughness_" + suffix, layer.orm_texture)
+			mat.set_shader_parameter("roughness_channel_" + suffix, Vector4(0.0, 1.0, 0.0, 0.0))
+		elif layer.roughness_texture:
 			mat.set_shader_parameter("roughness_" + suffix, layer.roughness_texture)
 		if layer.metallic_texture:
 			mat.set_shader_parameter("metallic_" + suffix, layer.metallic_texture)
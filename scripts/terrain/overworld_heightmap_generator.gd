@@ -980,9 +980,11 @@ static func _add_textured_layers(data: HeightmapData) -> void:
 		layer.name = def["label"]
 		layer.uv_scale = def["uv"]
 		var base_path: String = _TERRAIN_LIB + def["folder"] + "/" + def["base"]
-		layer.albedo_texture = _find_texture(base_path, "-B")
-		layer.normal_texture = _find_texture(base_path, "-N")
-		layer.roughness_texture = _find_texture(base_path, "-R")
+		# Baked tiers (tools/bake_terrain_textures.py) replace albedo/normal/roughness
+		if not layer.apply_bake(def["folder"]):
+			layer.albedo_texture = _find_texture(base_path, "-B")
+			layer.normal_texture = _find_texture(base_path, "-N")
+			layer.roughness_texture = _find_texture(base_path, "-R")
 		layer.metallic_texture = _find_texture(base_path, "-M")
 		if not layer.albedo_texture:
 			print("[TerrainTex] WARNING: no albedo for layer %d (%s) at %s" % [i, def["label"], base_path])
@@ -22,8 +22,9 @@ enum CollisionType { NONE, BLOCKING }  ## NONE = visual only, BLOCKING = player
 @export var align_to_normal: bool = false  ## Tilt prop to match terrain normal
 
 @export_group("LOD")
-## Distance at which this prop becomes invisible. 0 = no culling.
-## Typical values: trees 120, rocks 80, bushes 60, grass 40.
+## Distance at which this prop switches to its coarsest <name>_lodN.glb
+## sibling (tools/decimate_glb_lods.py). Props are never distance-culled.
+## 0 = switch every 30 m. Typical values: trees 120, rocks 80, bushes 60, grass 40.
 @export var lod_distance: float = 0.0
 
 @export_group("Island")
@@ -7,6 +7,8 @@ extends Node3D
 const _COLLISION_CYLINDER_RADIUS := 0.5
 const _COLLISION_CYLINDER_HEIGHT := 3.0
 const _WIND_SHADER_PATH := "res://shaders/foliage_wind.gdshader"
+const _MAX_LOD_LEVELS := 3  ## Sibling <name>_lod1.glb .. _lod3.glb (tools/decimate_glb_lods.py)
+const _LOD_STEP := 30.0  ## Metres per LOD level when a prop has no lod_distance
 static var _wind_shader: Shader = null
 
 
@@ -123,11 +125,15 @@ static func scatter_chunk(data: HeightmapData, cx: int, cz: int, seed_offset: in
 			else:
 				transforms.append(xform)
 
-		# Create MultiMeshInstance3D for visual-only props
+		# Create MultiMeshInstance3D for visual-only props (one per LOD level)
 		if not transforms.is_empty():
-			var mmi := _create_multimesh(prop.scene_path, transforms, prop.affected_by_wind)
-			if mmi:
-				root.add_child(mmi)
+			var lod_paths: Array[String] = _lod_scene_paths(prop.scene_path)
+			for li in range(lod_paths.size()):
+				var mmi := _create_multimesh(lod_paths[li], transforms, prop.affected_by_wind)
+				if mmi:
+					if lod_paths.size() > 1:
+						_set_lod_range(mmi, li, lod_paths.size(), prop.lod_distance)
+					root.add_child(mmi)
 
 		# Create individual StaticBody3D for blocking props
 		for bi in range(blocking_transforms.size()):
@@ -216,6 +222,31 @@ static func _create_multimesh(scene_path: String, transforms: Array[Transform3D]
 	return mmi
 
 
+static func _lod_scene_paths(scene_path: String) -> Array[String]:
+	## Returns [scene_path] followed by any decimated <name>_lodN.glb siblings.
+	var paths: Array[String] = [scene_path]
+	var base: String = scene_path.get_basename()
+	for level in range(1, _MAX_LOD_LEVELS + 1):
+		var lod_path: String = "%s_lod%d.glb" % [base, level]
+		if not ResourceLoader.exists(lod_path):
+			break
+		paths.append(lod_path)
+	return paths
+
+
+static func _set_lod_range(mmi: MultiMeshInstance3D, level: int, level_count: int,
+		lod_distance: float) -> void:
+	## Switches evenly between the prop's LOD levels up to lod_distance, where
+	## the coarsest level takes over. That level has no end distance, so a
+	## prop is visible as far as it would be without LOD siblings. Ranges are
+	## measured from the MultiMesh AABB, so levels switch per chunk.
+	var switches: int = level_count - 1
+	var step: float = lod_distance / float(switches) if lod_distance > 0.0 else _LOD_STEP
+	mmi.visibility_range_begin = step * float(level)
+	if level < switches:
+		mmi.visibility_range_end = step * float(level + 1)
+
+
 static func _create_blocking_prop(scene_path: String, xform: Transform3D,
 		use_wind: bool = false) -> StaticBody3D:
 	## Creates a StaticBody3D with visual mesh + simple collision at the given transform.
@@ -2,9 +2,45 @@ class_name TerrainTextureLayer
 extends Resource
 ## Configuration for a single terrain texture layer used by the splatmap shader.
 
+const BAKE_MANIFEST_PATH := "res://assets/terrain_textures/baked/terrain_bake_manifest.json"
+
 @export var name: String = ""
 @export var albedo_texture: Texture2D
 @export var normal_texture: Texture2D
 @export var roughness_texture: Texture2D
 @export var metallic_texture: Texture2D
+@export var orm_texture: Texture2D  ## Packed AO (R), roughness (G), height (B) — see tools/bake_terrain_textures.py
 @export var uv_scale: float = 10.0  ## How many times the texture tiles per chunk
+
+## Lazy-loaded terrain_bake_manifest.json
+static var _bake_manifest: Dictionary = {}
+
+
+func apply_bake(layer_name: String, max_size: int = 1024) -> bool:
+	## Points albedo/normal/ORM at the baked textures of [param layer_name],
+	## using the largest tier not above [param max_size], and drops
+	## roughness_texture (the ORM's G channel replaces it). Returns false and
+	## leaves the layer unchanged when that layer has not been baked.
+	var layers: Dictionary = _load_bake_manifest().get("layers", {})
+	var tiers: Dictionary = layers.get(layer_name, {}).get("tiers", {})
+	var best: int = 0
+	for key: String in tiers:
+		var size: int = int(key)
+		if size <= max_size and size > best:
+			best = size
+	if best == 0:
+		return false
+	var files: Dictionary = tiers[str(best)]
+	albedo_texture = load(files["B"]) as Texture2D
+	normal_texture = load(files["N"]) as Texture2D
+	orm_texture = load(files["ORM"]) as Texture2D
+	roughness_texture = null
+	return true
+
+
+static func _load_bake_manifest() -> Dictionary:
+	if _bake_manifest.is_empty() and FileAccess.file_exists(BAKE_MANIFEST_PATH):
+		var parsed: Variant = JSON.parse_string(FileAccess.get_file_as_string(BAKE_MANIFEST_PATH))
+		if parsed is Dictionary:
+			_bake_manifest = parsed
+	return _bake_manifest
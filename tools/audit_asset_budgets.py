@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""Audit geometry and texture budgets for every model under assets/models.
+
+Parses each .glb (via pygltflib) and .obj (plus its .mtl) and records
+triangles, vertices, vertex/index buffer size, material count and texture
+memory. Each file is checked against the budget of its category (the first
+folder under assets/models). Results are cached by content hash in
+tools/.cache so only changed files are re-parsed (an OBJ also when its .mtl
+or textures change), and parsing runs in a process pool. Texture maps that
+resolve to no file are listed in the summary.
+
+Writes a CSV report to tools/.cache/asset_budget_report.csv (sortable in any
+spreadsheet) and prints the heaviest files.
+
+Usage:
+    python tools/audit_asset_budgets.py                     # full audit, write report
+    python tools/audit_asset_budgets.py --over-budget       # only list files over budget
+    python tools/audit_asset_budgets.py --sort=vertices     # sort column (default: triangles)
+    python tools/audit_asset_budgets.py --category=Nature   # restrict to one category
+    python tools/audit_asset_budgets.py --dry-run           # print only, don't write CSV
+    python tools/audit_asset_budgets.py --no-cache          # re-parse everything
+"""
+
+import csv
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PureWindowsPath
+
+from PIL import Image
+
+from glb_mesh import load_glb
+from mtl_file import read_mtl_maps
+from tool_cache import CACHE_DIR, FileCache, arg_value, cache_key
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MODELS_DIR = PROJECT_ROOT / "assets" / "models"
+REPORT_PATH = CACHE_DIR / "asset_budget_report.csv"
+
+# Bump when the statistics computed per file change
+CACHE_VERSION = "2"
+
+MODEL_EXTENSIONS = {".glb", ".obj"}
+
+# Estimated GPU bytes per texel (RGBA8) including a full mip chain (+1/3)
+TEXEL_BYTES = 4
+MIP_CHAIN_FACTOR = 4 / 3
+
+# glTF primitive modes
+MODE_TRIANGLES = 4
+MODE_TRIANGLE_STRIP = 5
+MODE_TRIANGLE_FAN = 6
+
+# --- Per-category budgets (per file, keyed like the report columns) ---
+# Nature props are instanced in bulk, so they get the tightest limits.
+BUDGETS = {
+    "Nature": {
+        "triangles": 2500, "vertices": 4000, "buffer_kb": 192,
+        "materials": 2, "texture_kb": 256,
+    },
+    "House": {
+        "triangles": 6000, "vertices": 10000, "buffer_kb": 512,
+        "materials": 4, "texture_kb": 512,
+    },
+    "Furniture and props": {
+        "triangles": 4000, "vertices": 6000, "buffer_kb": 320,
+        "materials": 3, "texture_kb": 256,
+    },
+    "Weapons and tools": {
+        "triangles": 4000, "vertices": 6000, "buffer_kb": 320,
+        "materials": 3, "texture_kb": 256,
+    },
+    "characters": {
+        "triangles": 15000, "vertices": 20000, "buffer_kb": 2048,
+        "materials": 8, "texture_kb": 2048,
+    },
+}
+DEFAULT_BUDGET = BUDGETS["Furniture and props"]
+
+REPORT_COLUMNS = [
+    "path", "category", "format", "triangles", "vertices", "buffer_kb",
+    "materials", "textures", "texture_kb", "file_kb", "over_budget",
+]
+
+
+# ─── texture helpers ─────────────────────────────────────────────────────────
+
+def _texture_kb(width: int, height: int) -> float:
+    return width * height * TEXEL_BYTES * MIP_CHAIN_FACTOR / 1024
+
+
+def _image_size_from_bytes(data: bytes) -> tuple[int, int]:
+    with Image.open(io.BytesIO(data)) as img:
+        return img.size
+
+
+def _image_size_from_file(path: Path) -> tuple[int, int]:
+    with Image.open(path) as img:
+        return img.size
+
+
+# ─── GLB analysis ────────────────────────────────────────────────────────────
+
+def _triangle_count(index_count: int, mode: int) -> int:
+    if mode == MODE_TRIANGLES:
+        return index_count // 3
+    if mode in (MODE_TRIANGLE_STRIP, MODE_TRIANGLE_FAN):
+        return max(0, index_count - 2)
+    return 0  # points / lines
+
+
+def analyse_glb(path: Path) -> dict:
+    gltf = load_glb(str(path))
+    triangles = 0
+    vertices = 0
+    geometry_views = set()
+
+    for mesh in gltf.meshes or []:
+        for prim in mesh.primitives:
+            mode = MODE_TRIANGLES if prim.mode is None else prim.mode
+            pos = prim.attributes.POSITION
+            vcount = gltf.accessors[pos].count if pos is not None else 0
+            vertices += vcount
+            if prim.indices is not None:
+                triangles += _triangle_count(gltf.accessors[prim.indices].count, mode)
+                geometry_views.add(gltf.accessors[prim.indices].bufferView)
+            else:
+                triangles += _triangle_count(vcount, mode)
+            for acc_idx in vars(prim.attributes).values():
+                if acc_idx is not None:
+                    geometry_views.add(gltf.accessors[acc_idx].bufferView)
+
+    buffer_bytes = sum(
+        gltf.bufferViews[bv].byteLength for bv in geometry_views if bv is not None
+    )
+
+    texture_kb = 0.0
+    blob = gltf.binary_blob()
+    for img in gltf.images or []:
+        try:
+            if img.bufferView is not None:
+                bv = gltf.bufferViews[img.bufferView]
+                start = bv.byteOffset or 0
+                w, h = _image_size_from_bytes(blob[start:start + bv.byteLength])
+            elif img.uri and not img.uri.startswith("data:"):
+                w, h = _image_size_from_file(path.parent / img.uri)
+            else:
+                continue
+        except (OSError, ValueError):
+            continue
+        texture_kb += _texture_kb(w, h)
+
+    return {
+        "format": "glb",
+        "triangles": triangles,
+        "vertices": vertices,
+        "buffer_kb": round(buffer_bytes / 1024, 1),
+        "materials": len(gltf.materials or []),
+        "textures": len(gltf.images or []),
+        "texture_kb": round(texture_kb, 1),
+    }
+
+
+# ─── OBJ analysis ────────────────────────────────────────────────────────────
+
+def _mtl_textures(mtl_path: Path) -> tuple[list[Path], list[str]]:
+    """(texture files a .mtl maps, map paths that resolve to no file)."""
+    textures = []
+    unresolved = []
+    for _material, _keyword, raw, path in read_mtl_maps(mtl_path):
+        if path is None:
+            unresolved.append(raw)
+        else:
+            textures.append(path)
+    return textures, unresolved
+
+
+def analyse_obj(path: Path) -> dict:
+    triangles = 0
+    corners = set()  # unique (v, vt, vn) tuples = GPU vertex count after splitting
+    materials = set()
+    mtl_files = []
+    normals = texcoords = 0
+
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.startswith("vn "):
+                normals += 1
+            elif line.startswith("vt "):
+                texcoords += 1
+            elif line.startswith("f "):
+                refs = line.split()[1:]
+                triangles += max(0, len(refs) - 2)
+                corners.update(refs)
+            elif line.startswith("usemtl "):
+                materials.add(line[7:].strip())
+            elif line.startswith("mtllib "):
+                mtl_files.append(path.parent / line[7:].strip())
+
+    # float32 position + normal + uv per split vertex, uint32 indices
+    vertex_stride = 12 + (12 if normals else 0) + (8 if texcoords else 0)
+    buffer_bytes = len(corners) * vertex_stride + triangles * 3 * 4
+
+    textures = []
+    unresolved = []
+    dependencies = list(mtl_files)
+    for mtl in mtl_files:
+        found, missing = _mtl_textures(mtl)
+        textures.extend(found)
+        unresolved.extend(f"{mtl.name}: {m}" for m in missing)
+        # A missing map starts counting as soon as its file appears next to the .mtl
+        dependencies.extend(mtl.parent / PureWindowsPath(m).name for m in missing)
+    texture_kb = 0.0
+    for tex in textures:
+        try:
+            texture_kb += _texture_kb(*_image_size_from_file(tex))
+        except OSError:
+            continue
+
+    return {
+        "format": "obj",
+        "triangles": triangles,
+        "vertices": len(corners),
+        "buffer_kb": round(buffer_bytes / 1024, 1),
+        "materials": len(materials),
+        "textures": len(textures),
+        "texture_kb": round(texture_kb, 1),
+        "unresolved_maps": unresolved,
+        # The .mtl and texture files feed the stats too; audit() keys the cache on them
+        "dependencies": [str(p) for p in dependencies + textures],
+    }
+
+
+def analyse_file(path_str: str) -> dict:
+    """Process-pool entry point: return stats for one model file."""
+    path = Path(path_str)
+    try:
+        if path.suffix.lower() == ".glb":
+            stats = analyse_glb(path)
+        else:
+            stats = analyse_obj(path)
+    except Exception as e:
+        return {"error": str(e)}
+    stats["file_kb"] = round(os.path.getsize(path) / 1024, 1)
+    return stats
+
+
+# ─── budgets ─────────────────────────────────────────────────────────────────
+
+def category_of(path: Path) -> str:
+    """First folder below assets/models, e.g. 'Nature' or 'characters'."""
+    try:
+        return path.relative_to(MODELS_DIR).parts[0]
+    except (ValueError, IndexError):
+        return ""
+
+
+def budget_violations(stats: dict, category: str) -> list[str]:
+    budget = BUDGETS.get(category, DEFAULT_BUDGET)
+    over = []
+    for field, limit in budget.items():
+        if stats.get(field, 0) > limit:
+            over.append(f"{field} {stats[field]} > {limit}")
+    return over
+
+
+# ─── main ────────────────────────────────────────────────────────────────────
+
+def collect_model_files() -> list[Path]:
+    files = []
+    for root, _dirs, names in os.walk(MODELS_DIR):
+        for name in names:
+            if Path(name).suffix.lower() in MODEL_EXTENSIONS:
+                files.append(Path(root) / name)
+    return sorted(files)
+
+
+def _dependency_digest(dep_cache: FileCache, path: Path) -> str | None:
+    """Content hash of a file an OBJ's stats depend on (None if it is missing)."""
+    try:
+        if dep_cache.lookup(path) is None:
+            dep_cache.store(path, True)
+        return dep_cache.digest(path)
+    except FileNotFoundError:
+        return None
+
+
+def _dependencies_match(stats: dict, dep_cache: FileCache) -> bool:
+    return all(_dependency_digest(dep_cache, PROJECT_ROOT / key) == digest
+               for key, digest in stats.get("dependencies", {}).items())
+
+
+def audit(files: list[Path], use_cache: bool = True, jobs: int = None,
+          prune: bool = True) -> list[dict]:
+    """Return one row per file, re-parsing only files whose content changed.
+
+    prune drops cache entries for files not in `files`; pass False when
+    auditing a filtered subset.
+    """
+    cache = FileCache("asset_audit", CACHE_VERSION, enabled=use_cache)
+    # .mtl and texture files of the OBJs, hashed once per change like the models
+    dep_cache = FileCache("asset_audit_deps", CACHE_VERSION, enabled=use_cache)
+    results = {}
+    pending = []
+    for path in files:
+        cached = cache.lookup(path)
+        if cached is None or not _dependencies_match(cached, dep_cache):
+            pending.append(path)
+        else:
+            results[path] = cached
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for path, stats in zip(pending, pool.map(analyse_file, map(str, pending))):
+                if "dependencies" in stats:
+                    stats["dependencies"] = {cache_key(d): _dependency_digest(dep_cache, Path(d))
+                                             for d in stats["dependencies"]}
+                results[path] = stats
+                if "error" not in stats:
+                    cache.store(path, stats)
+
+    if prune:
+        cache.prune(files)
+        dep_cache.prune([PROJECT_ROOT / key for stats in results.values()
+                         for key in stats.get("dependencies", {})])
+    cache.save()
+    dep_cache.save()
+    print(f"Parsed {len(pending)} file(s), {len(files) - len(pending)} from cache")
+
+    rows = []
+    for path in files:
+        stats = results[path]
+        category = category_of(path)
+        row = {"path": cache_key(path), "category": category}
+        row.update(stats)
+        if "error" not in stats:
+            row["over_budget"] = "; ".join(budget_violations(stats, category))
+        rows.append(row)
+    return rows
+
+
+def main():
+    dry_run = "--dry-run" in sys.argv
+    over_only = "--over-budget" in sys.argv
+    use_cache = "--no-cache" not in sys.argv
+    sort_key = arg_value("sort", "triangles")
+    category = arg_value("category")
+    jobs = int(arg_value("jobs", "0")) or None
+
+    if sort_key not in REPORT_COLUMNS:
+        print(f"Unknown sort column '{sort_key}'. Choose from: {', '.join(REPORT_COLUMNS)}")
+        sys.exit(1)
+
+    files = collect_model_files()
+    if category:
+        files = [f for f in files if category_of(f) == category]
+    print(f"Auditing {len(files)} model file(s)...")
+
+    rows = audit(files, use_cache, jobs, prune=not category)
+    errors = [r for r in rows if "error" in r]
+    rows = [r for r in rows if "error" not in r]
+    rows.sort(key=lambda r: r[sort_key], reverse=sort_key not in ("path", "category", "format"))
+    over = [r for r in rows if r["over_budget"]]
+
+    shown = over if over_only else rows
+    print(f"\n{'triangles':>9} {'verts':>7} {'buf KB':>8} {'mat':>3} {'tex KB':>8}  path")
+    for r in shown:
+        flag = "  !! " + r["over_budget"] if r["over_budget"] else ""
+        print(f"{r['triangles']:>9} {r['vertices']:>7} {r['buffer_kb']:>8} "
+              f"{r['materials']:>3} {r['texture_kb']:>8}  {r['path']}{flag}")
+
+    print(f"\nResults:")
+    print(f"  Files audited:    {len(rows)}")
+    print(f"  Over budget:      {len(over)}")
+    print(f"  Errors:           {len(errors)}")
+    for e in errors:
+        print(f"    {e['path']}: {e['error']}")
+    unresolved = [(r["path"], m) for r in rows for m in r.get("unresolved_maps", [])]
+    print(f"  Unresolved maps:  {len(unresolved)} (texture_kb leaves them out)")
+    for path, m in unresolved:
+        print(f"    {path}: {m}")
+
+    if not dry_run:
+        REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(REPORT_PATH, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nReport written to: {REPORT_PATH}")
+    else:
+        print("\n(dry run — no file written)")
+
+    if over:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""Bake terrain PBR maps into packed, tiered textures for the splatmap shader.
+
+Each layer folder under assets/terrain_textures/ holds full-resolution
+maps (basecolor, normal, roughness, AO, height) next to source archives
+and .blend/.usdc files. For every layer this tool:
+  - picks one source per map role (the <Layer>-B/-N/-R files the game
+    already loads win; otherwise the material's own basecolor/normal/... maps)
+  - packs AO, roughness and height into one ORM texture
+    (R = ambient occlusion, G = roughness, B = height)
+  - writes albedo, normal and ORM at every resolution tier up to the
+    source size (2048 / 1024 / 512; sources are never upscaled)
+
+Tiers are built as a mip chain, halving with a 2x2 box filter: albedo is
+averaged in linear light, normals are averaged as vectors and
+renormalised, ORM channels are averaged linearly. Sources that are not a
+power of two are first resampled to the nearest one.
+
+Output goes to assets/terrain_textures/baked/<tier>/<Layer>-{B,N,ORM}.png
+with terrain_bake_manifest.json listing, per layer, the res:// path of
+every map at every tier (read by TerrainTextureLayer.apply_bake). A layer
+is re-baked only when one of its chosen sources changed. Bakes run in a
+process pool.
+
+Usage:
+    python tools/bake_terrain_textures.py                 # dry run: show the chosen sources
+    python tools/bake_terrain_textures.py --apply         # bake every layer
+    python tools/bake_terrain_textures.py --apply Grass Sand   # only these layers
+    python tools/bake_terrain_textures.py --tiers=1024,512     # restrict tiers
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from tool_cache import FileCache, arg_value, cache_key
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TERRAIN_DIR = PROJECT_ROOT / "assets" / "terrain_textures"
+BAKED_DIR = TERRAIN_DIR / "baked"
+MANIFEST_PATH = BAKED_DIR / "terrain_bake_manifest.json"
+
+# Bump when the baked output changes for identical sources
+BAKE_VERSION = "1"
+DEFAULT_TIERS = (2048, 1024, 512)
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+
+# Candidate file stems per map role, most preferred first (searched in the
+# lower-cased stem). {layer} is the folder name.
+ROLE_PATTERNS = {
+    "albedo": [r"^{layer}-b$", r"(basecolor|_color)$"],
+    "normal": [r"^{layer}-n$", r"normalgl$", r"(_normal|_norm|_nrm)$"],
+    "roughness": [r"^{layer}-r$", r"(roughness|_rough)$"],
+    "ao": [r"(ambientocclusion|_occ)$"],
+    "height": [r"(_height|_height \(1\)|_displacement|_disp)$"],
+}
+# Used when a layer has no map for the role
+ORM_DEFAULTS = {"ao": 255, "roughness": 255, "height": 128}
+
+# Estimated GPU bytes per texel (RGBA8) including a full mip chain (+1/3)
+TEXEL_BYTES = 4
+MIP_CHAIN_FACTOR = 4 / 3
+
+
+# ─── source discovery ────────────────────────────────────────────────────────
+
+def find_layer_maps(layer_dir: Path) -> dict:
+    """Return {role: Path} for the best source of each map role in a layer folder."""
+    stems = {}
+    for p in sorted(layer_dir.iterdir()):
+        if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS:
+            stems[p] = p.stem.lower()
+
+    layer = re.escape(layer_dir.name.lower())
+    maps = {}
+    for role, patterns in ROLE_PATTERNS.items():
+        for pattern in patterns:
+            regex = re.compile(pattern.format(layer=layer))
+            match = next((p for p, s in stems.items() if regex.search(s)), None)
+            if match:
+                maps[role] = match
+                break
+    return maps
+
+
+def collect_layers(names: list[str]) -> list[Path]:
+    layers = []
+    for p in sorted(TERRAIN_DIR.iterdir()):
+        if p.is_dir() and p != BAKED_DIR and (not names or p.name in names):
+            layers.append(p)
+    return layers
+
+
+# ─── image maths ─────────────────────────────────────────────────────────────
+
+def srgb_to_linear(c: np.ndarray) -> np.ndarray:
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(c: np.ndarray) -> np.ndarray:
+    c = np.clip(c, 0.0, 1.0)
+    return np.where(c <= 0.0031308, c * 12.92, 1.055 * c ** (1 / 2.4) - 0.055)
+
+
+def _pot(n: int) -> int:
+    """Nearest power of two (ties round up)."""
+    lower = 1 << (n.bit_length() - 1)
+    return lower if n - lower < lower * 2 - n else lower * 2
+
+
+def load_channels(path: Path, mode: str, size: int = 0) -> np.ndarray:
+    """Load as float32 in [0, 1], resampled to size x size (default: nearest power of two)."""
+    with Image.open(path) as img:
+        img = img.convert(mode)
+        size = size or _pot(max(img.size))
+        if img.size != (size, size):
+            img = img.resize((size, size), Image.LANCZOS)
+        return np.asarray(img, dtype=np.float32) / 255
+
+
+def halve(img: np.ndarray) -> np.ndarray:
+    """2x2 box filter."""
+    h, w = img.shape[:2]
+    return img.reshape(h // 2, 2, w // 2, 2, *img.shape[2:]).mean(axis=(1, 3))
+
+
+def mip_chain(img: np.ndarray, sizes: list[int], kind: str) -> dict:
+    """Return {size: uint8 image} for each wanted size <= the source size.
+
+    kind: "srgb" (albedo), "normal" or "linear".
+    """
+    if kind == "srgb":
+        work = srgb_to_linear(img)
+    elif kind == "normal":
+        work = img * 2 - 1
+    else:
+        work = img
+
+    out = {}
+    size = work.shape[0]
+    while size >= min(sizes):
+        if size in sizes:
+            if kind == "srgb":
+                level = linear_to_srgb(work)
+            elif kind == "normal":
+                n = work / np.maximum(np.linalg.norm(work, axis=2, keepdims=True), 1e-6)
+                level = n * 0.5 + 0.5
+            else:
+                level = work
+            out[size] = np.clip(np.round(level * 255), 0, 255).astype(np.uint8)
+        if size == 1:
+            break
+        work = halve(work)
+        size //= 2
+    return out
+
+
+# ─── baking ──────────────────────────────────────────────────────────────────
+
+def tier_path(tier: int, layer: str, suffix: str) -> Path:
+    return BAKED_DIR / str(tier) / f"{layer}-{suffix}.png"
+
+
+def bake_layer(layer: str, maps: dict, tiers: list[int]) -> dict:
+    """Process-pool entry point: bake one layer, return its manifest tiers."""
+    try:
+        albedo = load_channels(Path(maps["albedo"]), "RGB")
+        size = albedo.shape[0]
+        # Every other map is resampled to the albedo's size
+        normal = (load_channels(Path(maps["normal"]), "RGB", size) if "normal" in maps
+                  else np.tile(np.array([0.5, 0.5, 1.0], np.float32), (size, size, 1)))
+
+        orm = np.empty((size, size, 3), dtype=np.float32)
+        for channel, role in enumerate(("ao", "roughness", "height")):
+            if role in maps:
+                orm[..., channel] = load_channels(Path(maps[role]), "L", size)
+            else:
+                orm[..., channel] = ORM_DEFAULTS[role] / 255
+
+        outputs = {}
+        for suffix, img, kind in (("B", albedo, "srgb"), ("N", normal, "normal"), ("ORM", orm, "linear")):
+            for tier, level in mip_chain(img, tiers, kind).items():
+                path = tier_path(tier, layer, suffix)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                Image.fromarray(level, "RGB").save(path, optimize=True)
+                outputs.setdefault(str(tier), {})[suffix] = f"res://{cache_key(path)}"
+    except Exception as e:
+        return {"error": str(e)}
+    return {"source_size": size, "tiers": outputs}
+
+
+def texture_bytes(size: int) -> int:
+    return int(size * size * TEXEL_BYTES * MIP_CHAIN_FACTOR)
+
+
+def current_bytes(layer_dir: Path) -> int:
+    """Memory of the maps the game loads today (<Layer>-B/-N/-R)."""
+    total = 0
+    for suffix in ("B", "N", "R"):
+        for ext in (".png", ".jpg"):
+            p = layer_dir / f"{layer_dir.name}-{suffix}{ext}"
+            if p.exists():
+                with Image.open(p) as img:
+                    total += texture_bytes(max(img.size))
+                break
+    return total
+
+
+# ─── main ────────────────────────────────────────────────────────────────────
+
+def load_manifest() -> dict:
+    if MANIFEST_PATH.exists():
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def main():
+    apply = "--apply" in sys.argv
+    tiers = sorted((int(t) for t in arg_value("tiers", ",".join(map(str, DEFAULT_TIERS))).split(",")),
+                   reverse=True)
+    jobs = int(arg_value("jobs", "0")) or None
+    names = [a for a in sys.argv[1:] if not a.startswith("--")]
+
+    mode = "APPLYING" if apply else "DRY RUN"
+    print(f"=== {mode} ===\n")
+
+    bad = [t for t in tiers if t <= 0 or t & (t - 1)]
+    if bad:
+        print(f"Tiers must be powers of two: {bad}")
+        sys.exit(1)
+
+    previous = load_manifest()
+    old_layers = previous.get("layers", {}) if previous.get("version") == BAKE_VERSION else {}
+    sources_cache = FileCache("terrain_bake_sources")
+
+    layers = {}
+    todo = []
+    before = 0
+    for layer_dir in collect_layers(names):
+        maps = find_layer_maps(layer_dir)
+        if "albedo" not in maps:
+            print(f"  SKIP {layer_dir.name}: no albedo map")
+            continue
+
+        h = hashlib.sha1(f"{BAKE_VERSION}:{tiers}".encode())
+        for role in sorted(maps):
+            digest = sources_cache.digest(maps[role])
+            sources_cache.store(maps[role], None, digest)
+            h.update(f"|{role}:{digest}".encode())
+        entry = {
+            "sources": {role: f"res://{cache_key(p)}" for role, p in sorted(maps.items())},
+            "source_hash": h.hexdigest(),
+        }
+        old = old_layers.get(layer_dir.name, {})
+        up_to_date = old.get("source_hash") == entry["source_hash"] and all(
+            (PROJECT_ROOT / path[len("res://"):]).exists()
+            for files in old.get("tiers", {}).values() for path in files.values())
+        if up_to_date:
+            entry.update(source_size=old["source_size"], tiers=old["tiers"])
+        else:
+            todo.append((layer_dir.name, maps))
+        layers[layer_dir.name] = entry
+        before += current_bytes(layer_dir)
+
+        roles = ", ".join(f"{r}={p.name}" for r, p in sorted(maps.items()))
+        missing = [r for r in ROLE_PATTERNS if r not in maps]
+        state = "unchanged" if up_to_date else "bake"
+        print(f"  {layer_dir.name:<18} [{state}] {roles}"
+              + (f"  (default {', '.join(missing)})" if missing else ""))
+    sources_cache.save()
+
+    if not apply:
+        print(f"\nLayers: {len(layers)} ({len(todo)} to bake)")
+        print("\nRun with --apply to write files.")
+        return
+
+    errors = 0
+    if todo:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = pool.map(bake_layer, [n for n, _m in todo],
+                               [{r: str(p) for r, p in m.items()} for _n, m in todo],
+                               [tiers] * len(todo))
+            for (name, _maps), result in zip(todo, results):
+                if "error" in result:
+                    print(f"  ERROR {name}: {result['error']}")
+                    del layers[name]
+                    errors += 1
+                else:
+                    layers[name].update(result)
+
+    if not names:
+        # Forget layers whose folder is gone
+        old_layers = {}
+    manifest = {
+        "version": BAKE_VERSION,
+        "orm_channels": {"r": "ao", "g": "roughness", "b": "height"},
+        "tiers": tiers,
+        "layers": dict(sorted({**old_layers, **layers}.items())),
+    }
+    BAKED_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = MANIFEST_PATH.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, MANIFEST_PATH)
+
+    print(f"\nLayers: {len(layers)} ({len(todo) - errors} baked, "
+          f"{len(layers) - len(todo) + errors} unchanged, {errors} errors)")
+    print(f"Texture memory (B + N + R/ORM per layer, with mips):")
+    print(f"  current maps: {before / 2**20:.1f} MB")
+    for tier in tiers:
+        baked = [e for e in layers.values() if str(tier) in e.get("tiers", {})]
+        if not baked:
+            print(f"  tier {tier:>4}:    - (no source that large)")
+            continue
+        after = texture_bytes(tier) * 3 * len(baked)
+        print(f"  tier {tier:>4}:    {after / 2**20:.1f} MB ({len(baked)} layers)")
+    print(f"Manifest: {cache_key(MANIFEST_PATH)}")
+
+
+if __name__ == "__main__":
+    main()
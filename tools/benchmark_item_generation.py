@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Stress-test the item generation pipeline with 10k+ procedural affix items.
+
+Builds a synthetic family of affix items (weapon / armor / jewelry bases
+from the generator tables x prefix x suffix, each at every rarity), then
+runs it through the same path generate_items.py uses: validate_family,
+iter_rendered, StreamWriter and a StagedWrites commit. Output goes to a
+scratch directory, never to data/, so Godot does not import it.
+
+Each size runs in its own process so that peak memory is measured per run
+(main process and render workers, from getrusage; n/a where the resource
+module is unavailable).
+
+Usage:
+    python tools/benchmark_item_generation.py                       # 10k, 50k and 100k files
+    python tools/benchmark_item_generation.py --sizes=10000,250000
+    python tools/benchmark_item_generation.py --jobs=8 --writers=16
+    python tools/benchmark_item_generation.py --no-validate         # skip parsing staged files
+    python tools/benchmark_item_generation.py --out=/tmp/affix      # keep the generated files
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import generate_armor
+import generate_jewelry
+import generate_weapons
+from item_generation import (
+    RARITIES, STAT_CRIT_DMG, STAT_CRIT_RATE, STAT_LUCK, STAT_MAG_ATK, STAT_MAG_DEF, STAT_MAX_HP,
+    STAT_MAX_MP, STAT_PHYS_ATK, STAT_PHYS_DEF, STAT_SPEED, WRITE_WORKERS, StreamWriter,
+    expand_family, iter_rendered, validate_family,
+)
+from staged_writes import StagedWrites
+from tool_cache import arg_value
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SIZES = [10_000, 50_000, 100_000]
+
+# (id, display name, extra stats, price multiplier)
+PREFIXES = [
+    ("sturdy", "Sturdy", [(STAT_PHYS_DEF, 2)], 1.10),
+    ("keen", "Keen", [(STAT_CRIT_RATE, 2)], 1.15),
+    ("brutal", "Brutal", [(STAT_PHYS_ATK, 3)], 1.20),
+    ("arcane", "Arcane", [(STAT_MAG_ATK, 3)], 1.20),
+    ("warded", "Warded", [(STAT_MAG_DEF, 2)], 1.10),
+    ("swift", "Swift", [(STAT_SPEED, 2)], 1.15),
+    ("lucky", "Lucky", [(STAT_LUCK, 3)], 1.10),
+    ("savage", "Savage", [(STAT_CRIT_DMG, 4)], 1.25),
+]
+SUFFIXES = [
+    ("of_the_bear", "of the Bear", [(STAT_MAX_HP, 6)], 1.15),
+    ("of_the_owl", "of the Owl", [(STAT_MAX_MP, 6)], 1.15),
+    ("of_the_fox", "of the Fox", [(STAT_SPEED, 1), (STAT_LUCK, 2)], 1.10),
+    ("of_the_boar", "of the Boar", [(STAT_PHYS_ATK, 2), (STAT_SPEED, -1)], 1.05),
+    ("of_warding", "of Warding", [(STAT_MAG_DEF, 3)], 1.10),
+    ("of_ruin", "of Ruin", [(STAT_CRIT_DMG, 3), (STAT_PHYS_DEF, -1)], 1.20),
+]
+
+
+def affix_family(file_count: int) -> dict:
+    """A family of about `file_count` files (one spec per len(RARITIES) files)."""
+    bases = []
+    for family in (generate_weapons.FAMILY, generate_armor.FAMILY, generate_jewelry.FAMILY):
+        for item in family["items"]:
+            spec = {**family.get("defaults", {}), **item}
+            spec.pop("min_rarity", None)
+            bases.append(spec)
+
+    items = []
+    combos = len(bases) * len(PREFIXES) * len(SUFFIXES)
+    for i in range(-(-file_count // len(RARITIES))):
+        base = bases[i % len(bases)]
+        p_id, p_name, p_stats, p_mult = PREFIXES[i // len(bases) % len(PREFIXES)]
+        s_id, s_name, s_stats, s_mult = SUFFIXES[i // (len(bases) * len(PREFIXES)) % len(SUFFIXES)]
+        mark = i // combos
+        stats = dict(base["stats"])
+        for stat, value in p_stats + s_stats:
+            stats[stat] = stats.get(stat, 0) + value
+        items.append({
+            **base,
+            "id": f"{p_id}_{base['id']}_{s_id}" + (f"_{mark + 1}" if mark else ""),
+            "name": f"{p_name} {base['name']} {s_name}" + (f" +{mark}" if mark else ""),
+            "stats": list(stats.items()),
+            "base_price": round(base["base_price"] * p_mult * s_mult),
+        })
+    return {"name": "affix", "dir": "affix", "rarities": RARITIES, "armor_slot": "category", "items": items}
+
+
+def _peak_mb(who) -> float | None:
+    if resource is None:
+        return None
+    kb = resource.getrusage(who).ru_maxrss
+    return kb / 2**20 if sys.platform == "darwin" else kb / 2**10  # bytes on macOS, KiB elsewhere
+
+
+def run_once(file_count: int, out: Path, jobs: int | None, writers: int, validate: bool) -> dict:
+    """One benchmark run in this process; returns the measurements."""
+    t0 = time.perf_counter()
+    family = affix_family(file_count)
+    errors = validate_family(family)
+    if errors:
+        raise SystemExit(f"{len(errors)} validation error(s), first: {errors[0]}")
+    work = expand_family(family)
+    t1 = time.perf_counter()
+
+    out.mkdir(parents=True, exist_ok=True)
+    with StagedWrites("benchmark", root=out, validate=validate) as staged:
+        writer = StreamWriter(staged, workers=writers)
+        try:
+            for path, content in iter_rendered(work, jobs):
+                writer.put(path, content)
+        finally:
+            writer.close()
+        t2 = time.perf_counter()
+        counts = staged.commit()
+    t3 = time.perf_counter()
+
+    return {
+        "files": len(work),
+        "written": counts["created"] + counts["modified"],
+        "mb_written": staged.bytes_staged / 2**20,
+        "prepare_s": t1 - t0,
+        "commit_s": t3 - t2,
+        "total_s": t3 - t0,
+        "peak_mb": _peak_mb(resource.RUSAGE_SELF) if resource else None,
+        "worker_peak_mb": _peak_mb(resource.RUSAGE_CHILDREN) if resource else None,
+    }
+
+
+# ─── main ────────────────────────────────────────────────────────────────────
+
+def _fmt_mb(value) -> str:
+    return "n/a" if value is None else f"{value:.0f}"
+
+
+def main():
+    jobs = int(arg_value("jobs", "0")) or None
+    writers = int(arg_value("writers", str(WRITE_WORKERS)))
+    validate = "--no-validate" not in sys.argv
+
+    run = arg_value("run")
+    if run:  # child process: one measurement as JSON
+        print(json.dumps(run_once(int(run), Path(arg_value("out")), jobs, writers, validate)))
+        return
+
+    sizes = [int(n) for n in arg_value("sizes").split(",") if n] or DEFAULT_SIZES
+    keep = arg_value("out")
+    scratch = Path(keep) if keep else Path(tempfile.mkdtemp(prefix="item_bench_"))
+
+    print(f"{'files':>8} {'items/s':>9} {'total s':>8} {'prep s':>7} {'commit s':>8} {'MB out':>7} "
+          f"{'peak MB':>8} {'workers':>8}")
+    try:
+        for size in sizes:
+            out = scratch / str(size)
+            cmd = [sys.executable, __file__, f"--run={size}", f"--out={out}", f"--writers={writers}"]
+            if jobs:
+                cmd.append(f"--jobs={jobs}")
+            if not validate:
+                cmd.append("--no-validate")
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                print(result.stdout + result.stderr)
+                sys.exit(result.returncode)
+            r = json.loads(result.stdout.strip().splitlines()[-1])
+            print(f"{r['files']:>8} {r['files'] / r['total_s']:>9.0f} {r['total_s']:>8.2f} "
+                  f"{r['prepare_s']:>7.2f} {r['commit_s']:>8.2f} {r['mb_written']:>7.1f} {_fmt_mb(r['peak_mb']):>8} "
+                  f"{_fmt_mb(r['worker_peak_mb']):>8}")
+            if not keep:
+                shutil.rmtree(out, ignore_errors=True)
+    finally:
+        if not keep:
+            shutil.rmtree(scratch, ignore_errors=True)
+    if keep:
+        print(f"\nFiles kept in {scratch}")
+
+
+if __name__ == "__main__":
+    main()
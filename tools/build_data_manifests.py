@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Build lazy-load manifests for the data database autoloads.
+
+ItemDatabase, NpcDatabase, ShopDatabase, ChestDatabase and CharacterDatabase
+load every resource in their directories at boot. A manifest lets a
+database index its records without loading them: id -> res:// path plus the
+few fields its lookups filter on, so get_items_by_rarity() and friends can
+answer from the manifest and a resource is only loaded on first access.
+
+Output (data/catalog/):
+    <database>.manifest.json   {"version", "database", "entries_hash",
+                                "entries": {id: {"path", <filter fields>}}}
+
+Filter fields absent from a .tres get the script's default, so every entry
+carries all of them. Ids fall back to the file name, and a duplicate id
+resolves as in ResourceLoaderHelper.load_dirs(): the later file within one
+directory, the first directory across several (ItemDatabase).
+
+Rebuilds are incremental: each .tres is parsed once and cached in
+tools/.cache, and a manifest whose content did not change is not rewritten.
+"entries_hash" covers only the emitted entries, so editing a field no
+manifest carries (base_price, description, ...) leaves every manifest and
+its mtime alone. --check exits 1 when any manifest is out of date with data/.
+
+Usage:
+    python tools/build_data_manifests.py                   # dry run: what would change
+    python tools/build_data_manifests.py --apply           # write changed manifests
+    python tools/build_data_manifests.py --check           # exit 1 if any manifest is stale
+    python tools/build_data_manifests.py --only=items,npcs
+    python tools/build_data_manifests.py --no-cache        # reparse every file
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import tres_document
+from pack_item_catalog import ITEM_DIRS, replaces
+from staged_writes import StagedWrites
+from tool_cache import FileCache, arg_value, cache_key
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CATALOG_DIR = PROJECT_ROOT / "data" / "catalog"
+
+# Bump when the manifest layout changes (also invalidates the parse cache)
+MANIFEST_VERSION = 2
+
+# database -> (autoload, directories as in its *_DIR constants, {filter field: script default})
+DATABASES = {
+    "items": ("ItemDatabase", [f"data/items/{name}" for name in ITEM_DIRS],
+              {"item_type": 0, "category": 0, "rarity": 0}),
+    "npcs": ("NpcDatabase", ["data/npcs"], {"role": 0, "shop_id": ""}),
+    "shops": ("ShopDatabase", ["data/shops"], {"shop_type": 0, "pricing_type": 0}),
+    "chests": ("ChestDatabase", ["data/chests"], {"visual_type": "wooden", "unlock_flag": ""}),
+    "characters": ("CharacterDatabase", ["data/characters"], {"character_class": ""}),
+}
+
+
+def _filter_value(value):
+    return str(value) if isinstance(value, str) else value  # StringName
+
+
+def scan_file(path: Path, fields: dict) -> dict:
+    """{"id", <filter fields>} of one resource; fields missing from the file get their default."""
+    doc = tres_document.load(path)
+    props = doc.resource.properties()
+    entry = {"id": props.get("id") or path.stem}
+    for field, default in fields.items():
+        entry[field] = _filter_value(props.get(field, default))
+    return entry
+
+
+def manifest_files(dirs: list[str]) -> list[Path]:
+    files = []
+    for d in dirs:
+        files.extend(sorted((PROJECT_ROOT / d).glob("*.tres")))  # load_dir is not recursive
+    return files
+
+
+def build_manifest(database: str, cache: FileCache) -> tuple[str, int, list[str]]:
+    """(manifest text, entry count, warnings) for one database."""
+    autoload, dirs, fields = DATABASES[database]
+    files = manifest_files(dirs)
+    entries = {}
+    warnings = []
+    for path in files:
+        key = f"{database}:{cache_key(path)}"
+        entry = cache.lookup(path)
+        if entry is None or key not in entry:
+            entry = {**(entry or {}), key: scan_file(path, fields)}
+            cache.store(path, entry)
+        record = dict(entry[key])
+        record_id = record.pop("id")
+        res_path = f"res://{cache_key(path)}"
+        kept = entries.get(record_id)
+        if kept is not None:
+            warnings.append(f'{autoload}: duplicate id "{record_id}" in {kept["path"]} and {res_path}')
+            if not replaces(kept["path"], res_path):
+                continue
+        entries[record_id] = {"path": res_path, **record}
+
+    entries = {k: entries[k] for k in sorted(entries)}
+    entries_json = json.dumps(entries, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "database": autoload,
+        "entries_hash": hashlib.sha1(entries_json.encode("utf-8")).hexdigest(),
+        "entries": entries,
+    }
+    return json.dumps(manifest, indent=1, ensure_ascii=False) + "\n", len(entries), warnings
+
+
+def manifest_path(database: str) -> Path:
+    return CATALOG_DIR / f"{database}.manifest.json"
+
+
+# ─── main ────────────────────────────────────────────────────────────────────
+
+def main():
+    apply = "--apply" in sys.argv
+    check = "--check" in sys.argv
+    use_cache = "--no-cache" not in sys.argv
+    only = [name for name in arg_value("only").split(",") if name]
+    unknown = [name for name in only if name not in DATABASES]
+    if unknown:
+        print(f"Unknown database(s): {', '.join(unknown)} (known: {', '.join(DATABASES)})")
+        sys.exit(1)
+
+    # One cache for all databases; entries are keyed per database because the
+    # filter fields differ
+    cache = FileCache("data_manifests", MANIFEST_VERSION, enabled=use_cache)
+    built = {}
+    for database in only or DATABASES:
+        text, count, warnings = build_manifest(database, cache)
+        built[database] = (text, count)
+        for warning in warnings:
+            print(f"  WARNING {warning}")
+    if not only:
+        cache.prune([p for _autoload, dirs, _fields in DATABASES.values() for p in manifest_files(dirs)])
+    cache.save()
+
+    if check:
+        stale = []
+        for database, (text, _count) in built.items():
+            try:
+                current = manifest_path(database).read_text(encoding="utf-8")
+            except OSError:
+                current = None
+            if current != text:
+                stale.append(database)
+        if stale:
+            print(f"Stale manifest(s): {', '.join(stale)} — run with --apply.")
+            sys.exit(1)
+        print(f"All {len(built)} manifest(s) are up to date.")
+        return
+
+    mode = "APPLYING" if apply else "DRY RUN"
+    print(f"=== {mode} ===\n")
+    with StagedWrites(Path(sys.argv[0]).stem, apply) as staged:
+        for database, (text, count) in built.items():
+            status = staged.stage(manifest_path(database), text)
+            print(f"  {database:<12} {count:>4} entries  {status}")
+        staged.commit()
+    staged.report(PROJECT_ROOT, list_files=False)
+    if not apply:
+        print("\nRun with --apply to write files.")
+
+
+if __name__ == "__main__":
+    main()
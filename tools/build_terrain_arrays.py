@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Assemble the splatmap terrain layers into Texture2DArray images.
+
+The splatmap shader binds albedo, normal and roughness samplers for each
+of its 12 layers (three splatmaps x RGBA, see heightmap_data.gd). This
+tool packs those layers into three layered images — albedo, normal and
+ORM (AO / roughness / height, as baked by bake_terrain_textures.py) — so
+the shader needs three array samplers instead of 36 texture slots.
+
+Layer order is read from _LAYER_DEFS in overworld_heightmap_generator.gd,
+so array index i is splat channel i: splatmap 1 RGBA = layers 0-3,
+splatmap 2 = 4-7, splatmap 3 = 8-11. Every layer is resampled to a common
+square size (--size, default 1024; smaller tiers are box-filtered like the
+bake) and stacked vertically, one slice per layer. Next to each image a
+Godot .import selects the 2D-array importer with the right slice count
+(an existing .import only has its slice count updated).
+shaders/terrain_splatmap_array.gdshader samples the result; its material
+must set uv_scales[i] to the manifest's uv_scale of index i.
+
+Output, in assets/terrain_textures/arrays/:
+  terrain_albedo_array.png, terrain_normal_array.png, terrain_orm_array.png
+  terrain_array_manifest.json — per index: layer name, folder, splatmap,
+                                channel and uv_scale, plus the array paths
+
+Arrays are only rebuilt when a layer source, the layer list or the size
+changed. Layers load in a process pool.
+
+Usage:
+    python tools/build_terrain_arrays.py                # dry run: show the layer order
+    python tools/build_terrain_arrays.py --apply        # build the arrays
+    python tools/build_terrain_arrays.py --apply --size=512
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from bake_terrain_textures import (
+    ORM_DEFAULTS, TERRAIN_DIR, find_layer_maps, load_channels, mip_chain,
+)
+from tool_cache import FileCache, arg_value, cache_key
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+GENERATOR_PATH = PROJECT_ROOT / "scripts" / "terrain" / "overworld_heightmap_generator.gd"
+ARRAYS_DIR = TERRAIN_DIR / "arrays"
+MANIFEST_PATH = ARRAYS_DIR / "terrain_array_manifest.json"
+
+# Bump when the array layout changes for identical sources
+ARRAY_VERSION = "1"
+DEFAULT_SIZE = 1024
+CHANNELS = "rgba"
+
+# Array name -> mip_chain kind (albedo in linear light, normals renormalised)
+ARRAYS = {"albedo": "srgb", "normal": "normal", "orm": "linear"}
+
+_LAYER_DEF = re.compile(
+    r'\{\s*"folder":\s*"([^"]+)",\s*"base":\s*"([^"]+)",\s*"uv":\s*([\d.]+),\s*"label":\s*"([^"]+)"\s*\}')
+
+IMPORT_TEMPLATE = """[remap]
+
+importer="2d_array_texture"
+type="CompressedTexture2DArray"
+
+[params]
+
+compress/mode=2
+compress/high_quality=false
+compress/lossy_quality=0.7
+compress/hdr_compression=1
+compress/channel_pack={channel_pack}
+mipmaps/generate=true
+mipmaps/limit=-1
+slices/horizontal=1
+slices/vertical={slices}
+"""
+
+
+def splat_layers() -> list[dict]:
+    """The terrain layers in splat channel order, from _LAYER_DEFS."""
+    text = GENERATOR_PATH.read_text(encoding="utf-8")
+    start = text.index("const _LAYER_DEFS")
+    block = text[start:text.index("]\n", start)]
+    layers = []
+    for i, (folder, base, uv, label) in enumerate(_LAYER_DEF.findall(block)):
+        layers.append({
+            "index": i,
+            "name": label,
+            "folder": folder,
+            "base": base,
+            "splatmap": i // 4 + 1,
+            "channel": CHANNELS[i % 4],
+            "uv_scale": float(uv),
+        })
+    return layers
+
+
+def load_layer(maps: dict, size: int) -> dict:
+    """Process-pool entry point: {array name: (size, size, 3) uint8} for one layer."""
+    try:
+        albedo = load_channels(Path(maps["albedo"]), "RGB")
+        base = albedo.shape[0]
+        normal = (load_channels(Path(maps["normal"]), "RGB", base) if "normal" in maps
+                  else np.tile(np.array([0.5, 0.5, 1.0], np.float32), (base, base, 1)))
+        orm = np.empty((base, base, 3), dtype=np.float32)
+        for channel, role in enumerate(("ao", "roughness", "height")):
+            if role in maps:
+                orm[..., channel] = load_channels(Path(maps[role]), "L", base)
+            else:
+                orm[..., channel] = ORM_DEFAULTS[role] / 255
+    except Exception as e:
+        return {"error": str(e)}
+
+    out = {}
+    for name, img in (("albedo", albedo), ("normal", normal), ("orm", orm)):
+        if base >= size:
+            out[name] = mip_chain(img, [size], ARRAYS[name])[size]
+        else:
+            # Smaller sources are resampled straight up to the slice size
+            img = np.clip(np.round(img * 255), 0, 255).astype(np.uint8)
+            out[name] = np.asarray(Image.fromarray(img, "RGB").resize((size, size), Image.LANCZOS))
+    return out
+
+
+def write_import(image_path: Path, slices: int, srgb: bool):
+    """Create the array .import, or just update the slice count of an existing one."""
+    import_path = image_path.with_name(image_path.name + ".import")
+    if import_path.exists():
+        text = import_path.read_text(encoding="utf-8")
+        text = re.sub(r"(?m)^slices/vertical=\d+$", f"slices/vertical={slices}", text)
+    else:
+        text = IMPORT_TEMPLATE.format(channel_pack=0 if srgb else 1, slices=slices)
+    with open(import_path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(text)
+
+
+# ─── main ────────────────────────────────────────────────────────────────────
+
+def main():
+    apply = "--apply" in sys.argv
+    size = int(arg_value("size", str(DEFAULT_SIZE)))
+    jobs = int(arg_value("jobs", "0")) or None
+
+    mode = "APPLYING" if apply else "DRY RUN"
+    print(f"=== {mode} ===\n")
+
+    if size <= 0 or size & (size - 1):
+        print(f"--size must be a power of two, got {size}")
+        sys.exit(1)
+
+    layers = splat_layers()
+    sources_cache = FileCache("terrain_bake_sources")
+    h = hashlib.sha1(f"{ARRAY_VERSION}:{size}".encode())
+    layer_maps = []
+    missing = 0
+    for layer in layers:
+        maps = find_layer_maps(TERRAIN_DIR / layer["folder"])
+        layer_maps.append(maps)
+        h.update(f"|{layer['folder']}".encode())
+        for role in sorted(maps):
+            digest = sources_cache.digest(maps[role])
+            sources_cache.store(maps[role], None, digest)
+            h.update(f"|{role}:{digest}".encode())
+        layer["sources"] = {role: f"res://{cache_key(p)}" for role, p in sorted(maps.items())}
+        if "albedo" not in maps:
+            missing += 1
+        print(f"  [{layer['index']:>2}] splatmap{layer['splatmap']}.{layer['channel']}  "
+              f"{layer['name']:<14} {len(maps)} map(s)" + ("  !! no albedo" if "albedo" not in maps else ""))
+    sources_cache.save()
+    source_hash = h.hexdigest()
+
+    if missing:
+        print(f"\n{missing} layer(s) have no albedo map — fix the layer folders first.")
+        sys.exit(1)
+
+    bytes_per_array = size * size * len(layers) * 4 * 4 // 3  # RGBA8 + mips, before VRAM compression
+    print(f"\nLayers: {len(layers)} at {size}x{size}, "
+          f"{len(ARRAYS)} arrays (~{bytes_per_array * len(ARRAYS) / 2**20:.0f} MB uncompressed)")
+    print(f"Samplers: {len(ARRAYS)} arrays instead of {len(layers) * len(ARRAYS)} textures")
+
+    if not apply:
+        print("\nRun with --apply to write files.")
+        return
+
+    image_paths = {name: ARRAYS_DIR / f"terrain_{name}_array.png" for name in ARRAYS}
+    if MANIFEST_PATH.exists() and all(p.exists() for p in image_paths.values()):
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            if json.load(f).get("source_hash") == source_hash:
+                print("\nArrays are up to date.")
+                return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        slices = list(pool.map(load_layer, [{r: str(p) for r, p in m.items()} for m in layer_maps],
+                               [size] * len(layers)))
+    errors = [(layer["name"], s["error"]) for layer, s in zip(layers, slices) if "error" in s]
+    for name, error in errors:
+        print(f"  ERROR {name}: {error}")
+    if errors:
+        sys.exit(1)
+
+    ARRAYS_DIR.mkdir(parents=True, exist_ok=True)
+    for name, path in image_paths.items():
+        stacked = np.concatenate([s[name] for s in slices], axis=0)
+        Image.fromarray(stacked, "RGB").save(path)
+        write_import(path, len(layers), srgb=name == "albedo")
+        print(f"  {cache_key(path)}  ({size}x{size * len(layers)})")
+
+    manifest = {
+        "version": ARRAY_VERSION,
+        "source_hash": source_hash,
+        "size": size,
+        "arrays": {name: f"res://{cache_key(p)}" for name, p in image_paths.items()},
+        "orm_channels": {"r": "ao", "g": "roughness", "b": "height"},
+        "layers": layers,
+    }
+    tmp = MANIFEST_PATH.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, MANIFEST_PATH)
+    print(f"Manifest: {cache_key(MANIFEST_PATH)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""Check res:// reference integrity across every .tres / .tscn in the project.
+
+Generators hard-code res:// paths and loot tables, encounters, shops and
+backpack tiers reference items by path, so a rename leaves dangling links
+that only fail when the game loads them. This checker parses every scene
+and resource (in a process pool, cached by content in tools/.cache, so a
+rerun only parses changed files) and reports:
+
+  errors
+    missing          ext_resource path that does not exist on disk
+    dangling         ExtResource("id") / SubResource("id") with no such declaration
+    duplicate_ext    two ext_resources sharing one id in the same file
+    type_mismatch    ext_resource type that does not fit its target (a Script
+                     that is not a .gd, a Texture2D that is a .tres skill...),
+                     or a typed array element whose script is not the array's
+                     element type (an ItemData table holding a SkillData)
+    duplicate_id     two ItemData resources with the same id
+    parse_error      file the .tres reader cannot parse
+  warnings
+    unused_ext       ext_resource declared but never referenced
+
+The exit status is 1 when there are errors (also for warnings with
+--strict), so the check can run before every commit.
+
+Usage:
+    python tools/check_references.py               # summary, first problems of each kind
+    python tools/check_references.py --list        # every problem
+    python tools/check_references.py --strict      # warnings fail too
+    python tools/check_references.py --no-cache    # reparse everything
+"""
+
+import hashlib
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import tres_document
+from tool_cache import FileCache, arg_value, cache_key
+from tres_document import ExtResource, SubResource, TypedArray
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Bump when the extracted fields change
+SCAN_VERSION = "1"
+MIN_POOL_JOBS = 16
+SHOWN_PER_KIND = 10
+
+# Development-only folders, as in find_unused_assets.py
+SKIP_DIRS = {".git", ".godot", "addons", "tests", "tools", "docs", "builds"}
+
+ERROR_KINDS = ["missing", "dangling", "duplicate_ext", "type_mismatch", "duplicate_id", "parse_error"]
+WARNING_KINDS = ["unused_ext"]
+
+# ext_resource type -> file extensions it may point at (.tres/.res targets are
+# checked against their own header type instead)
+TARGET_EXTENSIONS = {
+    "Script": {".gd", ".cs"},
+    "PackedScene": {".tscn", ".scn", ".glb", ".gltf", ".blend", ".fbx", ".obj", ".dae"},
+    "Texture2D": {".png", ".jpg", ".jpeg", ".webp", ".svg", ".bmp", ".tga", ".exr", ".hdr"},
+    "FontFile": {".ttf", ".otf", ".woff", ".woff2", ".fnt", ".font"},
+    "AudioStream": {".wav", ".ogg", ".mp3"},
+    "Shader": {".gdshader"},
+}
+# Resource types a declared ext_resource type also accepts
+SUBTYPES = {
+    "Texture2D": {"AtlasTexture", "ImageTexture", "CompressedTexture2D", "GradientTexture2D",
+                  "NoiseTexture2D", "CanvasTexture", "PlaceholderTexture2D"},
+    "Material": {"StandardMaterial3D", "ORMMaterial3D", "ShaderMaterial", "CanvasItemMaterial"},
+}
+RESOURCE_EXTENSIONS = {".tres", ".res"}
+
+
+# ─── scanning ────────────────────────────────────────────────────────────────
+
+def scan_file(path_str: str) -> dict:
+    """Process-pool entry point: declarations, references and local problems of one file."""
+    path = Path(path_str)
+    data = path.read_bytes()
+    result = {"hash": hashlib.sha1(data).hexdigest(), "problems": []}
+    try:
+        doc = tres_document.loads(data.decode("utf-8"))
+        sections = [(s, s.properties()) for s in doc.sections]
+    except (ValueError, UnicodeDecodeError) as e:
+        result["problems"].append(["parse_error", str(e)])
+        return result
+
+    problems = result["problems"]
+    ext = {}
+    for section in doc.ext_resources:
+        if section.id in ext:
+            problems.append(["duplicate_ext", f'ext_resource id "{section.id}" declared twice'])
+        ext[section.id] = (section.type, section.path)
+    subs = {s.id: s.get("script") for s in doc.sub_resources}
+
+    used = set()
+    typed = []  # [where, element script, [ext element targets]] for the cross-file check
+    for section, props in sections:
+        where = section.tag if section.id is None else f"{section.tag} {section.id}"
+        values = list(props.items()) + [(f"[{k}]", v) for k, v in section.attrs.items()]
+        for key, value in values:
+            for ref in tres_document.iter_refs(value):
+                if isinstance(ref, ExtResource):
+                    if ref.id in ext:
+                        used.add(ref.id)
+                    else:
+                        problems.append(["dangling", f'{where} {key}: ExtResource("{ref.id}") is not declared'])
+                elif ref.id not in subs:
+                    problems.append(["dangling", f'{where} {key}: SubResource("{ref.id}") is not declared'])
+            if isinstance(value, TypedArray) and isinstance(value.type, ExtResource) and value.type.id in ext:
+                element_type, element_script = ext[value.type.id]
+                if element_type != "Script":
+                    problems.append(["type_mismatch", f"{where} {key}: array element type {element_script} "
+                                     f"is a {element_type}, not a Script"])
+                    continue
+                targets = []
+                for item in value:
+                    if isinstance(item, SubResource) and item.id in subs:
+                        script = subs[item.id]
+                        script = ext.get(script.id, (None, None))[1] if isinstance(script, ExtResource) else None
+                        if script != element_script:
+                            problems.append(["type_mismatch", f"{where} {key}: sub_resource {item.id} is "
+                                             f"{script or 'untyped'}, array holds {element_script}"])
+                    elif isinstance(item, ExtResource) and item.id in ext:
+                        targets.append(ext[item.id][1])
+                if targets:
+                    typed.append([f"{where} {key}", element_script, targets])
+
+    for ext_id, (ext_type, ext_path) in ext.items():
+        if ext_id not in used:
+            problems.append(["unused_ext", f'ext_resource "{ext_id}" ({ext_type}) {ext_path} is never used'])
+
+    script = doc.resource.get("script") if doc.header.tag == "gd_resource" else None
+    result.update({
+        "type": doc.header.attrs.get("type"),
+        "script_class": doc.script_class,
+        "script": ext.get(script.id, (None, None))[1] if isinstance(script, ExtResource) else None,
+        "item_id": doc.resource.get("id") if doc.script_class == "ItemData" else None,
+        "ext": sorted([t, p] for t, p in ext.values() if p),
+        "typed": typed,
+    })
+    return result
+
+
+def collect_files() -> list[Path]:
+    files = []
+    for root, dirs, names in os.walk(PROJECT_ROOT):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith("."))
+        for name in sorted(names):
+            if name.endswith((".tres", ".tscn")):
+                files.append(Path(root) / name)
+    return files
+
+
+def scan_files(files: list[Path], use_cache: bool = True, jobs: int = None) -> tuple[dict, int]:
+    """({res path: scan result}, number of files parsed); unchanged files come from the cache."""
+    cache = FileCache("reference_check", SCAN_VERSION, enabled=use_cache)
+    results = {}
+    pending = []
+    for path in files:
+        cached = cache.lookup(path)
+        if cached is None:
+            pending.append(path)
+        else:
+            results[path] = cached
+
+    if len(pending) >= MIN_POOL_JOBS:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            scanned = list(pool.map(scan_file, map(str, pending), chunksize=16))
+    else:
+        scanned = [scan_file(str(p)) for p in pending]
+    for path, result in zip(pending, scanned):
+        results[path] = result
+        cache.store(path, result, result["hash"])
+
+    cache.prune(files)
+    cache.save()
+    return {f"res://{cache_key(p)}": results[p] for p in files}, len(pending)
+
+
+# ─── checks ──────────────────────────────────────────────────────────────────
+
+def _type_problem(ext_type: str, target: str, scanned: dict) -> str | None:
+    ext = os.path.splitext(target)[1].lower()
+    if ext in RESOURCE_EXTENSIONS:
+        info = scanned.get(target)
+        if ext_type == "Resource" or info is None or info.get("type") is None:
+            return None
+        if info["type"] != ext_type and info["type"] not in SUBTYPES.get(ext_type, ()):
+            return f"{target} is a {info['type']}, declared as {ext_type}"
+        return None
+    allowed = TARGET_EXTENSIONS.get(ext_type)
+    if allowed is not None and ext not in allowed:
+        return f"{target} cannot be a {ext_type}"
+    return None
+
+
+def check(scanned: dict) -> dict:
+    """{kind: [(file, message)]} over all scanned files."""
+    problems = defaultdict(list)
+    exists = {}
+
+    def target_exists(res_path: str) -> bool:
+        if res_path not in exists:
+            exists[res_path] = res_path in scanned or (PROJECT_ROOT / res_path[len("res://"):]).exists()
+        return exists[res_path]
+
+    item_ids = defaultdict(list)
+    for res, info in scanned.items():
+        for kind, message in info["problems"]:
+            problems[kind].append((res, message))
+        if "ext" not in info:
+            continue
+        for ext_type, target in info["ext"]:
+            if not target.startswith("res://"):
+                continue
+            if not target_exists(target):
+                problems["missing"].append((res, f"{ext_type} {target}"))
+                continue
+            mismatch = _type_problem(ext_type, target, scanned)
+            if mismatch:
+                problems["type_mismatch"].append((res, mismatch))
+        for where, element_script, targets in info["typed"]:
+            for target in targets:
+                script = scanned.get(target, {}).get("script")
+                if target in scanned and script != element_script:
+                    problems["type_mismatch"].append(
+                        (res, f"{where}: {target} is {script or 'untyped'}, array holds {element_script}"))
+        if isinstance(info.get("item_id"), str):
+            item_ids[info["item_id"]].append(res)
+
+    for item_id, paths in sorted(item_ids.items()):
+        if len(paths) > 1:
+            for res in paths:
+                others = ", ".join(p for p in paths if p != res)
+                problems["duplicate_id"].append((res, f'item id "{item_id}" also used by {others}'))
+    return problems
+
+
+# ─── main ────────────────────────────────────────────────────────────────────
+
+def main():
+    show_all = "--list" in sys.argv
+    strict = "--strict" in sys.argv
+    use_cache = "--no-cache" not in sys.argv
+    jobs = int(arg_value("jobs", "0")) or None
+
+    start = time.perf_counter()
+    files = collect_files()
+    scanned, parsed = scan_files(files, use_cache, jobs)
+    problems = check(scanned)
+    elapsed = time.perf_counter() - start
+
+    for kind in ERROR_KINDS + WARNING_KINDS:
+        found = sorted(problems.get(kind, []))
+        if not found:
+            continue
+        label = "ERROR" if kind in ERROR_KINDS else "WARNING"
+        print(f"\n{label} {kind}: {len(found)}")
+        for res, message in found if show_all else found[:SHOWN_PER_KIND]:
+            print(f"  {res}: {message}")
+        if not show_all and len(found) > SHOWN_PER_KIND:
+            print(f"  ... {len(found) - SHOWN_PER_KIND} more (--list shows all)")
+
+    errors = sum(len(problems.get(k, [])) for k in ERROR_KINDS)
+    warnings = sum(len(problems.get(k, [])) for k in WARNING_KINDS)
+    print("\nResults:")
+    print(f"  Files:    {len(files)} ({parsed} parsed, {len(files) - parsed} from cache)")
+    print(f"  Errors:   {errors}")
+    print(f"  Warnings: {warnings}")
+    print(f"  Time:     {elapsed * 1000:.0f} ms")
+
+    if errors or (strict and warnings):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""Convert .vox / .obj model sources into normalised, lean runtime GLBs.
+
+Model folders such as assets/models/Nature/bush_0/ ship the same model as
+.vox, .obj, .dae, .fbx and .glb. This tool treats the .vox and obj/<name>.obj
+as the authoritative sources and builds one GLB per model with:
+  - one mesh, one primitive per material (all faces sharing a material merged)
+  - welded vertices and the smallest index type that fits
+  - vertex cache / overdraw / fetch ordering (see optimize_glb.py)
+  - consistent scale (VOXEL_SIZE metres per voxel, same as MagicaVoxel's OBJ export)
+  - ground pivot: X/Z centred on the bounding box, lowest point at Y = 0
+  - the palette texture embedded with nearest-neighbour sampling
+
+Voxel sources are meshed with greedy face merging. When a folder has both
+sources, the one that meshes to fewer triangles wins (MagicaVoxel exports
+texture-mapped models as a few textured quads). An OBJ's map_Kd textures
+are read through mtl_file.py (exporter Windows paths fall back to the file
+next to the .mtl), and a textured GLB is never replaced by a build that
+came out untextured. Built GLBs are cached in tools/.cache/glb/ keyed by
+source, .mtl and texture hashes, so unchanged models are not rebuilt, and
+conversions run in a process pool.
+
+Usage:
+    python tools/convert_models_to_glb.py                      # dry run (Nature + House)
+    python tools/convert_models_to_glb.py --apply              # replace <model>/<name>.glb
+    python tools/convert_models_to_glb.py --apply --out=build  # write into a mirror tree instead
+    python tools/convert_models_to_glb.py --prefer=vox         # force .vox (or obj) sources
+    python tools/convert_models_to_glb.py assets/models/Nature/bush_0   # specific folders
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+from pygltflib import (
+    GLTF2, Asset, Scene, Node, Mesh, Primitive, Attributes,
+    Material, PbrMetallicRoughness, TextureInfo, Texture, Sampler, Image as GltfImage,
+)
+
+from glb_mesh import (
+    ARRAY_BUFFER, ELEMENT_ARRAY_BUFFER, FLOAT, UNSIGNED_SHORT, UNSIGNED_INT, GlbEditor, load_glb,
+)
+from import_multipart_vox import parse_vox
+from mtl_file import read_mtl_maps
+from optimize_glb import optimize_gltf
+from tool_cache import CACHE_DIR, FileCache, arg_value, cache_key
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MODELS_DIR = PROJECT_ROOT / "assets" / "models"
+DEFAULT_ROOTS = [MODELS_DIR / "Nature", MODELS_DIR / "House"]
+OUTPUT_CACHE_DIR = CACHE_DIR / "glb"
+
+# Bump when the generated GLB layout changes
+CONVERTER_VERSION = "3"
+
+VOXEL_SIZE = 0.1          # metres per voxel (matches MagicaVoxel OBJ export)
+PALETTE_SIZE = 256
+MAX_UINT16_INDEX = 65535
+
+# glTF sampler filters
+NEAREST = 9728
+
+GENERATOR = "tactical-rpg-model-normaliser"
+
+
+# ─── mesh container ───────────────────────────────────────────────────────────
+
+class MeshData:
+    """Flat vertex arrays plus one triangle index list per material."""
+
+    def __init__(self):
+        self.positions = []
+        self.normals = []
+        self.uvs = []
+        self.groups = {}  # material name -> [indices]
+
+    def add_vertex(self, pos, normal, uv) -> int:
+        self.positions.append(pos)
+        self.normals.append(normal)
+        self.uvs.append(uv)
+        return len(self.positions) - 1
+
+    def add_triangle(self, material: str, a: int, b: int, c: int):
+        self.groups.setdefault(material, []).extend((a, b, c))
+
+
+# ─── voxel source ─────────────────────────────────────────────────────────────
+
+# Axis pairs (u, v) such that u x v points along +axis
+_FACE_AXES = {0: (1, 2), 1: (2, 0), 2: (0, 1)}
+
+
+def _vox_grid(path: Path):
+    """Load a .vox into a dense (x, y, z) colour-index grid in Y-up space."""
+    models, palette, _nodes = parse_vox(str(path))
+    if not models or palette is None:
+        raise ValueError("no voxel model or palette")
+    if len(models) > 1:
+        raise ValueError(f"{len(models)} models in one .vox (use import_multipart_vox.py)")
+
+    sx, sy, sz = models[0]["size"]
+    # MagicaVoxel is Z-up: (x, y, z) -> (x, z, -y)
+    grid = np.zeros((sx, sz, sy), dtype=np.uint8)
+    for x, y, z, ci in models[0]["voxels"]:
+        grid[x, z, sy - 1 - y] = ci
+    return grid, palette
+
+
+def _greedy_quads(mask: np.ndarray):
+    """Yield (u, v, width, height, colour) rectangles covering a 2D face mask."""
+    done = np.zeros(mask.shape, dtype=bool)
+    nu, nv = mask.shape
+    for v in range(nv):
+        for u in range(nu):
+            c = mask[u, v]
+            if c == 0 or done[u, v]:
+                continue
+            w = 1
+            while u + w < nu and mask[u + w, v] == c and not done[u + w, v]:
+                w += 1
+            h = 1
+            while v + h < nv and np.all(mask[u:u + w, v + h] == c) and not done[u:u + w, v + h].any():
+                h += 1
+            done[u:u + w, v:v + h] = True
+            yield u, v, w, h, int(c)
+
+
+def mesh_vox(path: Path):
+    """Greedy-mesh a .vox file. Returns (MeshData, {material: png bytes})."""
+    grid, palette = _vox_grid(path)
+    solid = grid > 0
+    mesh = MeshData()
+
+    for axis in range(3):
+        u_axis, v_axis = _FACE_AXES[axis]
+        for direction in (1, -1):
+            neighbour = np.zeros_like(solid)
+            if direction > 0:
+                src = [slice(None)] * 3
+                dst = [slice(None)] * 3
+                src[axis] = slice(1, None)
+                dst[axis] = slice(None, -1)
+            else:
+                src = [slice(None)] * 3
+                dst = [slice(None)] * 3
+                src[axis] = slice(None, -1)
+                dst[axis] = slice(1, None)
+            neighbour[tuple(dst)] = solid[tuple(src)]
+            faces = np.where(solid & ~neighbour, grid, 0)
+
+            normal = [0.0, 0.0, 0.0]
+            normal[axis] = float(direction)
+            for k in range(grid.shape[axis]):
+                plane = np.moveaxis(faces, axis, 0)[k]
+                # moveaxis leaves the remaining axes in ascending order; reorder to (u, v)
+                if u_axis > v_axis:
+                    plane = plane.T
+                depth = k + 1 if direction > 0 else k
+                for u, v, w, h, ci in _greedy_quads(plane):
+                    _emit_voxel_quad(mesh, axis, u_axis, v_axis, depth, u, v, w, h,
+                                     direction, normal, ci)
+
+    return mesh, {"palette": _palette_png(palette)}
+
+
+def _emit_voxel_quad(mesh: MeshData, axis, u_axis, v_axis, depth, u, v, w, h,
+                     direction, normal, ci):
+    uv = ((ci - 0.5) / PALETTE_SIZE, 0.5)
+    corners = [(u, v), (u + w, v), (u + w, v + h), (u, v + h)]
+    idx = []
+    for cu, cv in corners:
+        p = [0.0, 0.0, 0.0]
+        p[axis] = depth * VOXEL_SIZE
+        p[u_axis] = cu * VOXEL_SIZE
+        p[v_axis] = cv * VOXEL_SIZE
+        idx.append(mesh.add_vertex(tuple(p), tuple(normal), uv))
+    if direction > 0:
+        mesh.add_triangle("palette", idx[0], idx[1], idx[2])
+        mesh.add_triangle("palette", idx[0], idx[2], idx[3])
+    else:
+        mesh.add_triangle("palette", idx[0], idx[2], idx[1])
+        mesh.add_triangle("palette", idx[0], idx[3], idx[2])
+
+
+def _palette_png(palette) -> bytes:
+    """256x1 RGBA strip; texel i holds colour index i + 1."""
+    img = Image.new("RGBA", (PALETTE_SIZE, 1))
+    img.putdata([tuple(c) for c in palette[:PALETTE_SIZE]])
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+# ─── OBJ source ───────────────────────────────────────────────────────────────
+
+def _mtl_diffuse_maps(mtl_path: Path) -> dict:
+    """Return {material name: map_Kd file} from a .mtl file (resolved maps only)."""
+    return {material: path for material, keyword, _raw, path in read_mtl_maps(mtl_path)
+            if keyword == "map_Kd" and material is not None and path is not None}
+
+
+def _obj_dependencies(path: Path) -> list[Path]:
+    """The .mtl files an .obj loads and the texture files they map."""
+    deps = []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.startswith("mtllib "):
+                mtl = path.parent / line[7:].strip()
+                if mtl.exists():
+                    deps.append(mtl)
+                    deps.extend(p for _m, _k, _r, p in read_mtl_maps(mtl) if p is not None)
+    return deps
+
+
+def mesh_obj(path: Path):
+    """Parse an .obj (+ .mtl) into welded MeshData. Returns (MeshData, {material: png bytes})."""
+    v, vt, vn = [], [], []
+    mesh = MeshData()
+    welded = {}
+    material = "default"
+    diffuse = {}
+
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            tag = parts[0]
+            if tag == "v":
+                v.append(tuple(float(x) for x in parts[1:4]))
+            elif tag == "vt":
+                # OBJ v runs bottom-up, glTF top-down
+                vt.append((float(parts[1]), 1.0 - float(parts[2])))
+            elif tag == "vn":
+                vn.append(tuple(float(x) for x in parts[1:4]))
+            elif tag == "usemtl":
+                material = " ".join(parts[1:])
+            elif tag == "mtllib":
+                diffuse.update(_mtl_diffuse_maps(path.parent / " ".join(parts[1:])))
+            elif tag == "f":
+                corners = []
+                for ref in parts[1:]:
+                    if ref not in welded:
+                        welded[ref] = _obj_vertex(mesh, ref, v, vt, vn)
+                    corners.append(welded[ref])
+                for i in range(1, len(corners) - 1):
+                    mesh.add_triangle(material, corners[0], corners[i], corners[i + 1])
+
+    textures = {}
+    for name in mesh.groups:
+        tex = diffuse.get(name)
+        if tex is not None and tex.exists():
+            textures[name] = tex.read_bytes()
+    return mesh, textures
+
+
+def _obj_index(token: str, count: int) -> int:
+    i = int(token)
+    return i - 1 if i > 0 else count + i
+
+
+def _obj_vertex(mesh: MeshData, ref: str, v, vt, vn) -> int:
+    fields = ref.split("/")
+    pos = v[_obj_index(fields[0], len(v))]
+    uv = vt[_obj_index(fields[1], len(vt))] if len(fields) > 1 and fields[1] else (0.0, 0.0)
+    nrm = vn[_obj_index(fields[2], len(vn))] if len(fields) > 2 and fields[2] else (0.0, 1.0, 0.0)
+    return mesh.add_vertex(pos, nrm, uv)
+
+
+# ─── normalisation + GLB assembly ─────────────────────────────────────────────
+
+def weld(mesh: MeshData):
+    """Merge identical vertices. Returns (positions, normals, uvs, {material: indices})."""
+    pos = np.asarray(mesh.positions, dtype=np.float32).reshape(-1, 3)
+    nrm = np.asarray(mesh.normals, dtype=np.float32).reshape(-1, 3)
+    uv = np.asarray(mesh.uvs, dtype=np.float32).reshape(-1, 2)
+    packed = np.ascontiguousarray(np.hstack([pos, nrm, uv]))
+    _unique, first, remap = np.unique(
+        packed.view(np.dtype((np.void, packed.dtype.itemsize * packed.shape[1]))).ravel(),
+        return_index=True, return_inverse=True,
+    )
+    # Keep first-occurrence order so vertex order follows the source
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    remap = rank[remap.ravel()]
+    keep = first[order]
+    groups = {m: remap[np.asarray(idx, dtype=np.int64)].astype(np.uint32)
+              for m, idx in mesh.groups.items()}
+    return pos[keep], nrm[keep], uv[keep], groups
+
+
+def ground_pivot(positions: np.ndarray) -> np.ndarray:
+    """Centre X/Z on the bounding box and put the lowest point at Y = 0."""
+    mn = positions.min(axis=0)
+    mx = positions.max(axis=0)
+    offset = np.array([(mn[0] + mx[0]) / 2, mn[1], (mn[2] + mx[2]) / 2], dtype=np.float32)
+    return positions - offset
+
+
+def build_glb(name: str, mesh: MeshData, textures: dict) -> GLTF2:
+    positions, normals, uvs, groups = weld(mesh)
+    positions = ground_pivot(positions)
+
+    gltf = GLTF2()
+    gltf.asset = Asset(version="2.0", generator=GENERATOR)
+    gltf.scene = 0
+    gltf.scenes = [Scene(nodes=[0])]
+    gltf.nodes = [Node(name=name, mesh=0)]
+    gltf.materials = []
+    gltf.textures = []
+    gltf.images = []
+    gltf.samplers = [Sampler(magFilter=NEAREST, minFilter=NEAREST)]
+    editor = GlbEditor(gltf)
+
+    pos_acc = editor.add_accessor(positions, FLOAT, "VEC3", target=ARRAY_BUFFER, bounds=True)
+    nrm_acc = editor.add_accessor(normals, FLOAT, "VEC3", target=ARRAY_BUFFER)
+    uv_acc = editor.add_accessor(uvs, FLOAT, "VEC2", target=ARRAY_BUFFER)
+    index_type = UNSIGNED_SHORT if len(positions) <= MAX_UINT16_INDEX else UNSIGNED_INT
+
+    primitives = []
+    for mat_name in sorted(groups):
+        mat_idx = _add_material(gltf, editor, mat_name, textures.get(mat_name))
+        idx_acc = editor.add_accessor(groups[mat_name], index_type, "SCALAR",
+                                      target=ELEMENT_ARRAY_BUFFER, bounds=True)
+        primitives.append(Primitive(
+            attributes=Attributes(POSITION=pos_acc, NORMAL=nrm_acc, TEXCOORD_0=uv_acc),
+            indices=idx_acc, material=mat_idx,
+        ))
+    gltf.meshes = [Mesh(name=name, primitives=primitives)]
+    return editor.finish()
+
+
+def _add_material(gltf: GLTF2, editor: GlbEditor, name: str, png: bytes) -> int:
+    pbr = PbrMetallicRoughness(baseColorFactor=[1.0, 1.0, 1.0, 1.0],
+                               metallicFactor=0.0, roughnessFactor=1.0)
+    if png:
+        bv = editor.add_buffer_view(png)
+        gltf.images.append(GltfImage(bufferView=bv, mimeType="image/png", name=name))
+        gltf.textures.append(Texture(sampler=0, source=len(gltf.images) - 1))
+        pbr.baseColorTexture = TextureInfo(index=len(gltf.textures) - 1)
+    gltf.materials.append(Material(name=name, pbrMetallicRoughness=pbr))
+    return len(gltf.materials) - 1
+
+
+def _build_source(source: Path) -> GLTF2:
+    if source.suffix.lower() == ".vox":
+        mesh, textures = mesh_vox(source)
+    else:
+        mesh, textures = mesh_obj(source)
+    return build_glb(source.stem, mesh, textures)
+
+
+def _triangle_count(gltf: GLTF2) -> int:
+    return sum(gltf.accessors[p.indices].count // 3 for p in gltf.meshes[0].primitives)
+
+
+def convert_model(source_strs: list[str], cache_out_str: str) -> dict:
+    """Process-pool entry point: build the leanest GLB from the candidate
+    sources into the output cache and return its stats."""
+    best = None
+    errors = []
+    for source_str in source_strs:
+        source = Path(source_str)
+        try:
+            gltf = _build_source(source)
+        except Exception as e:
+            errors.append(f"{source.name}: {e}")
+            continue
+        tris = _triangle_count(gltf)
+        if best is None or tris < best[2]:
+            best = (source, gltf, tris)
+    if best is None:
+        return {"error": "; ".join(errors)}
+
+    source, gltf, tris = best
+    optimize_gltf(gltf)
+    gltf.save_binary(cache_out_str)
+    return {
+        "source": cache_key(source),
+        "triangles": tris,
+        "vertices": gltf.accessors[gltf.meshes[0].primitives[0].attributes.POSITION].count,
+        "materials": len(gltf.materials),
+        "textures": len(gltf.images or []),
+        "bytes": os.path.getsize(cache_out_str),
+    }
+
+
+def _is_textured(glb_path: Path) -> bool:
+    """Whether an existing GLB embeds or references any image."""
+    if not glb_path.exists():
+        return False
+    try:
+        return bool(load_glb(str(glb_path)).images)
+    except Exception:
+        return False
+
+
+# ─── discovery ────────────────────────────────────────────────────────────────
+
+def find_sources(model_dir: Path, prefer: str) -> list[Path]:
+    """Candidate sources for a model folder.
+
+    "vox" / "obj" return the preferred source (falling back to the other);
+    "auto" returns both, and the converter keeps whichever meshes to fewer
+    triangles — texture-mapped models exported from MagicaVoxel are a
+    handful of textured quads in OBJ but thousands of faces as voxels.
+    """
+    name = model_dir.name
+    vox = model_dir / f"{name}.vox"
+    obj = model_dir / "obj" / f"{name}.obj"
+    present = [c for c in ((obj, vox) if prefer == "obj" else (vox, obj)) if c.exists()]
+    return present if prefer == "auto" else present[:1]
+
+
+def collect_model_dirs(roots: list[Path]) -> list[Path]:
+    """Every folder (at any depth) that contains a <folder>.vox or obj/<folder>.obj."""
+    dirs = []
+    for root in roots:
+        for current, _subdirs, _files in os.walk(root):
+            d = Path(current)
+            if (d / f"{d.name}.vox").exists() or (d / "obj" / f"{d.name}.obj").exists():
+                dirs.append(d)
+    return sorted(dirs)
+
+
+# ─── main ─────────────────────────────────────────────────────────────────────
+
+def main():
+    apply = "--apply" in sys.argv
+    prefer = arg_value("prefer", "auto")
+    out_root = arg_value("out")
+    jobs = int(arg_value("jobs", "0")) or None
+    targets = [Path(a).resolve() for a in sys.argv[1:] if not a.startswith("--")]
+
+    mode = "APPLYING" if apply else "DRY RUN"
+    print(f"=== {mode} ===\n")
+
+    if prefer not in ("auto", "vox", "obj"):
+        print(f"Unknown --prefer={prefer} (expected auto, vox or obj)")
+        sys.exit(1)
+
+    # Per-source digests are reused while a file's size/mtime are unchanged;
+    # built GLBs are content-addressed by the digests of every candidate.
+    sources_cache = FileCache("glb_convert_sources")
+    OUTPUT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    jobs_todo = []
+    results = {}
+    for model_dir in collect_model_dirs(targets or DEFAULT_ROOTS):
+        sources = find_sources(model_dir, prefer)
+        if not sources:
+            continue
+        h = hashlib.sha1(f"{CONVERTER_VERSION}:{VOXEL_SIZE}".encode())
+        for source in sources:
+            digest = sources_cache.digest(source)
+            sources_cache.store(source, None, digest)
+            h.update(f"|{source.suffix}:{digest}".encode())
+            # An OBJ's output also changes with its .mtl and textures
+            for dep in _obj_dependencies(source) if source.suffix.lower() == ".obj" else []:
+                dep_digest = sources_cache.digest(dep)
+                sources_cache.store(dep, None, dep_digest)
+                h.update(f"|{cache_key(dep)}:{dep_digest}".encode())
+        cached_out = OUTPUT_CACHE_DIR / f"{h.hexdigest()}.glb"
+        stats_path = cached_out.with_suffix(".json")
+        if cached_out.exists() and stats_path.exists():
+            stats = json.loads(stats_path.read_text(encoding="utf-8"))
+            results[model_dir] = (cached_out, stats, True)
+        else:
+            jobs_todo.append((model_dir, sources, cached_out))
+    sources_cache.save()
+
+    if jobs_todo:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            outputs = pool.map(convert_model,
+                               [[str(s) for s in srcs] for _d, srcs, _o in jobs_todo],
+                               [str(o) for _d, _s, o in jobs_todo])
+            for (model_dir, _sources, cached_out), stats in zip(jobs_todo, outputs):
+                if "error" not in stats:
+                    cached_out.with_suffix(".json").write_text(json.dumps(stats), encoding="utf-8")
+                results[model_dir] = (cached_out, stats, False)
+
+    written = 0
+    kept = 0
+    total_before = 0
+    total_after = 0
+    for model_dir in sorted(results):
+        cached_out, stats, from_cache = results[model_dir]
+        if "error" in stats:
+            print(f"  ERROR {cache_key(model_dir)}: {stats['error']}")
+            continue
+
+        rel_src = stats["source"]
+        dest = model_dir / f"{model_dir.name}.glb"
+        if out_root:
+            dest = Path(out_root) / model_dir.relative_to(PROJECT_ROOT) / dest.name
+        if not stats.get("textures") and _is_textured(dest):
+            # An unresolved texture map must not turn a shipped model white
+            print(f"  KEEP  {cache_key(dest)}: the existing GLB is textured, the build from {rel_src} is not")
+            kept += 1
+            continue
+        before = dest.stat().st_size if dest.exists() else 0
+        if before:
+            total_before += before
+            total_after += stats["bytes"]
+
+        tag = "cached" if from_cache else "built"
+        size_note = f"{before / 1024:.1f} KB -> " if before else ""
+        print(f"  {rel_src} -> {cache_key(dest)} ({tag}): {stats['triangles']} tris, "
+              f"{stats['vertices']} verts, {size_note}{stats['bytes'] / 1024:.1f} KB")
+
+        if apply:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(cached_out, dest)
+            written += 1
+
+    print(f"\nModels: {len(results)} ({len(jobs_todo)} built, {len(results) - len(jobs_todo)} cached)")
+    if total_before:
+        print(f"Size: {total_before / 1024:.1f} KB -> {total_after / 1024:.1f} KB")
+    if kept:
+        print(f"Kept: {kept} textured GLBs whose build came out untextured")
+    if apply:
+        print(f"Written: {written} files")
+    else:
+        print("\nRun with --apply to write files.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+"""Persistent, indexed catalog of the game data resources under data/.
+
+Every .tres is parsed once with tres_document and recorded in an SQLite
+database in tools/.cache/data_catalog.sqlite:
+
+  files  — res:// path, script class and script, id, uid, size/mtime and content hash
+  props  — every scalar property of every section ([resource] is section "",
+           sub-resources use their id): raw literal, number, text. An
+           ExtResource property stores the referenced res:// path as text.
+  refs   — resource edges: which property of which section points at which
+           ext_resource (res:// path) or sub_resource (path::id)
+  subs   — sub-resources: id, type and script path
+  defaults — `@export var name = value` defaults of the [resource] scripts
+           (enum values resolved through scripts/utils/enums.gd). Godot
+           leaves default-valued properties out of a .tres, so find()
+           falls back to these for keys a file does not write.
+
+The catalog refreshes itself on open: files whose size/mtime changed are
+re-hashed, and only those whose content hash changed are re-parsed, so a
+query on an unchanged tree costs a few stat calls plus the SQL. Scripts are
+tracked the same way and their defaults re-read when they (or enums.gd)
+change.
+
+Python API:
+
+    from data_catalog import DataCatalog
+    with DataCatalog() as catalog:
+        catalog.find("ItemData", category=6, rarity=(">=", 3))
+        catalog.referencing("dagger_common")        # id, file stem or res:// path
+        catalog.properties("res://data/items/weapons/sword_common.tres")
+        catalog.query("SELECT id FROM files WHERE script_class = ?", ("ShopData",))
+
+Usage:
+    python tools/data_catalog.py                                  # refresh, print a summary
+    python tools/data_catalog.py find ItemData category=6 "rarity>=3"
+    python tools/data_catalog.py find "*" id~%dagger%             # any class, LIKE match
+    python tools/data_catalog.py refs dagger_common               # who references it
+    python tools/data_catalog.py refs shape_l --prop=shape        # items using a shape
+    python tools/data_catalog.py show sword_common                # properties and edges
+    python tools/data_catalog.py sql "SELECT script_class, COUNT(*) FROM files GROUP BY 1"
+    python tools/data_catalog.py --rebuild                        # re-parse everything
+"""
+
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import tres_document
+from tres_document import ExtResource
+from tool_cache import CACHE_DIR, arg_value, cache_key, file_digest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+CATALOG_PATH = CACHE_DIR / "data_catalog.sqlite"
+ENUMS_SCRIPT = "res://scripts/utils/enums.gd"
+
+# Bump when the schema or the recorded fields change
+CATALOG_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    script_class TEXT,
+    script TEXT,
+    type TEXT,
+    id TEXT,
+    uid TEXT,
+    size INTEGER,
+    mtime_ns INTEGER,
+    hash TEXT
+);
+CREATE TABLE props (
+    path TEXT,
+    section TEXT,
+    key TEXT,
+    value TEXT,
+    num REAL,
+    text TEXT
+);
+CREATE TABLE refs (
+    src TEXT,
+    section TEXT,
+    prop TEXT,
+    dst TEXT,
+    kind TEXT,
+    type TEXT
+);
+CREATE TABLE subs (
+    path TEXT,
+    id TEXT,
+    type TEXT,
+    script TEXT
+);
+CREATE TABLE scripts (
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER,
+    hash TEXT
+);
+CREATE TABLE defaults (
+    script TEXT,
+    key TEXT,
+    value TEXT,
+    num REAL,
+    text TEXT
+);
+CREATE INDEX files_class ON files (script_class, id);
+CREATE INDEX files_id ON files (id);
+CREATE INDEX props_path ON props (path, section);
+CREATE INDEX props_num ON props (key, num);
+CREATE INDEX props_text ON props (key, text);
+CREATE INDEX refs_src ON refs (src);
+CREATE INDEX refs_dst ON refs (dst);
+CREATE INDEX subs_path ON subs (path);
+CREATE INDEX defaults_key ON defaults (script, key);
+"""
+
+_OPERATORS = ("<=", ">=", "!=", "=", "<", ">", "~")
+_FILTER = re.compile(r"^([A-Za-z0-9_/]+)(<=|>=|!=|=|<|>|~)(.*)$")
+
+# `@export... var name[: Type] = value` on one line; the value stops at a comment
+_EXPORT_VAR = re.compile(r'^@export\w*(?:\([^)]*\))?\s+var\s+(\w+)\s*(?::\s*[^=:]*?)?\s*:?=\s*'
+                         r'("(?:[^"\\]|\\.)*"|[^#]*?)\s*(?:#.*)?$', re.M)
+_ENUM = re.compile(r"^\s*enum\s+(\w+)\s*\{([^}]*)\}", re.M)
+_NUMBER = re.compile(r"^-?\d+(\.\d*)?(e-?\d+)?$")
+
+
+# ─── indexing ────────────────────────────────────────────────────────────────
+
+def _res_path(path: Path) -> str:
+    # iter_tres yields absolute paths under the project, no need to resolve()
+    return "res://" + path.relative_to(PROJECT_ROOT).as_posix()
+
+
+def _scalar(value):
+    """(num, text) columns for a property value, or None if it is not a scalar."""
+    if isinstance(value, bool):
+        return float(value), None
+    if isinstance(value, (int, float)):
+        return float(value), None
+    if isinstance(value, str):
+        return None, str(value)
+    if value is None:
+        return None, None
+    return None
+
+
+def index_document(res: str, doc: tres_document.TresDocument) -> dict:
+    """Rows describing one parsed file, keyed by table."""
+    props, refs, subs = [], [], []
+    ext = {s.id: s for s in doc.ext_resources}
+    used = set()
+
+    sections = [("", doc.resource)] + [(s.id, s) for s in doc.sub_resources]
+    for section_id, section in sections:
+        for key in section.keys():
+            prop = section.prop(key)
+            value = prop.value
+            scalar = _scalar(value)
+            if scalar is None and isinstance(value, ExtResource) and value.id in ext:
+                scalar = (None, ext[value.id].path)
+            if scalar is not None:
+                props.append((res, section_id, key, prop.raw, scalar[0], scalar[1]))
+            for ref in tres_document.iter_refs(value):
+                if isinstance(ref, ExtResource):
+                    target = ext.get(ref.id)
+                    if target is None:
+                        continue
+                    used.add(ref.id)
+                    refs.append((res, section_id, key, target.path, "ext", target.type))
+                else:
+                    refs.append((res, section_id, key, f"{res}::{ref.id}", "sub", None))
+
+    # Declared but never referenced from a property
+    for ext_id, target in ext.items():
+        if ext_id not in used:
+            refs.append((res, None, None, target.path, "ext", target.type))
+
+    for sub in doc.sub_resources:
+        script = doc.ext_path(sub.get("script"))
+        subs.append((res, sub.id, sub.type, script))
+
+    header = doc.header.attrs
+    return {
+        "file": (res, header.get("script_class"), doc.ext_path(doc.resource.get("script")), header.get("type"),
+                 doc.resource.get("id") if isinstance(doc.resource.get("id"), str) else None,
+                 header.get("uid")),
+        "props": props,
+        "refs": refs,
+        "subs": subs,
+    }
+
+
+def parse_enums(text: str, prefix: str = "") -> dict:
+    """{"[prefix]Enum.VALUE": int} for every enum declared in a GDScript source."""
+    values = {}
+    for name, body in _ENUM.findall(text):
+        body = re.sub(r"#[^\n]*", "", body)
+        next_value = 0
+        for entry in body.split(","):
+            label, _, explicit = entry.partition("=")
+            label = label.strip()
+            if not label:
+                continue
+            if explicit.strip():
+                next_value = int(explicit.strip())
+            values[f"{prefix}{name}.{label}"] = next_value
+            next_value += 1
+    return values
+
+
+def script_defaults(text: str, enums: dict) -> list[tuple]:
+    """(key, literal, num, text) for every exported var with a constant default.
+
+    Defaults that are not literals (arrays, constructors, expressions) are
+    skipped; `enums` maps "Enums.Type.VALUE" to its int, and the script's
+    own enums are added to it.
+    """
+    enums = {**enums, **parse_enums(text)}
+    rows = []
+    for key, raw in _EXPORT_VAR.findall(text):
+        raw = raw.strip()
+        if raw in enums:
+            rows.append((key, raw, float(enums[raw]), None))
+        elif raw in ("true", "false"):
+            rows.append((key, raw, float(raw == "true"), None))
+        elif _NUMBER.match(raw):
+            rows.append((key, raw, float(raw), None))
+        elif raw.startswith(('"', '&"')):
+            try:
+                rows.append((key, raw, None, str(tres_document.parse_value(raw))))
+            except ValueError:
+                continue
+    return rows
+
+
+def _res_file(res: str) -> Path:
+    return PROJECT_ROOT / res[len("res://"):]
+
+
+# ─── catalog ─────────────────────────────────────────────────────────────────
+
+class DataCatalog:
+    """SQLite index of data/**/*.tres, refreshed incrementally on open."""
+
+    def __init__(self, path: Path = CATALOG_PATH, refresh: bool = True, rebuild: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.parsed = 0
+        self.total = 0
+        self.errors = []
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if rebuild or version != CATALOG_VERSION:
+            self._create()
+        if refresh:
+            self.refresh()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def _create(self):
+        tables = [r[0] for r in self.db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        with self.db:
+            for t in tables:
+                self.db.execute(f"DROP TABLE {t}")
+            self.db.executescript(SCHEMA)
+            self.db.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+
+    def refresh(self, root: Path = DATA_DIR) -> int:
+        """Bring the index up to date with the files on disk; returns files re-parsed."""
+        known = {path: (size, mtime, digest) for path, size, mtime, digest
+                 in self.db.execute("SELECT path, size, mtime_ns, hash FROM files")}
+        seen = set()
+        changed = []
+        touched = []
+        for p in tres_document.iter_tres(root):
+            res = _res_path(p)
+            seen.add(res)
+            st = p.stat()
+            entry = known.get(res)
+            if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+                continue
+            digest = file_digest(p)
+            if entry and entry[2] == digest:
+                touched.append((st.st_size, st.st_mtime_ns, res))
+            else:
+                changed.append((p, res, st, digest))
+
+        removed = [res for res in known if res not in seen]
+        self.total = len(seen)
+        self.parsed = len(changed)
+        self.errors = []
+        if not (changed or touched or removed):
+            self._refresh_defaults()
+            return 0
+
+        with self.db:
+            self.db.executemany("UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?", touched)
+            for res in removed + [c[1] for c in changed]:
+                self._delete(res)
+            for p, res, st, digest in changed:
+                try:
+                    rows = index_document(res, tres_document.load(p))
+                except (ValueError, IndexError, UnicodeDecodeError) as e:
+                    # Keep a files row so the error is not re-parsed until the file changes
+                    self.errors.append((res, str(e)))
+                    rows = {"file": (res, None, None, None, None, None), "props": [], "refs": [], "subs": []}
+                self.db.execute("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                rows["file"] + (st.st_size, st.st_mtime_ns, digest))
+                self.db.executemany("INSERT INTO props VALUES (?, ?, ?, ?, ?, ?)", rows["props"])
+                self.db.executemany("INSERT INTO refs VALUES (?, ?, ?, ?, ?, ?)", rows["refs"])
+                self.db.executemany("INSERT INTO subs VALUES (?, ?, ?, ?)", rows["subs"])
+        self._refresh_defaults()
+        return len(changed)
+
+    def _refresh_defaults(self):
+        """Re-read the defaults of every [resource] script that changed (all of them if enums.gd did)."""
+        known = {path: (size, mtime, digest) for path, size, mtime, digest
+                 in self.db.execute("SELECT path, size, mtime_ns, hash FROM scripts")}
+        wanted = {r[0] for r in self.db.execute("SELECT DISTINCT script FROM files WHERE script IS NOT NULL")}
+        wanted.add(ENUMS_SCRIPT)
+        changed = {}
+        for res in wanted:
+            try:
+                st = _res_file(res).stat()
+            except OSError:
+                continue
+            entry = known.get(res)
+            if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+                continue
+            digest = file_digest(_res_file(res))
+            if not entry or entry[2] != digest:
+                changed[res] = (st.st_size, st.st_mtime_ns, digest)
+            else:
+                self.db.execute("UPDATE scripts SET size = ?, mtime_ns = ? WHERE path = ?",
+                                (st.st_size, st.st_mtime_ns, res))
+        removed = [res for res in known if res not in wanted]
+        if ENUMS_SCRIPT in changed:
+            reread = wanted
+        else:
+            reread = set(changed) | {res for res in wanted if res not in known}
+        if not (changed or removed or reread):
+            self.db.commit()
+            return
+
+        def read(res):
+            return _res_file(res).read_text(encoding="utf-8", errors="replace")
+
+        try:
+            enums = parse_enums(read(ENUMS_SCRIPT), "Enums.")
+        except OSError:
+            enums = {}
+        with self.db:
+            for res in removed:
+                self.db.execute("DELETE FROM scripts WHERE path = ?", (res,))
+                self.db.execute("DELETE FROM defaults WHERE script = ?", (res,))
+            for res, (size, mtime, digest) in changed.items():
+                self.db.execute("INSERT OR REPLACE INTO scripts VALUES (?, ?, ?, ?)", (res, size, mtime, digest))
+            for res in reread:
+                self.db.execute("DELETE FROM defaults WHERE script = ?", (res,))
+                try:
+                    text = read(res)
+                except OSError:
+                    continue
+                self.db.executemany("INSERT INTO defaults VALUES (?, ?, ?, ?, ?)",
+                                    [(res,) + row for row in script_defaults(text, enums)])
+
+    def _delete(self, res: str):
+        self.db.execute("DELETE FROM files WHERE path = ?", (res,))
+        self.db.execute("DELETE FROM props WHERE path = ?", (res,))
+        self.db.execute("DELETE FROM refs WHERE src = ?", (res,))
+        self.db.execute("DELETE FROM subs WHERE path = ?", (res,))
+
+    # ── queries ──
+
+    def query(self, sql: str, params=()) -> list[tuple]:
+        return self.db.execute(sql, params).fetchall()
+
+    def resolve(self, target: str) -> list[str]:
+        """res:// paths matching a res:// path, a project-relative path, an id or a file stem."""
+        if target.startswith("res://"):
+            return [target]
+        if "/" in target:
+            return [f"res://{target}"]
+        rows = self.query("SELECT path FROM files WHERE id = ? OR path LIKE ? ORDER BY path",
+                          (target, f"%/{target}.tres"))
+        return [r[0] for r in rows]
+
+    def find(self, script_class: str = None, **filters) -> list[tuple[str, str]]:
+        """(path, id) of [resource]s matching every filter.
+
+        A filter value is compared for equality, or given as (op, value) with
+        op one of < <= > >= = != and ~ (SQL LIKE). Numbers compare against
+        numeric properties, strings against text (and ExtResource paths).
+        A property the file does not write compares as its script default.
+        """
+        sql = ["SELECT path, id FROM files f WHERE 1"]
+        params = []
+        if script_class and script_class != "*":
+            sql.append("AND script_class = ?")
+            params.append(script_class)
+        for key, cond in filters.items():
+            op, value = cond if isinstance(cond, tuple) else ("=", cond)
+            if op not in _OPERATORS:
+                raise ValueError(f"unknown operator {op!r}")
+            if key == "id":
+                column = "f.id"
+            else:
+                col = "num" if isinstance(value, (int, float)) else "text"
+                prop = "FROM props p WHERE p.path = f.path AND p.section = '' AND p.key = ?"
+                column = (f"(CASE WHEN EXISTS (SELECT 1 {prop}) THEN (SELECT p.{col} {prop}) "
+                          f"ELSE (SELECT d.{col} FROM defaults d WHERE d.script = f.script AND d.key = ?) END)")
+                params.extend([key, key, key])
+            sql_op = "LIKE" if op == "~" else op
+            if isinstance(value, bool):
+                value = float(value)
+            sql.append(f"AND {column} {sql_op} ?")
+            params.append(value)
+        sql.append("ORDER BY path")
+        return self.query(" ".join(sql), params)
+
+    def referencing(self, target: str, prop: str = None) -> list[tuple[str, str, str]]:
+        """(src, section, property) for every property pointing at `target`."""
+        paths = self.resolve(target)
+        if not paths:
+            return []
+        sql = (f"SELECT DISTINCT src, section, prop FROM refs WHERE kind = 'ext' AND prop IS NOT NULL "
+               f"AND dst IN ({', '.join('?' * len(paths))})")
+        params = list(paths)
+        if prop:
+            sql += " AND prop = ?"
+            params.append(prop)
+        return self.query(sql + " ORDER BY src, section, prop", params)
+
+    def references(self, path: str) -> list[tuple[str, str, str, str]]:
+        """(section, property, dst, kind) edges leaving one file."""
+        return self.query("SELECT section, prop, dst, kind FROM refs WHERE src = ? "
+                          "ORDER BY section, prop", (path,))
+
+    def properties(self, path: str, section: str = "") -> dict:
+        """Scalar properties of one section of a file, parsed from their literals."""
+        rows = self.query("SELECT key, value FROM props WHERE path = ? AND section = ? ORDER BY rowid",
+                          (path, section))
+        return {key: tres_document.parse_value(raw) for key, raw in rows}
+
+
+# ─── main ────────────────────────────────────────────────────────────────────
+
+def _parse_filter(text: str) -> tuple[str, tuple]:
+    m = _FILTER.match(text)
+    if m is None:
+        raise ValueError(f"bad filter {text!r} (expected key=value, key>=3, key~%text%)")
+    key, op, raw = m.groups()
+    try:
+        value = int(raw)
+    except ValueError:
+        try:
+            value = float(raw)
+        except ValueError:
+            value = raw
+    if op == "~":
+        value = raw
+    return key, (op, value)
+
+
+def _print_rows(rows):
+    for row in rows:
+        print("  " + "  ".join("" if v is None else str(v) for v in row))
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    command = args[0] if args else ""
+
+    start = time.perf_counter()
+    catalog = DataCatalog(rebuild="--rebuild" in sys.argv)
+    refreshed = time.perf_counter()
+    for res, error in catalog.errors:
+        print(f"  ERROR {res}: {error}")
+
+    if command == "find":
+        if len(args) < 2:
+            print("Usage: data_catalog.py find <ScriptClass|*> [key=value ...]")
+            sys.exit(1)
+        try:
+            filters = dict(_parse_filter(a) for a in args[2:])
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        rows = catalog.find(args[1], **filters)
+        _print_rows(rows)
+        print(f"\n{len(rows)} match(es)")
+    elif command == "refs":
+        if len(args) < 2:
+            print("Usage: data_catalog.py refs <id|stem|res://path> [--prop=name]")
+            sys.exit(1)
+        targets = catalog.resolve(args[1])
+        rows = catalog.referencing(args[1], arg_value("prop") or None)
+        print(f"Target(s): {', '.join(targets) or '(none found)'}")
+        _print_rows((src, f"{section or '[resource]'}.{prop}") for src, section, prop in rows)
+        print(f"\n{len({r[0] for r in rows})} file(s) reference it")
+    elif command == "show":
+        if len(args) < 2:
+            print("Usage: data_catalog.py show <id|stem|res://path>")
+            sys.exit(1)
+        for path in catalog.resolve(args[1]):
+            row = catalog.query("SELECT script_class, id, hash FROM files WHERE path = ?", (path,))
+            if not row:
+                continue
+            print(f"{path}  ({row[0][0]}, id={row[0][1]}, sha1 {row[0][2][:12]})")
+            for key, raw in catalog.query("SELECT key, value FROM props WHERE path = ? AND section = '' "
+                                          "ORDER BY rowid", (path,)):
+                print(f"  {key} = {raw}")
+            for section, prop, dst, kind in catalog.references(path):
+                if prop is not None:
+                    print(f"  -> {section or '[resource]'}.{prop}: {dst}")
+    elif command == "sql":
+        if len(args) < 2:
+            print('Usage: data_catalog.py sql "SELECT ..."')
+            sys.exit(1)
+        try:
+            rows = catalog.query(args[1])
+        except sqlite3.Error as e:
+            print(f"SQL error: {e}")
+            sys.exit(1)
+        _print_rows(rows)
+        print(f"\n{len(rows)} row(s)")
+    elif command:
+        print(f"Unknown command {command!r} (find, refs, show, sql)")
+        sys.exit(1)
+    else:
+        print("\nResults:")
+        for cls, count in catalog.query("SELECT COALESCE(script_class, '?'), COUNT(*) FROM files "
+                                        "GROUP BY 1 ORDER BY 2 DESC"):
+            print(f"  {cls:<24} {count}")
+        props, refs, defaults = catalog.query("SELECT (SELECT COUNT(*) FROM props), (SELECT COUNT(*) FROM refs), "
+                                              "(SELECT COUNT(*) FROM defaults)")[0]
+        print(f"  Files:      {catalog.total}")
+        print(f"  Properties: {props}")
+        print(f"  Defaults:   {defaults}")
+        print(f"  Edges:      {refs}")
+        print(f"  Catalog:    {cache_key(catalog.path)}")
+
+    done = time.perf_counter()
+    print(f"\n({catalog.parsed} of {catalog.total} file(s) re-indexed in "
+          f"{(refreshed - start) * 1000:.0f} ms, query {(done - refreshed) * 1000:.0f} ms)")
+    catalog.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""Generate decimated LOD GLBs for scatter props (quadric error metric).
+
+For every .glb / .gltf model this writes <name>_lod1.glb, <name>_lod2.glb,
+... next to it (always binary; a .gltf's external buffers are merged in),
+each reduced to a target fraction of the original triangle count with
+Garland-Heckbert quadric error metrics. Collapses are half-edge (a vertex
+moves onto an existing neighbour), so every surviving vertex keeps its
+exact original attributes.
+
+Seams are preserved: a vertex may only collapse onto a neighbour that
+already carries every UV / colour / material variant it uses, so palette
+colour regions and texture islands keep their outlines. Normals are not
+treated as seams (flat-shaded voxel models would otherwise be locked);
+each moved corner takes the target's normal closest to its own. Open
+borders and non-manifold edges are locked.
+
+The achieved triangle count, ratio and error (area-weighted RMS distance
+to the original surface planes, in model units) are stored in each LOD
+mesh's `extras` and printed. LOD meshes are cache-optimised with
+optimize_glb.py before saving.
+
+The default folder is the nature kit the prop registries scatter from
+(AssetPaths.NATURE_KIT); PropScatter._lod_scene_paths() looks for
+<name>_lodN.glb next to each prop's scene_path, whatever its extension.
+
+Usage:
+    python tools/decimate_glb_lods.py                         # dry run over assets/3D/nature
+    python tools/decimate_glb_lods.py --apply                 # write <name>_lodN.glb siblings
+    python tools/decimate_glb_lods.py --ratios=0.5,0.25,0.1   # custom LOD targets
+    python tools/decimate_glb_lods.py path/a.glb some/dir     # specific files / folders
+"""
+
+import heapq
+import math
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+from pygltflib import GLTF2
+
+from glb_mesh import (
+    ELEMENT_ARRAY_BUFFER, UNSIGNED_SHORT, UNSIGNED_INT,
+    GlbEditor, is_rewritable, load_glb, read_accessor, read_indices,
+)
+from optimize_glb import optimize_gltf, vertex_groups
+from quantize_glb import collect_glb_paths
+from tool_cache import arg_value
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DIR = PROJECT_ROOT / "assets" / "3D" / "nature"  # AssetPaths.NATURE_KIT
+MODEL_SUFFIXES = (".glb", ".gltf")
+
+DEFAULT_RATIOS = (0.5, 0.25)
+MIN_GAIN = 0.9            # skip a LOD that keeps more than 90% of the previous level
+MAX_UINT16_INDEX = 65535
+LOD_SUFFIX = re.compile(r"_lod\d+$")
+
+# Attributes that may differ across a collapse (everything else is a seam)
+NON_SEAM_ATTRIBUTES = {"NORMAL", "TANGENT"}
+
+
+# ──────────────────────────────────────────────
+#  Quadrics (10 coefficients of the symmetric 4x4 matrix)
+# ──────────────────────────────────────────────
+
+def _plane_quadrics(positions: np.ndarray, tri_pos: np.ndarray):
+    """Area-weighted plane quadric of every triangle, as (T, 10) plus areas."""
+    p0, p1, p2 = (positions[tri_pos[:, i]] for i in range(3))
+    n = np.cross(p1 - p0, p2 - p0)
+    length = np.linalg.norm(n, axis=1)
+    area = length / 2.0
+    n = n / np.maximum(length, 1e-30)[:, None]
+    d = -(n * p0).sum(axis=1)
+    a, b, c = n[:, 0], n[:, 1], n[:, 2]
+    q = np.stack([a * a, a * b, a * c, a * d, b * b, b * c, b * d, c * c, c * d, d * d], axis=1)
+    return q * area[:, None], area
+
+
+def _quadric_error(q, p) -> float:
+    x, y, z = p
+    return (q[0] * x * x + 2 * q[1] * x * y + 2 * q[2] * x * z + 2 * q[3] * x
+            + q[4] * y * y + 2 * q[5] * y * z + 2 * q[6] * y
+            + q[7] * z * z + 2 * q[8] * z + q[9])
+
+
+def _cross(a, b):
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+
+def _tri_normal(p0, p1, p2):
+    return _cross((p1[0] - p0[0], p1[1] - p0[1], p1[2] - p0[2]),
+                  (p2[0] - p0[0], p2[1] - p0[1], p2[2] - p0[2]))
+
+
+# ──────────────────────────────────────────────
+#  Decimation
+# ──────────────────────────────────────────────
+
+class Decimator:
+    """Half-edge-collapse QEM decimator over one shared vertex buffer.
+
+    `attrs` maps semantic -> per-vertex array; `index_lists` holds one
+    triangle list per primitive (material). Call run(targets) to get a
+    snapshot of the index lists at each target triangle count.
+    """
+
+    def __init__(self, attrs: dict, index_lists: list):
+        positions = np.ascontiguousarray(attrs["POSITION"], dtype=np.float32)
+        self.pos_of = _weld_ids(positions)
+        pos_count = int(self.pos_of.max()) + 1 if len(self.pos_of) else 0
+        self.points = np.zeros((pos_count, 3))
+        self.points[self.pos_of] = positions
+        self.point_list = self.points.tolist()
+
+        seam = [v for k, v in attrs.items() if k != "POSITION" and k not in NON_SEAM_ATTRIBUTES]
+        self.seam_key = (_weld_ids(*seam) if seam else np.zeros(len(positions), np.int64)).tolist()
+        normals = attrs.get("NORMAL")
+        self.normals = normals.astype(np.float64).tolist() if normals is not None else None
+
+        self.prim_count = len(index_lists)
+        tris = [idx.reshape(-1, 3) for idx in index_lists]
+        self.tri_prim = np.concatenate(
+            [np.full(len(t), i, dtype=np.int64) for i, t in enumerate(tris)]).tolist()
+        all_tris = np.concatenate(tris) if tris else np.zeros((0, 3), np.uint32)
+        self.tris = all_tris.astype(np.int64).tolist()
+        self.alive = bytearray([1]) * len(self.tris)
+        self.live_count = len(self.tris)
+        pos_of = self.pos_of.tolist()
+        self.pos_of_list = pos_of
+
+        tri_pos = self.pos_of[all_tris] if len(all_tris) else np.zeros((0, 3), np.int64)
+        self.pos_tris = [set() for _ in range(pos_count)]
+        for t, (a, b, c) in enumerate(tri_pos.tolist()):
+            self.pos_tris[a].add(t)
+            self.pos_tris[b].add(t)
+            self.pos_tris[c].add(t)
+
+        q, area = _plane_quadrics(self.points, tri_pos)
+        quadrics = np.zeros((pos_count, 10))
+        areas = np.zeros(pos_count)
+        for i in range(3):
+            np.add.at(quadrics, tri_pos[:, i], q)
+            np.add.at(areas, tri_pos[:, i], area)
+        self.quadrics = quadrics.tolist()
+        self.areas = areas.tolist()
+        self.locked = self._locked_points(tri_pos, pos_count)
+        self.version = [0] * pos_count
+        self.max_error = 0.0
+
+    @staticmethod
+    def _locked_points(tri_pos: np.ndarray, pos_count: int) -> bytearray:
+        """Points on open borders or non-manifold edges."""
+        locked = bytearray(pos_count)
+        if not len(tri_pos):
+            return locked
+        edges = np.concatenate([tri_pos[:, [0, 1]], tri_pos[:, [1, 2]], tri_pos[:, [2, 0]]])
+        edges = np.sort(edges, axis=1)
+        unique, counts = np.unique(edges, axis=0, return_counts=True)
+        for a, b in unique[counts != 2].tolist():
+            locked[a] = 1
+            locked[b] = 1
+        return locked
+
+    # ── topology queries ──
+
+    def _tri_points(self, t):
+        pos_of = self.pos_of_list
+        a, b, c = self.tris[t]
+        return pos_of[a], pos_of[b], pos_of[c]
+
+    def _neighbours(self, p) -> set:
+        out = set()
+        for t in self.pos_tris[p]:
+            out.update(self._tri_points(t))
+        out.discard(p)
+        return out
+
+    def _corner_key(self, t, v):
+        return self.seam_key[v] * self.prim_count + self.tri_prim[t]
+
+    def _variants(self, p) -> dict:
+        """corner key -> [vertex ids] present at point p in live triangles."""
+        pos_of = self.pos_of_list
+        out = {}
+        for t in self.pos_tris[p]:
+            for v in self.tris[t]:
+                if pos_of[v] == p:
+                    out.setdefault(self._corner_key(t, v), []).append(v)
+        return out
+
+    def _pick_vertex(self, candidates, v):
+        if self.normals is None or len(candidates) == 1:
+            return candidates[0]
+        n = self.normals[v]
+        return max(candidates, key=lambda c: sum(a * b for a, b in zip(self.normals[c], n)))
+
+    # ── collapse ──
+
+    def _cost(self, u, w) -> float:
+        q = [a + b for a, b in zip(self.quadrics[u], self.quadrics[w])]
+        return max(_quadric_error(q, self.point_list[w]), 0.0)
+
+    def _plan(self, u, w):
+        """Return {tri: new corner list} for collapsing u onto w, or None if invalid."""
+        if self.locked[u]:
+            return None
+        shared = [t for t in self.pos_tris[u] if w in self._tri_points(t)]
+        if not shared:
+            return None
+        # Link condition: only the apexes of the shared triangles may be common neighbours
+        if len(self._neighbours(u) & self._neighbours(w)) > len(shared):
+            return None
+
+        variants = self._variants(w)
+        points = self.point_list
+        pos_of = self.pos_of_list
+        plan = {}
+        for t in self.pos_tris[u]:
+            corners = self.tris[t]
+            pts = [pos_of[v] for v in corners]
+            if w in pts:
+                continue
+            new = list(corners)
+            for i, v in enumerate(corners):
+                if pts[i] == u:
+                    options = variants.get(self._corner_key(t, v))
+                    if not options:
+                        return None  # would break a UV / colour / material seam
+                    new[i] = self._pick_vertex(options, v)
+            before = _tri_normal(*(points[p] for p in pts))
+            after = _tri_normal(*(points[w if p == u else p] for p in pts))
+            if sum(a * b for a, b in zip(before, after)) <= 0.0:
+                return None  # flipped or degenerate
+            plan[t] = new
+        return plan
+
+    def _apply(self, u, w, plan):
+        for t in list(self.pos_tris[u]):
+            if t in plan:
+                self.tris[t] = plan[t]
+                self.pos_tris[w].add(t)
+            else:
+                self.alive[t] = 0
+                self.live_count -= 1
+                for p in set(self._tri_points(t)):
+                    self.pos_tris[p].discard(t)
+        self.pos_tris[u] = set()
+        self.quadrics[w] = [a + b for a, b in zip(self.quadrics[u], self.quadrics[w])]
+        self.areas[w] += self.areas[u]
+        self.version[u] += 1
+        self.version[w] += 1
+
+    def _push(self, heap, u, w):
+        if not self.locked[u]:
+            heapq.heappush(heap, (self._cost(u, w), u, w, self.version[u], self.version[w]))
+
+    def run(self, targets: list) -> list:
+        """Decimate towards each target triangle count (descending).
+
+        Returns [(index_lists, triangles, error)] — one snapshot per target.
+        When no further valid collapse exists, the remaining snapshots
+        repeat the last reachable state.
+        """
+        heap = []
+        for p in range(len(self.pos_tris)):
+            for n in self._neighbours(p):
+                self._push(heap, p, n)
+
+        snapshots = []
+        for target in targets:
+            while self.live_count > target and heap:
+                cost, u, w, vu, vw = heapq.heappop(heap)
+                if self.version[u] != vu or self.version[w] != vw:
+                    continue
+                plan = self._plan(u, w)
+                if plan is None:
+                    continue
+                area = self.areas[u] + self.areas[w]
+                self.max_error = max(self.max_error, math.sqrt(cost / area) if area > 0 else 0.0)
+                self._apply(u, w, plan)
+                for n in self._neighbours(w):
+                    self._push(heap, n, w)
+                    self._push(heap, w, n)
+            snapshots.append((self._index_lists(), self.live_count, self.max_error))
+        return snapshots
+
+    def _index_lists(self) -> list:
+        lists = [[] for _ in range(self.prim_count)]
+        for t, corners in enumerate(self.tris):
+            if self.alive[t]:
+                lists[self.tri_prim[t]].extend(corners)
+        return [np.asarray(l, dtype=np.uint32) for l in lists]
+
+
+def _weld_ids(*arrays) -> np.ndarray:
+    """Id per row such that rows with identical bytes (across all arrays) share an id."""
+    count = len(arrays[0])
+    columns = [np.ascontiguousarray(a).reshape(count, -1).view(np.uint8).reshape(count, -1)
+               for a in arrays]
+    packed = np.ascontiguousarray(np.hstack(columns))
+    keys = packed.view(np.dtype((np.void, packed.shape[1]))).ravel()
+    _unique, inverse = np.unique(keys, return_inverse=True)
+    return inverse.ravel().astype(np.int64)
+
+
+# ──────────────────────────────────────────────
+#  GLB pass
+# ──────────────────────────────────────────────
+
+def decimate_gltf(gltf: GLTF2, ratios) -> list:
+    """Decimate every triangle primitive. Returns one result per ratio:
+    {"ratio", "triangles", "error", "groups": [[indices per primitive], ...]}."""
+    results = [{"ratio": r, "triangles": 0, "error": 0.0, "groups": []} for r in ratios]
+    for attrs, prims, _exclusive in vertex_groups(gltf):
+        data = {k: read_accessor(gltf, a) for k, a in attrs.items()}
+        index_lists = [read_indices(gltf, p) for p in prims]
+        index_lists = [idx[:len(idx) - len(idx) % 3] for idx in index_lists]
+        total = sum(len(idx) // 3 for idx in index_lists)
+
+        decimator = Decimator(data, index_lists)
+        snapshots = decimator.run([int(total * r) for r in ratios])
+        for result, (lists, tris, error) in zip(results, snapshots):
+            result["groups"].append(lists)
+            result["triangles"] += tris
+            result["error"] = max(result["error"], error)
+    return results
+
+
+def build_lod(path: Path, level: int, result: dict, base_tris: int) -> GLTF2:
+    """Load a fresh copy of `path` and swap in the decimated index buffers."""
+    gltf = load_glb(str(path))
+    editor = GlbEditor(gltf)
+    for (_attrs, prims, _exclusive), lists in zip(vertex_groups(gltf), result["groups"]):
+        vertex_count = gltf.accessors[prims[0].attributes.POSITION].count
+        comp = UNSIGNED_SHORT if vertex_count <= MAX_UINT16_INDEX else UNSIGNED_INT
+        for prim, idx in zip(prims, lists):
+            prim.indices = editor.add_accessor(idx, comp, "SCALAR",
+                                               target=ELEMENT_ARRAY_BUFFER, bounds=len(idx) > 0)
+
+    for mesh in gltf.meshes or []:
+        mesh.primitives = [p for p in mesh.primitives
+                           if p.indices is None or gltf.accessors[p.indices].count]
+        mesh.extras = {
+            "lod": level,
+            "ratio": round(result["triangles"] / base_tris, 4) if base_tris else 1.0,
+            "triangles": result["triangles"],
+            "error": round(result["error"], 6),
+        }
+    editor.finish()
+    optimize_gltf(gltf)
+    return gltf
+
+
+def lod_path(path: Path, level: int) -> Path:
+    return path.with_name(f"{path.stem}_lod{level}.glb")
+
+
+# ──────────────────────────────────────────────
+#  Main
+# ──────────────────────────────────────────────
+
+def _rel(path: Path) -> str:
+    try:
+        return str(path.resolve().relative_to(PROJECT_ROOT))
+    except ValueError:
+        return str(path)
+
+
+def main():
+    apply = "--apply" in sys.argv
+    ratios_arg = arg_value("ratios")
+    ratios = [float(r) for r in ratios_arg.split(",")] if ratios_arg else list(DEFAULT_RATIOS)
+    targets = [a for a in sys.argv[1:] if not a.startswith("--")] or [str(DEFAULT_DIR)]
+    mode = "APPLYING" if apply else "DRY RUN"
+    print(f"=== {mode} ===\n")
+
+    written = 0
+    base_total = 0
+    lod_totals = [0] * len(ratios)
+
+    for path in collect_glb_paths(targets, MODEL_SUFFIXES):
+        if LOD_SUFFIX.search(path.stem):
+            continue
+        try:
+            gltf = load_glb(str(path))
+            if not is_rewritable(gltf):
+                print(f"  SKIP  {_rel(path)} (compressed geometry)")
+                continue
+            base_tris = sum(len(read_indices(gltf, p)) // 3
+                            for _a, prims, _e in vertex_groups(gltf) for p in prims)
+            if not base_tris:
+                print(f"  SKIP  {_rel(path)} (no triangle primitives)")
+                continue
+            results = decimate_gltf(gltf, ratios)
+        except Exception as e:
+            print(f"  ERROR {_rel(path)}: {e}")
+            continue
+
+        base_total += base_tris
+        parts = []
+        previous = base_tris
+        level = 0
+        for i, result in enumerate(results):
+            tris = result["triangles"]
+            if tris > previous * MIN_GAIN:
+                lod_totals[i] += previous
+                continue
+            level += 1
+            lod_totals[i] += tris
+            parts.append(f"LOD{level} {tris} ({tris / base_tris:.0%}, err {result['error']:.4f})")
+            if apply:
+                build_lod(path, level, result, base_tris).save_binary(str(lod_path(path, level)))
+                written += 1
+            previous = tris
+
+        # Drop stale siblings from an earlier run with more levels
+        stale = level + 1
+        while apply and lod_path(path, stale).exists():
+            lod_path(path, stale).unlink()
+            stale += 1
+
+        detail = ", ".join(parts) if parts else "no reduction possible (seams/borders)"
+        print(f"  {_rel(path)}: {base_tris} tris -> {detail}")
+
+    if base_total:
+        levels = " / ".join(f"{t} ({t / base_total:.0%})" for t in lod_totals)
+        print(f"\nTriangles: LOD0 {base_total} -> {levels}")
+    if apply:
+        print(f"Written: {written} files")
+    else:
+        print("\nRun with --apply to write files.")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,46 +4,94 @@ Scans all item .tres files, reads their referenced sprite, detects which 64x64
 cells are filled, and compares against the currently assigned shape. Outputs a
 JSON report at tools/shape_report.json listing mismatches for Claude to process.
 
+Detected cells are cached in tools/.cache/sprite_shapes.json per sprite
+(size + mtime, then content hash), so only changed sprites are re-analysed;
+changing CELL_SIZE or ALPHA_THRESHOLD discards the cache. Cache misses are
+analysed in a process pool.
+
 Usage:
     python tools/detect_sprite_shapes.py                  # full scan, write report
     python tools/detect_sprite_shapes.py sword_common     # scan specific item IDs
     python tools/detect_sprite_shapes.py --dry-run        # print report, don't write file
+    python tools/detect_sprite_shapes.py --no-cache       # re-analyse every sprite
+    python tools/detect_sprite_shapes.py --mirror         # also accept mirrored sprites
+
+Shapes are matched by canonical form: every cell set is keyed by the
+smallest of its 90-degree rotations (and mirror images with --mirror), so
+a sprite drawn in any orientation its ItemShape allows (rotation_states)
+is found with one dict lookup. The report states the rotation that matched.
 """
 
 import json
 import os
-import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from PIL import Image
+
+import numpy as np
+
+import tres_document
+from sprite_image import load_rgba
+from tool_cache import FileCache
 
 CELL_SIZE = 64
 # Minimum percentage of non-transparent pixels in a cell to consider it "filled"
 ALPHA_THRESHOLD = 10  # percent
+# Below this many uncached sprites, analysing inline beats starting a pool
+MIN_POOL_JOBS = 16
+# Written by pack_item_atlas.py; maps source sprites to their AtlasTextures
+ATLAS_MANIFEST = Path(__file__).resolve().parent.parent / "assets" / "sprites" / "atlas" / "items_atlas.json"
 
 # ─── sprite analysis ───────────────────────────────────────────────────────────
 
 def get_filled_cells(image_path: str) -> list[tuple[int, int]]:
     """Return sorted list of (col, row) grid cells that have significant content."""
-    img = Image.open(image_path).convert("RGBA")
-    width, height = img.size
+    rgba = load_rgba(image_path)
+    height, width = rgba.shape[:2]
     cols = width // CELL_SIZE
     rows = height // CELL_SIZE
 
-    filled = []
-    for row in range(rows):
-        for col in range(cols):
-            x0 = col * CELL_SIZE
-            y0 = row * CELL_SIZE
-            cell = img.crop((x0, y0, x0 + CELL_SIZE, y0 + CELL_SIZE))
-            pixels = cell.tobytes()
-            # RGBA = 4 bytes per pixel, check alpha (every 4th byte starting at offset 3)
-            total = CELL_SIZE * CELL_SIZE
-            opaque = sum(1 for i in range(3, len(pixels), 4) if pixels[i] > 20)
-            if (opaque / total * 100) >= ALPHA_THRESHOLD:
-                filled.append((col, row))
+    # Alpha channel as (rows, CELL_SIZE, cols, CELL_SIZE); partial edge cells are ignored
+    alpha = rgba[:rows * CELL_SIZE, :cols * CELL_SIZE, 3]
+    opaque = (alpha.reshape(rows, CELL_SIZE, cols, CELL_SIZE) > 20).sum(axis=(1, 3))
+    total = CELL_SIZE * CELL_SIZE
+    filled_rows, filled_cols = np.nonzero(opaque / total * 100 >= ALPHA_THRESHOLD)
+    return [(int(c), int(r)) for r, c in zip(filled_rows, filled_cols)]
+
 
-    return filled
+def _analyse_sprite(image_path: str):
+    """Process-pool entry point: (cells, None) or (None, error message)."""
+    try:
+        return get_filled_cells(image_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def analyse_sprites(paths: list[str], cache: FileCache) -> dict:
+    """Filled cells for every sprite path, reusing cached results.
+
+    Returns {path: (cells, error)}; failed sprites are not cached.
+    """
+    results = {}
+    todo = []
+    for path in dict.fromkeys(paths):
+        cached = cache.lookup(path)
+        if cached is not None:
+            results[path] = ([tuple(c) for c in cached], None)
+        else:
+            todo.append(path)
+
+    if len(todo) >= MIN_POOL_JOBS:
+        with ProcessPoolExecutor() as pool:
+            analysed = list(pool.map(_analyse_sprite, todo, chunksize=8))
+    else:
+        analysed = [_analyse_sprite(p) for p in todo]
+
+    for path, (cells, error) in zip(todo, analysed):
+        if error is None:
+            cache.store(path, [list(c) for c in cells])
+        results[path] = (cells, error)
+    return results
 
 
 def normalize_cells(cells: list[tuple[int, int]]) -> list[tuple[int, int]]:
@@ -55,6 +103,55 @@ def normalize_cells(cells: list[tuple[int, int]]) -> list[tuple[int, int]]:
     return sorted((c - min_c, r - min_r) for c, r in cells)
 
 
+def rotate_cells(cells: list[tuple[int, int]], turns: int) -> list[tuple[int, int]]:
+    """Rotate 90 degrees clockwise `turns` times (as ItemShape.get_rotated_cells), normalized."""
+    for _ in range(turns % 4):
+        cells = [(-r, c) for c, r in cells]
+    return normalize_cells(cells)
+
+
+def mirror_cells(cells: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Mirror horizontally, normalized."""
+    return normalize_cells([(-c, r) for c, r in cells])
+
+
+def orientations(cells: list[tuple[int, int]], mirror: bool = False):
+    """Yield (turns, mirrored, normalized cells) for every orientation of `cells`."""
+    for mirrored in ((False, True) if mirror else (False,)):
+        base = mirror_cells(cells) if mirrored else normalize_cells(cells)
+        for turns in range(4):
+            yield turns, mirrored, rotate_cells(base, turns)
+
+
+def canonical_key(cells: list[tuple[int, int]], mirror: bool = False) -> tuple:
+    """Orientation-independent key: the smallest sorted cell tuple over all orientations."""
+    return min(tuple(o) for _t, _m, o in orientations(cells, mirror))
+
+
+def match_shape(cells: list[tuple[int, int]], shapes_by_key: dict, current_id: str = "",
+                mirror: bool = False):
+    """Find the shape whose allowed orientations include `cells` (normalized).
+
+    Returns (shape_id, turns, mirrored) or None. `turns` is the clockwise
+    rotation applied to the shape's cells to get the sprite's layout. The
+    current shape is preferred when several shapes match.
+    """
+    candidates = shapes_by_key.get(canonical_key(cells, mirror), [])
+    target = normalize_cells(cells)
+    found = []
+    for shape in candidates:
+        for turns, mirrored, oriented in orientations(shape["cells"], mirror):
+            if turns >= shape["rotation_states"]:
+                continue
+            if oriented == target:
+                found.append((shape["id"], turns, mirrored))
+                break
+    if not found:
+        return None
+    found.sort(key=lambda f: (f[0] != current_id, f[2], f[1]))
+    return found[0]
+
+
 def cells_to_ascii(cells: list[tuple[int, int]]) -> str:
     """Convert cell coordinates to ASCII grid art."""
     if not cells:
@@ -77,90 +174,77 @@ def cells_to_vector2i_str(cells: list[tuple[int, int]]) -> str:
 
 # ─── shape .tres parsing ──────────────────────────────────────────────────────
 
-def load_existing_shapes(shapes_dir: str) -> tuple[dict, dict]:
+def load_existing_shapes(shapes_dir: str, mirror: bool = False) -> tuple[dict, dict]:
     """Parse shape .tres files.
     Returns:
-        cells_to_id: frozenset of normalized cells -> shape_id
+        shapes_by_key: canonical_key(cells) -> list of {"id", "cells", "rotation_states"}
         id_to_cells: shape_id -> sorted list of cells
     """
-    cells_to_id = {}
+    shapes_by_key = {}
     id_to_cells = {}
     if not os.path.isdir(shapes_dir):
-        return cells_to_id, id_to_cells
+        return shapes_by_key, id_to_cells
 
-    for fname in os.listdir(shapes_dir):
+    for fname in sorted(os.listdir(shapes_dir)):
         if not fname.endswith(".tres"):
             continue
-        filepath = os.path.join(shapes_dir, fname)
-        shape_id = None
-        cells = []
-        with open(filepath, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.startswith("id = "):
-                    shape_id = line.split('"')[1]
-                if "cells = " in line:
-                    for m in re.finditer(r"Vector2i\((\d+),\s*(\d+)\)", line):
-                        cells.append((int(m.group(1)), int(m.group(2))))
+        resource = tres_document.load(os.path.join(shapes_dir, fname)).resource
+        shape_id = resource.get("id")
+        cells = [tuple(c) for c in resource.get("cells", [])]
+        rotation_states = resource.get("rotation_states", 1)
         if shape_id and cells:
             norm = normalize_cells(cells)
-            cells_to_id[frozenset(norm)] = shape_id
+            shapes_by_key.setdefault(canonical_key(norm, mirror), []).append({
+                "id": shape_id, "cells": norm, "rotation_states": max(1, rotation_states),
+            })
             id_to_cells[shape_id] = norm
 
-    return cells_to_id, id_to_cells
+    return shapes_by_key, id_to_cells
 
 
 # ─── item .tres parsing ──────────────────────────────────────────────────────
 
+def atlas_sources(manifest_path: Path = ATLAS_MANIFEST) -> dict:
+    """{AtlasTexture res:// path: source sprite res:// path} from the atlas manifest."""
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            regions = json.load(f).get("regions", {})
+    except (OSError, ValueError):
+        return {}
+    return {entry["atlas_texture"]: res for res, entry in regions.items()}
+
+
 def scan_item_tres_files(data_dir: str) -> list[dict]:
-    """Walk data/items/ and extract item_id, sprite path, and current shape path from each .tres."""
+    """Walk data/items/ and extract item_id, sprite path, and current shape path from each .tres.
+
+    Icons linked to a packed AtlasTexture (pack_item_atlas.py --link-items)
+    resolve to their source sprite, so the source PNG stays what gets
+    analysed and packed; icon_res_path is what the .tres references.
+    """
     items = []
     items_dir = os.path.join(data_dir, "items")
+    sources = atlas_sources()
 
     for root, _dirs, files in os.walk(items_dir):
         for fname in files:
             if not fname.endswith(".tres"):
                 continue
             filepath = os.path.join(root, fname)
-            item_id = None
-            shape_ext_id = None
-            sprite_path = None
-            ext_resources = {}  # ext_id -> res:// path
-
-            with open(filepath, "r", encoding="utf-8") as f:
-                for line in f:
-                    # Parse ext_resource lines to map IDs to paths
-                    ext_match = re.match(
-                        r'\[ext_resource .* path="(res://[^"]+)" id="([^"]+)"\]', line
-                    )
-                    if ext_match:
-                        ext_resources[ext_match.group(2)] = ext_match.group(1)
-                        continue
-
-                    if line.startswith("id = "):
-                        item_id = line.split('"')[1]
-                    elif line.startswith("shape = "):
-                        m = re.search(r'ExtResource\("([^"]+)"\)', line)
-                        if m:
-                            shape_ext_id = m.group(1)
-                    elif line.startswith("icon = "):
-                        m = re.search(r'ExtResource\("([^"]+)"\)', line)
-                        if m:
-                            sprite_path = ext_resources.get(m.group(1))
-
+            doc = tres_document.load(filepath)
+            item_id = doc.resource.get("id")
             if not item_id:
                 continue
 
-            # Resolve shape path from ext_resource
-            current_shape_path = ext_resources.get(shape_ext_id, "") if shape_ext_id else ""
-            # Extract shape ID from path like "res://data/shapes/shape_1x1.tres"
-            current_shape_id = ""
-            if current_shape_path:
-                current_shape_id = Path(current_shape_path).stem
+            # Shape ID from the shape's path, e.g. "res://data/shapes/shape_1x1.tres"
+            current_shape_path = doc.ext_path(doc.resource.get("shape")) or ""
+            current_shape_id = Path(current_shape_path).stem if current_shape_path else ""
+            icon_path = doc.ext_path(doc.resource.get("icon")) or ""
 
             items.append({
                 "item_id": item_id,
                 "tres_path": filepath,
-                "sprite_res_path": sprite_path or "",
+                "icon_res_path": icon_path,
+                "sprite_res_path": sources.get(icon_path, icon_path),
                 "current_shape_id": current_shape_id,
             })
 
@@ -176,11 +260,12 @@ def main():
     report_path = project_root / "tools" / "shape_report.json"
 
     dry_run = "--dry-run" in sys.argv
+    mirror = "--mirror" in sys.argv
     filter_ids = [a for a in sys.argv[1:] if not a.startswith("--")]
 
     # Load existing shapes
-    cells_to_shape_id, shape_id_to_cells = load_existing_shapes(str(shapes_dir))
-    print(f"Loaded {len(cells_to_shape_id)} existing shape definitions")
+    shapes_by_key, shape_id_to_cells = load_existing_shapes(str(shapes_dir), mirror)
+    print(f"Loaded {len(shape_id_to_cells)} existing shape definitions")
 
     # Scan all item .tres files
     all_items = scan_item_tres_files(str(data_dir))
@@ -189,10 +274,29 @@ def main():
     print(f"Scanning {len(all_items)} item(s)...\n")
 
     mismatches = []
+    rotated_matches = []
     no_sprite = []
     matches = 0
     errors = []
 
+    # Resolve sprites, then analyse every distinct one (cached / in parallel).
+    # Keyed by .tres path: two files may share an id but not an icon.
+    sprite_files = {}
+    for item in all_items:
+        rel_path = item["sprite_res_path"].replace("res://", "")
+        abs_path = project_root / rel_path
+        if rel_path and abs_path.exists():
+            sprite_files[item["tres_path"]] = str(abs_path)
+
+    cache = FileCache("sprite_shapes", version=f"{CELL_SIZE}:{ALPHA_THRESHOLD}",
+                      enabled="--no-cache" not in sys.argv)
+    analysed = analyse_sprites(list(sprite_files.values()), cache)
+    if not filter_ids:
+        cache.prune(sprite_files.values())
+    cache.save()
+    if cache.enabled:
+        print(f"Sprite cache: {cache.hits} hit(s), {cache.misses} analysed\n")
+
     for item in all_items:
         sprite_res = item["sprite_res_path"]
         if not sprite_res:
@@ -202,24 +306,31 @@ def main():
         # Convert res:// path to filesystem path
         rel_path = sprite_res.replace("res://", "")
         abs_path = project_root / rel_path
-        if not abs_path.exists():
+        if item["tres_path"] not in sprite_files:
             errors.append({"item_id": item["item_id"], "error": f"Sprite not found: {abs_path}"})
             continue
 
-        try:
-            cells = get_filled_cells(str(abs_path))
-        except Exception as e:
-            errors.append({"item_id": item["item_id"], "error": str(e)})
+        cells, error = analysed[sprite_files[item["tres_path"]]]
+        if error is not None:
+            errors.append({"item_id": item["item_id"], "error": error})
             continue
 
         norm = normalize_cells(cells)
-        detected_shape_id = cells_to_shape_id.get(frozenset(norm))
-
         current = item["current_shape_id"]
         current_cells = shape_id_to_cells.get(current, [])
 
+        matched = match_shape(norm, shapes_by_key, current, mirror)
+        detected_shape_id, turns, mirrored = matched if matched else (None, 0, False)
+
         if detected_shape_id and detected_shape_id == current:
             matches += 1
+            if turns or mirrored:
+                rotated_matches.append({
+                    "item_id": item["item_id"],
+                    "shape": current,
+                    "rotation": turns * 90,
+                    "mirrored": mirrored,
+                })
             continue
 
         # Mismatch or new shape
@@ -236,6 +347,8 @@ def main():
 
         if detected_shape_id:
             entry["suggested_shape"] = detected_shape_id
+            entry["matched_rotation"] = turns * 90
+            entry["matched_mirrored"] = mirrored
             entry["action"] = "change_shape"
         else:
             entry["suggested_shape"] = None
@@ -249,17 +362,19 @@ def main():
         "summary": {
             "total_items_scanned": len(all_items),
             "matching": matches,
+            "matching_rotated": len(rotated_matches),
             "mismatches": len(mismatches),
             "no_sprite": len(no_sprite),
             "errors": len(errors),
         },
         "mismatches": mismatches,
+        "rotated_matches": rotated_matches,
         "errors": errors,
     }
 
     # Print summary
     print(f"Results:")
-    print(f"  Matching shape:   {matches}")
+    print(f"  Matching shape:   {matches} ({len(rotated_matches)} rotated)")
     print(f"  Mismatches:       {len(mismatches)}")
     print(f"  No sprite:        {len(no_sprite)}")
     print(f"  Errors:           {len(errors)}")
@@ -270,7 +385,12 @@ def main():
             action = m["action"]
             current = m["current_shape"]
             suggested = m.get("suggested_shape", "NEW")
-            print(f"  {m['item_id']}: {current} -> {suggested or 'NEW'} ({action})")
+            orientation = ""
+            if m.get("matched_rotation") or m.get("matched_mirrored"):
+                orientation = f" rotated {m['matched_rotation']}°"
+                if m["matched_mirrored"]:
+                    orientation += ", mirrored"
+            print(f"  {m['item_id']}: {current} -> {suggested or 'NEW'}{orientation} ({action})")
             print(f"    {m['detected_ascii'].replace(chr(10), '  |  ')}")
 
     if errors:
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Find duplicate and near-duplicate images under assets/sprites and assets/ui.
+
+Every image gets a 64-bit perceptual hash (DCT of a 32x32 greyscale
+thumbnail, alpha composited over mid-grey, low 8x8 frequencies against
+their median) plus a hash of its decoded pixels. Hashes go into a BK-tree
+so each image only visits the few tree nodes within --threshold bits of it
+instead of every other image. Candidate pairs are then confirmed by average
+colour and aspect ratio, since flat tiles of different colours all share
+the same greyscale hash. Confirmed pairs are merged into clusters.
+
+For each cluster the report lists its members (largest first) and the
+texture memory that would be saved by keeping only the first one: RGBA8
+width * height * 4, +1/3 when the .import enables mipmaps. Note that code
+pointing several things at the same file (e.g. ICONS in
+generate_legendary_items.py) is already shared and does not show up here;
+this finds separate files with the same or nearly the same picture.
+
+Hashing runs in a process pool and is cached by content hash in
+tools/.cache, so only new or changed images are decoded. Writes a JSON
+report to tools/.cache/duplicate_image_report.json.
+
+Usage:
+    python tools/find_duplicate_images.py                  # scan, write report
+    python tools/find_duplicate_images.py --threshold=0    # exact perceptual matches only
+    python tools/find_duplicate_images.py --threshold=8    # looser near-duplicates
+    python tools/find_duplicate_images.py assets/ui        # other folders
+    python tools/find_duplicate_images.py --dry-run        # print only, don't write report
+    python tools/find_duplicate_images.py --no-cache       # re-hash everything
+"""
+
+import hashlib
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from sprite_image import load_rgba
+from tool_cache import CACHE_DIR, FileCache, arg_value, cache_key
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DIRS = [PROJECT_ROOT / "assets" / "sprites", PROJECT_ROOT / "assets" / "ui"]
+# Generated from the sources by other tools — duplicates there are expected
+SKIP_DIRS = {"processed", "atlas"}
+REPORT_PATH = CACHE_DIR / "duplicate_image_report.json"
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp"}
+
+# Bump when the hash computation changes
+HASH_VERSION = "1"
+DCT_SIZE = 32
+HASH_SIZE = 8
+
+DEFAULT_THRESHOLD = 4     # max differing hash bits for a near-duplicate
+COLOR_TOLERANCE = 12.0    # max per-channel difference of the average RGBA
+ASPECT_TOLERANCE = 0.05   # max relative difference of width / height
+
+TEXEL_BYTES = 4
+MIP_CHAIN_FACTOR = 4 / 3
+
+
+# ─── hashing ─────────────────────────────────────────────────────────────────
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so that dct(x) = M @ x."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    m[0] /= np.sqrt(2)
+    return m
+
+
+_DCT = _dct_matrix(DCT_SIZE)
+
+
+def perceptual_hash(rgba: np.ndarray) -> int:
+    """64-bit pHash of an RGBA array (transparent texels read as mid-grey)."""
+    rgb = rgba[..., :3].astype(np.float32)
+    alpha = rgba[..., 3:4].astype(np.float32) / 255
+    grey = (rgb * alpha + 128 * (1 - alpha)) @ np.array([0.299, 0.587, 0.114], np.float32)
+    thumb = np.asarray(Image.fromarray(grey, "F").resize((DCT_SIZE, DCT_SIZE), Image.BOX))
+    low = (_DCT @ thumb @ _DCT.T)[:HASH_SIZE, :HASH_SIZE].ravel()
+    # The DC term only carries overall brightness; leave it out of the median
+    bits = low > np.median(low[1:])
+    return int("".join("1" if b else "0" for b in bits), 2)
+
+
+def hash_image(path_str: str) -> dict:
+    """Process-pool entry point: hashes and size of one image."""
+    try:
+        rgba = load_rgba(path_str)
+    except Exception as e:
+        return {"error": str(e)}
+    height, width = rgba.shape[:2]
+    pixels = hashlib.sha1(f"{width}x{height}".encode())
+    pixels.update(rgba.tobytes())
+    return {
+        "width": width,
+        "height": height,
+        "phash": f"{perceptual_hash(rgba):016x}",
+        "pixels": pixels.hexdigest(),
+        "mean": [round(float(c), 1) for c in rgba.reshape(-1, 4).mean(axis=0)],
+    }
+
+
+# ─── BK-tree ─────────────────────────────────────────────────────────────────
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class BKTree:
+    """Metric tree over Hamming distance; query visits only nodes that can match."""
+
+    def __init__(self):
+        self._root = None  # [hash, [item, ...], {distance: child}]
+        self.visited = 0
+
+    def add(self, value: int, item):
+        if self._root is None:
+            self._root = [value, [item], {}]
+            return
+        node = self._root
+        while True:
+            d = hamming(value, node[0])
+            if d == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [value, [item], {}]
+                return
+            node = child
+
+    def query(self, value: int, radius: int) -> list:
+        """Return (distance, item) for every item within `radius` of `value`."""
+        found = []
+        stack = [self._root] if self._root else []
+        while stack:
+            node = stack.pop()
+            self.visited += 1
+            d = hamming(value, node[0])
+            if d <= radius:
+                found.extend((d, item) for item in node[1])
+            # Triangle inequality: only children at distance d±radius can hold matches
+            for cd, child in node[2].items():
+                if d - radius <= cd <= d + radius:
+                    stack.append(child)
+        return found
+
+
+# ─── clustering ──────────────────────────────────────────────────────────────
+
+def _similar_look(a: dict, b: dict) -> bool:
+    if max(abs(x - y) for x, y in zip(a["mean"], b["mean"])) > COLOR_TOLERANCE:
+        return False
+    ra = a["width"] / a["height"]
+    rb = b["width"] / b["height"]
+    return abs(ra - rb) <= ASPECT_TOLERANCE * max(ra, rb)
+
+
+def find_clusters(entries: dict, threshold: int) -> tuple[list[list], int]:
+    """Group paths whose images match; returns (clusters, BK-tree nodes visited)."""
+    tree = BKTree()
+    for path, e in entries.items():
+        tree.add(int(e["phash"], 16), path)
+
+    parent = {p: p for p in entries}
+
+    def find(p):
+        while parent[p] != p:
+            parent[p] = parent[parent[p]]
+            p = parent[p]
+        return p
+
+    for path, e in entries.items():
+        for _d, other in tree.query(int(e["phash"], 16), threshold):
+            if other == path or find(other) == find(path):
+                continue
+            if e["pixels"] == entries[other]["pixels"] or _similar_look(e, entries[other]):
+                parent[find(other)] = find(path)
+
+    groups = {}
+    for path in entries:
+        groups.setdefault(find(path), []).append(path)
+    return [g for g in groups.values() if len(g) > 1], tree.visited
+
+
+def texture_bytes(path: Path, entry: dict) -> int:
+    size = entry["width"] * entry["height"] * TEXEL_BYTES
+    import_file = path.with_name(path.name + ".import")
+    if import_file.exists() and "mipmaps/generate=true" in import_file.read_text(encoding="utf-8"):
+        size = int(size * MIP_CHAIN_FACTOR)
+    return size
+
+
+def describe_cluster(paths: list, entries: dict) -> dict:
+    members = sorted(paths, key=lambda p: (-texture_bytes(p, entries[p]), cache_key(p)))
+    sizes = [texture_bytes(p, entries[p]) for p in members]
+    keep = entries[members[0]]
+    return {
+        "exact": len({entries[p]["pixels"] for p in members}) == 1,
+        "max_distance": max(hamming(int(keep["phash"], 16), int(entries[p]["phash"], 16))
+                            for p in members),
+        "saved_bytes": sum(sizes[1:]),
+        "members": [
+            {"path": f"res://{cache_key(p)}", "size": [entries[p]["width"], entries[p]["height"]],
+             "bytes": b}
+            for p, b in zip(members, sizes)
+        ],
+    }
+
+
+# ─── main ────────────────────────────────────────────────────────────────────
+
+def collect_images(roots: list[Path]) -> list[Path]:
+    paths = []
+    for root in roots:
+        if root.is_file():
+            paths.append(root)
+            continue
+        for p in sorted(root.rglob("*")):
+            if (p.suffix.lower() in IMAGE_EXTENSIONS
+                    and not SKIP_DIRS.intersection(p.relative_to(root).parts[:-1])):
+                paths.append(p)
+    return paths
+
+
+def hash_images(paths: list[Path], use_cache: bool = True, jobs: int = None,
+                prune: bool = True) -> tuple[dict, list]:
+    """Return ({path: hash entry}, [(path, error)]), hashing only changed files."""
+    cache = FileCache("image_phash", HASH_VERSION, enabled=use_cache)
+    entries = {}
+    pending = []
+    for path in paths:
+        cached = cache.lookup(path)
+        if cached is None:
+            pending.append(path)
+        else:
+            entries[path] = cached
+
+    errors = []
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for path, result in zip(pending, pool.map(hash_image, map(str, pending), chunksize=8)):
+                if "error" in result:
+                    errors.append((path, result["error"]))
+                    continue
+                entries[path] = result
+                cache.store(path, result)
+
+    if prune:
+        cache.prune(paths)
+    cache.save()
+    print(f"Hashed {len(pending)} image(s), {len(paths) - len(pending)} from cache")
+    return entries, errors
+
+
+def main():
+    dry_run = "--dry-run" in sys.argv
+    use_cache = "--no-cache" not in sys.argv
+    threshold = int(arg_value("threshold", str(DEFAULT_THRESHOLD)))
+    jobs = int(arg_value("jobs", "0")) or None
+    targets = [Path(a).resolve() for a in sys.argv[1:] if not a.startswith("--")]
+
+    paths = collect_images(targets or DEFAULT_DIRS)
+    print(f"Scanning {len(paths)} image(s)...")
+    entries, errors = hash_images(paths, use_cache, jobs, prune=not targets)
+
+    clusters, visited = find_clusters(entries, threshold)
+    report = [describe_cluster(c, entries) for c in clusters]
+    report.sort(key=lambda c: (-c["saved_bytes"], c["members"][0]["path"]))
+
+    for c in report:
+        kind = "exact" if c["exact"] else f"near (<= {c['max_distance']} bits)"
+        print(f"\n{len(c['members'])} images, {kind}, saves {c['saved_bytes'] / 1024:.1f} KB")
+        for i, m in enumerate(c["members"]):
+            marker = "keep" if i == 0 else "    "
+            print(f"  {marker} {m['size'][0]:>4}x{m['size'][1]:<4} {m['path']}")
+
+    total = sum(texture_bytes(p, e) for p, e in entries.items())
+    saved = sum(c["saved_bytes"] for c in report)
+    duplicates = sum(len(c["members"]) - 1 for c in report)
+    pairs = len(entries) * (len(entries) - 1) // 2
+    print(f"\nResults:")
+    print(f"  Images scanned:   {len(entries)}")
+    print(f"  Clusters:         {len(report)} ({sum(c['exact'] for c in report)} exact)")
+    print(f"  Redundant images: {duplicates}")
+    print(f"  Texture memory:   {total / 1024:.1f} KB, {saved / 1024:.1f} KB "
+          f"({saved / total * 100 if total else 0:.1f}%) saved by deduplication")
+    print(f"  BK-tree visits:   {visited} (vs {pairs} pairwise comparisons)")
+    print(f"  Errors:           {len(errors)}")
+    for path, error in errors:
+        print(f"    {cache_key(path)}: {error}")
+
+    if not dry_run:
+        REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(REPORT_PATH, "w", encoding="utf-8", newline="\n") as f:
+            json.dump({
+                "threshold": threshold,
+                "images": len(entries),
+                "texture_bytes": total,
+                "saved_bytes": saved,
+                "clusters": report,
+            }, f, indent=2)
+            f.write("\n")
+        print(f"\nReport written to: {REPORT_PATH}")
+    else:
+        print("\n(dry run — no file written)")
+
+
+if __name__ == "__main__":
+    main()
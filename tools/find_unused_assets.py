@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""Report unreachable and byte-identical duplicate files in the Godot project.
+
+Builds a reference graph over every project file and walks it from the
+roots (project.godot and export_presets.cfg: main scene, autoloads, icon,
+bus layout...). Edges come from:
+  - every res:// path in .tscn / .tres / .gd / .gdshader / .import / .cfg /
+    .json text (a path to a folder, as used with DirAccess or path
+    constants like AssetPaths.TERRAIN_TEXTURES, reaches every loadable
+    file below it)
+  - uid:// references, resolved through .uid files, .import sidecars and
+    resource headers
+  - class_name identifiers used by reachable scripts and scenes
+  - mtllib / map_* lines in .obj and .mtl files
+  - sidecars: a reachable file keeps its .import and .uid
+
+Every file is also content-hashed, so byte-identical copies are grouped
+regardless of reachability.
+
+The report lists unreachable loadable files (what an "all_resources"
+export ships without ever loading), source-only files that Godot never
+imports (.zip, .blend, .usdc, .vox, ...), and duplicate groups, all with
+their sizes. Scanning and hashing run in a process pool and are cached by
+content in tools/.cache, so reruns only read changed files.
+
+Writes a JSON report to tools/.cache/unused_asset_report.json (untracked).
+
+Usage:
+    python tools/find_unused_assets.py               # scan, print summary, write report
+    python tools/find_unused_assets.py --list        # also list every unreachable file
+    python tools/find_unused_assets.py --min-kb=100  # only list files >= 100 KB
+    python tools/find_unused_assets.py --dry-run     # print only, don't write report
+    python tools/find_unused_assets.py --no-cache    # rescan everything
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from tool_cache import CACHE_DIR, FileCache, arg_value, cache_key
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+REPORT_PATH = CACHE_DIR / "unused_asset_report.json"
+
+# Bump when the extracted references change
+SCAN_VERSION = "1"
+
+ROOT_FILES = ["project.godot", "export_presets.cfg"]
+# Development-only folders: neither scanned for references nor reported
+SKIP_DIRS = {".git", ".godot", "addons", "tests", "tools", "docs", "builds"}
+# Not part of the game at all (docs, editor helpers, VCS files)
+IGNORED_EXTENSIONS = {".md", ".txt", ".py", ".ps1", ".pdf", ".jsonl", ".tmp", ".html", ".js", ".css"}
+SIDECAR_EXTENSIONS = {".import", ".uid"}
+
+TEXT_EXTENSIONS = {".tscn", ".tres", ".gd", ".gdshader", ".gdshaderinc", ".import",
+                   ".cfg", ".godot", ".json", ".uid", ".obj", ".mtl"}
+# Files Godot can load or import; anything else is source-only material
+LOADABLE_EXTENSIONS = {
+    ".tres", ".tscn", ".res", ".scn", ".gd", ".gdshader", ".gdshaderinc",
+    ".png", ".jpg", ".jpeg", ".webp", ".svg", ".bmp", ".tga", ".exr", ".hdr",
+    ".glb", ".gltf", ".obj", ".dae", ".fbx", ".wav", ".ogg", ".mp3",
+    ".ttf", ".otf", ".woff", ".woff2", ".fnt", ".json", ".csv", ".translation", ".cfg",
+}
+
+_QUOTED_RES_PATH = re.compile(r'"(res://[^"\n]*)"')  # may contain spaces
+_RES_PATH = re.compile(r'res://[^"\'\s)\]},;]*')
+_UID_REF = re.compile(r'uid://[a-z0-9]+')
+_OWN_UID = re.compile(r'^(?:\[gd_(?:scene|resource)[^\]]*\buid|uid)="(uid://[a-z0-9]+)"', re.MULTILINE)
+_CLASS_NAME = re.compile(r'^class_name\s+(\w+)', re.MULTILINE)
+_IDENT = re.compile(r'\b[A-Z][A-Za-z0-9_]+\b')
+_OBJ_REF = re.compile(r'^\s*(?:mtllib|map_\w+)\s+(.+?)\s*$', re.MULTILINE)
+
+
+# ─── scanning ────────────────────────────────────────────────────────────────
+
+def scan_file(path_str: str) -> dict:
+    """Process-pool entry point: content hash plus the references a file makes."""
+    path = Path(path_str)
+    try:
+        data = path.read_bytes()
+    except OSError as e:
+        return {"error": str(e)}
+    result = {"hash": hashlib.sha1(data).hexdigest()}
+    ext = path.suffix.lower()
+    if ext not in TEXT_EXTENSIONS:
+        return result
+
+    text = data.decode("utf-8", errors="replace")
+    refs = set(_QUOTED_RES_PATH.findall(text))
+    refs.update(r.rstrip(".:") for r in _RES_PATH.findall(text))
+    result["refs"] = sorted(refs)
+    result["uid_refs"] = sorted(set(_UID_REF.findall(text)))
+    if ext == ".uid":
+        result["uid"] = text.strip()
+    else:
+        own = _OWN_UID.search(text)
+        if own:
+            result["uid"] = own.group(1)
+    if ext == ".gd":
+        m = _CLASS_NAME.search(text)
+        if m:
+            result["class_name"] = m.group(1)
+    if ext in (".gd", ".tscn", ".tres", ".gdshader"):
+        result["idents"] = sorted(set(_IDENT.findall(text)))
+    if ext in (".obj", ".mtl"):
+        result["local_refs"] = sorted(set(_OBJ_REF.findall(text)))
+    return result
+
+
+def collect_files() -> list[Path]:
+    files = []
+    for root, dirs, names in os.walk(PROJECT_ROOT):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for name in sorted(names):
+            p = Path(root) / name
+            if not name.startswith(".") and p.suffix.lower() not in IGNORED_EXTENSIONS:
+                files.append(p)
+    return files
+
+
+def scan_files(files: list[Path], use_cache: bool = True, jobs: int = None) -> dict:
+    """Return {res path: scan result}, scanning only files whose content changed."""
+    cache = FileCache("asset_refs", SCAN_VERSION, enabled=use_cache)
+    results = {}
+    pending = []
+    for path in files:
+        cached = cache.lookup(path)
+        if cached is None:
+            pending.append(path)
+        else:
+            results[path] = cached
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for path, result in zip(pending, pool.map(scan_file, map(str, pending), chunksize=16)):
+                results[path] = result
+                if "error" not in result:
+                    cache.store(path, result, result["hash"])
+
+    cache.prune(files)
+    cache.save()
+    print(f"Scanned {len(pending)} file(s), {len(files) - len(pending)} from cache")
+    return {f"res://{cache_key(p)}": results[p] for p in files}
+
+
+# ─── graph ───────────────────────────────────────────────────────────────────
+
+def _is_loadable(res: str) -> bool:
+    return Path(res).suffix.lower() in LOADABLE_EXTENSIONS
+
+
+class ReferenceGraph:
+    def __init__(self, scans: dict):
+        self.scans = scans
+        self.by_uid = {}
+        self.by_class = {}
+        self.generated = {}  # imported output kept in the project (e.g. .translation) -> source
+        self.dir_children = defaultdict(list)
+        for res, scan in scans.items():
+            if res.endswith(".import") and res[:-len(".import")] in scans:
+                for ref in scan.get("refs", []):
+                    if not ref.startswith("res://.godot/"):
+                        self.generated.setdefault(ref, res[:-len(".import")])
+            uid = scan.get("uid")
+            if uid:
+                # foo.gd.uid / foo.png.import describe foo.gd / foo.png
+                target = res
+                for ext in SIDECAR_EXTENSIONS:
+                    if res.endswith(ext):
+                        target = res[:-len(ext)]
+                if target in scans:
+                    self.by_uid[uid] = target
+            if "class_name" in scan:
+                self.by_class[scan["class_name"]] = res
+            parent = res.rsplit("/", 1)[0]
+            while parent != "res:/":
+                self.dir_children[parent].append(res)
+                parent = parent.rsplit("/", 1)[0]
+
+    def edges(self, res: str):
+        scan = self.scans[res]
+        for ref in scan.get("refs", []):
+            ref = ref.split("::")[0]
+            if ref in self.scans:
+                yield ref
+            elif ref in self.generated:
+                yield self.generated[ref]
+            else:
+                for child in self.dir_children.get(ref.rstrip("/"), []):
+                    if _is_loadable(child):
+                        yield child
+        for uid in scan.get("uid_refs", []):
+            if uid in self.by_uid:
+                yield self.by_uid[uid]
+        for ident in scan.get("idents", []):
+            if ident in self.by_class:
+                yield self.by_class[ident]
+        base = res.rsplit("/", 1)[0]
+        for local in scan.get("local_refs", []):
+            target = f"{base}/{local.replace(chr(92), '/')}"
+            if target in self.scans:
+                yield target
+        for ext in SIDECAR_EXTENSIONS:
+            if res + ext in self.scans:
+                yield res + ext
+
+    def reachable(self, roots: list[str]) -> set:
+        seen = set()
+        stack = [r for r in roots if r in self.scans]
+        while stack:
+            res = stack.pop()
+            if res in seen:
+                continue
+            seen.add(res)
+            stack.extend(e for e in self.edges(res) if e not in seen)
+        return seen
+
+
+# ─── main ────────────────────────────────────────────────────────────────────
+
+def _size(res: str) -> int:
+    return (PROJECT_ROOT / res[len("res://"):]).stat().st_size
+
+
+def _with_sidecars(res: str, scans: dict) -> int:
+    return _size(res) + sum(_size(res + ext) for ext in SIDECAR_EXTENSIONS if res + ext in scans)
+
+
+def _mb(n: int) -> str:
+    return f"{n / 2**20:.1f} MB"
+
+
+def main():
+    dry_run = "--dry-run" in sys.argv
+    list_all = "--list" in sys.argv
+    use_cache = "--no-cache" not in sys.argv
+    min_bytes = int(float(arg_value("min-kb", "0")) * 1024)
+    jobs = int(arg_value("jobs", "0")) or None
+
+    files = collect_files()
+    print(f"Scanning {len(files)} file(s)...")
+    scans = scan_files(files, use_cache, jobs)
+    errors = {res: s["error"] for res, s in scans.items() if "error" in s}
+    scans = {res: s for res, s in scans.items() if "error" not in s}
+
+    graph = ReferenceGraph(scans)
+    reachable = graph.reachable([f"res://{r}" for r in ROOT_FILES])
+
+    unreachable = []
+    source_only = []
+    for res in scans:
+        ext = Path(res).suffix.lower()
+        if res in reachable or ext in SIDECAR_EXTENSIONS:
+            continue
+        if ext in LOADABLE_EXTENSIONS:
+            unreachable.append(res)
+        else:
+            source_only.append(res)
+
+    by_hash = defaultdict(list)
+    for res, scan in scans.items():
+        if Path(res).suffix.lower() not in SIDECAR_EXTENSIONS:
+            by_hash[scan["hash"]].append(res)
+    duplicates = []
+    for members in by_hash.values():
+        size = _size(members[0])
+        if len(members) > 1 and size > 0:
+            duplicates.append({"bytes": size, "wasted_bytes": size * (len(members) - 1),
+                               "files": sorted(members)})
+    duplicates.sort(key=lambda d: -d["wasted_bytes"])
+
+    unreachable_sizes = {res: _with_sidecars(res, scans) for res in unreachable}
+    source_sizes = {res: _size(res) for res in source_only}
+
+    per_dir = defaultdict(lambda: [0, 0])
+    for res, size in unreachable_sizes.items():
+        top = "/".join(res[len("res://"):].split("/")[:-1][:2]) or "(project root)"
+        per_dir[top][0] += 1
+        per_dir[top][1] += size
+
+    print(f"\nUnreachable loadable files by folder:")
+    for top, (count, size) in sorted(per_dir.items(), key=lambda kv: -kv[1][1]):
+        print(f"  {_mb(size):>10}  {count:>5}  {top}")
+
+    if list_all:
+        print(f"\nUnreachable files:")
+        for res, size in sorted(unreachable_sizes.items(), key=lambda kv: -kv[1]):
+            if size >= min_bytes:
+                print(f"  {size / 1024:>9.1f} KB  {res}")
+
+    source_by_ext = defaultdict(lambda: [0, 0])
+    for res, size in source_sizes.items():
+        source_by_ext[Path(res).suffix.lower() or res.rsplit("/", 1)[-1]][0] += 1
+        source_by_ext[Path(res).suffix.lower() or res.rsplit("/", 1)[-1]][1] += size
+    print(f"\nSource-only files (never imported by Godot):")
+    for ext, (count, size) in sorted(source_by_ext.items(), key=lambda kv: -kv[1][1]):
+        print(f"  {_mb(size):>10}  {count:>5}  {ext}")
+
+    print(f"\nLargest duplicate groups:")
+    for d in duplicates[:10]:
+        print(f"  {d['wasted_bytes'] / 1024:>9.1f} KB wasted, {len(d['files'])} copies of {d['files'][0]}")
+
+    wasted = sum(d["wasted_bytes"] for d in duplicates)
+    print(f"\nResults:")
+    print(f"  Files scanned:       {len(scans)} ({len(reachable)} reachable)")
+    print(f"  Unreachable:         {len(unreachable)} ({_mb(sum(unreachable_sizes.values()))} incl. sidecars)")
+    print(f"  Source-only:         {len(source_only)} ({_mb(sum(source_sizes.values()))})")
+    print(f"  Duplicate groups:    {len(duplicates)} ({_mb(wasted)} in extra copies)")
+    print(f"  Errors:              {len(errors)}")
+    for res, error in errors.items():
+        print(f"    {res}: {error}")
+
+    if not dry_run:
+        report = {
+            "reachable": len(reachable),
+            "unreachable": [{"path": r, "bytes": s} for r, s in
+                            sorted(unreachable_sizes.items(), key=lambda kv: -kv[1])],
+            "source_only": [{"path": r, "bytes": s} for r, s in
+                            sorted(source_sizes.items(), key=lambda kv: -kv[1])],
+            "duplicates": duplicates,
+        }
+        REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(REPORT_PATH, "w", encoding="utf-8", newline="\n") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nReport written to: {REPORT_PATH}")
+    else:
+        print("\n(dry run — no file written)")
+
+
+if __name__ == "__main__":
+    main()
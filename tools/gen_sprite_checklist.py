@@ -1,23 +1,121 @@
-import os, re
+#!/usr/bin/env python3
+"""Generate data/SPRITE_GENERATION_CHECKLIST.md from the item and shape resources.
+
+One checklist entry per base item (rarity suffix stripped; the first tier
+file found wins), grouped by item type and category, with the pixel size
+and a cell diagram of its inventory shape plus a ready-made image prompt.
+
+Regeneration is incremental: the fields read from every shape and item
+.tres are cached in tools/.cache (reused while the file's size/mtime or
+content hash is unchanged), and each rendered entry is cached alongside the
+inputs it was rendered from, so only changed items are re-parsed and
+re-rendered. The checklist is only rewritten when its content changes.
+
+Usage:
+    python tools/gen_sprite_checklist.py             # regenerate the checklist
+    python tools/gen_sprite_checklist.py --check     # exit 1 if it is stale, write nothing
+    python tools/gen_sprite_checklist.py --no-cache  # re-parse every file
+"""
+
+import json
+import os
+import re
+import sys
 from collections import defaultdict
+from pathlib import Path
+
+import tres_document
+from tool_cache import CACHE_DIR, FileCache, cache_key
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ITEMS_DIR = PROJECT_ROOT / "data" / "items"
+SHAPES_DIR = PROJECT_ROOT / "data" / "shapes"
+CHECKLIST_PATH = PROJECT_ROOT / "data" / "SPRITE_GENERATION_CHECKLIST.md"
+BLOCK_CACHE_PATH = CACHE_DIR / "sprite_checklist_blocks.json"
+
+# Bump when the parsed fields or the rendered entry format change
+CACHE_VERSION = "2"
+
+RARITY_SUFFIX = re.compile(r"_(common|uncommon|rare|elite|legendary|unique)$")
+
+type_names = {0: 'Active Tool (Weapon)', 1: 'Passive Gear (Armor/Jewelry)', 2: 'Modifier (Gem)', 3: 'Consumable', 4: 'Material', 5: 'Blueprint'}
+cat_names = {0: 'Sword', 1: 'Mace', 2: 'Bow', 3: 'Staff', 4: 'Dagger', 5: 'Shield', 6: 'Axe',
+             7: 'Helmet', 8: 'Chestplate', 9: 'Gloves', 10: 'Legs', 11: 'Boots', 12: 'Necklace', 13: 'Ring'}
+
+
+# ─── parsing ─────────────────────────────────────────────────────────────────
+
+# Item fields: checklist key -> [resource] property
+_ITEM_FIELDS = {
+    "id": "id",
+    "name": "display_name",
+    "desc": "description",
+    "item_type": "item_type",
+    "category": "category",
+}
+
+
+def parse_shape(path: Path):
+    """Cells of a shape resource as [[x, y], ...], or None if it has none."""
+    cells = tres_document.load(path).resource.get("cells")
+    return [list(c) for c in cells] if cells else None
+
+
+def parse_item(path: Path) -> dict:
+    """Checklist fields of an item resource."""
+    doc = tres_document.load(path)
+    resource = doc.resource
+    fields = {key: resource.get(prop) for key, prop in _ITEM_FIELDS.items() if prop in resource}
+    shape_path = doc.ext_path(resource.get("shape"))
+    fields["shape_id"] = Path(shape_path).stem if shape_path else "shape_1x1"
+    return fields
+
+
+def load_shapes(cache: FileCache) -> tuple[dict, list]:
+    shapes = {}
+    paths = sorted(p for p in SHAPES_DIR.iterdir() if p.suffix == ".tres")
+    for path in paths:
+        result = cache.lookup(path)
+        if result is None:
+            result = {"cells": parse_shape(path)}
+            cache.store(path, result)
+        if result["cells"] is not None:
+            shapes[path.stem] = [tuple(c) for c in result["cells"]]
+    return shapes, paths
+
+
+def load_base_items(cache: FileCache) -> tuple[dict, list]:
+    """Parse every item file and keep the first one seen for each base item."""
+    base_items = {}
+    paths = []
+    for root, dirs, files in os.walk(ITEMS_DIR):
+        dirs.sort()
+        for f in sorted(files):
+            if not f.endswith(".tres"):
+                continue
+            path = Path(root) / f
+            paths.append(path)
+            fields = cache.lookup(path)
+            if fields is None:
+                fields = parse_item(path)
+                cache.store(path, fields)
+            if "id" not in fields:
+                continue
 
-items_dir = 'data/items'
-shapes_dir = 'data/shapes'
-
-# Parse all shapes
-shapes = {}
-for f in os.listdir(shapes_dir):
-    if not f.endswith('.tres'):
-        continue
-    content = open(os.path.join(shapes_dir, f), 'r', encoding='utf-8').read()
-    shape_id = f.replace('.tres', '')
-    m_cells = re.search(r'cells = Array\[Vector2i\]\(\[([^\]]+)\]\)', content)
-    if not m_cells:
-        continue
-    cells = []
-    for m in re.finditer(r'Vector2i\((\d+),\s*(\d+)\)', m_cells.group(1)):
-        cells.append((int(m.group(1)), int(m.group(2))))
-    shapes[shape_id] = cells
+            base = RARITY_SUFFIX.sub("", fields["id"])
+            if base not in base_items:
+                base_items[base] = {
+                    'name': fields.get("name", fields["id"]),
+                    'desc': fields.get("desc", ''),
+                    'shape_id': fields["shape_id"],
+                    'item_type': fields.get("item_type", 0),
+                    'category': fields.get("category", -1),
+                    'base': base,
+                }
+    return base_items, paths
+
+
+# ─── rendering ───────────────────────────────────────────────────────────────
 
 def render_shape(cells):
     if not cells:
@@ -32,6 +130,7 @@ def render_shape(cells):
         grid.append(' '.join(row))
     return '```\n' + '\n'.join(grid) + '\n```'
 
+
 def pixel_size(cells):
     if not cells:
         return '64x64'
@@ -39,109 +138,144 @@ def pixel_size(cells):
     max_y = max(c[1] for c in cells) + 1
     return f'{max_x * 64}x{max_y * 64}'
 
-# Parse all items, deduplicate by base
-base_items = {}
-for root, dirs, files in os.walk(items_dir):
-    for f in sorted(files):
-        if not f.endswith('.tres'):
-            continue
-        path = os.path.join(root, f)
-        content = open(path, 'r', encoding='utf-8').read()
 
-        m_id = re.search(r'^id = "(.+?)"', content, re.MULTILINE)
-        if not m_id:
-            continue
-        item_id = m_id.group(1)
+def render_entry(info: dict, cells: list) -> list[str]:
+    size = pixel_size(cells)
+    shape_visual = render_shape(cells)
 
-        m_name = re.search(r'^display_name = "(.+?)"', content, re.MULTILINE)
-        name = m_name.group(1) if m_name else item_id
+    name = info['name']
+    desc = info['desc']
+    shape_name = info['shape_id'].replace('shape_', '').replace('_', ' ')
 
-        m_desc = re.search(r'^description = "(.+?)"', content, re.MULTILINE)
-        desc = m_desc.group(1) if m_desc else ''
+    prompt_parts = [
+        f'Pixel art icon of a "{name}"',
+    ]
+    if desc:
+        prompt_parts.append(f'({desc})')
+    prompt_parts.append(f'for a tactical RPG inventory grid.')
+    prompt_parts.append(f'Top-down view, transparent background, fantasy style.')
+    prompt_parts.append(f'Image size: {size} pixels.')
+    prompt_parts.append(f'The sprite must fill a {shape_name} grid pattern where each cell is 64x64px.')
+    prompt_parts.append(f'Only draw within the filled cells, leave empty cells transparent.')
+    prompt_parts.append(f'Clean pixel art with visible outlines, warm color palette.')
 
-        m_shape = re.search(r'path="res://data/shapes/([^"]+)\.tres"', content)
-        shape_id = m_shape.group(1) if m_shape else 'shape_1x1'
+    prompt = ' '.join(prompt_parts)
 
-        m_type = re.search(r'^item_type = (\d+)', content, re.MULTILINE)
-        item_type = int(m_type.group(1)) if m_type else 0
+    lines = []
+    lines.append(f'- [ ] **{name}** (`{info["base"]}.png` | {size})')
+    lines.append(f'  - Shape: `{info["shape_id"]}` ({len(cells)} cells)')
+    lines.append(f'  {shape_visual}')
+    if desc:
+        lines.append(f'  - *{desc}*')
+    lines.append(f'  - **Prompt:** {prompt}')
+    lines.append('')
+    return lines
 
-        m_cat = re.search(r'^category = (\d+)', content, re.MULTILINE)
-        cat = int(m_cat.group(1)) if m_cat else -1
 
-        base = re.sub(r'_(common|uncommon|rare|elite|legendary|unique)$', '', item_id)
+class BlockCache:
+    """Rendered entries per base item, reused while their inputs are identical."""
 
-        if base not in base_items:
-            base_items[base] = {
-                'name': name,
-                'desc': desc,
-                'shape_id': shape_id,
-                'item_type': item_type,
-                'category': cat,
-                'base': base,
-            }
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._blocks = {}
+        self._used = {}
+        self.rendered = 0
+        if enabled and BLOCK_CACHE_PATH.exists():
+            try:
+                with open(BLOCK_CACHE_PATH, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if data.get("version") == CACHE_VERSION:
+                self._blocks = data.get("blocks", {})
+
+    def entry(self, info: dict, cells: list) -> list[str]:
+        inputs = json.dumps([info, cells], sort_keys=True)
+        block = self._blocks.get(info["base"])
+        if block is None or block["inputs"] != inputs:
+            block = {"inputs": inputs, "lines": render_entry(info, cells)}
+            self.rendered += 1
+        self._used[info["base"]] = block
+        return block["lines"]
+
+    def save(self):
+        # Only keep entries rendered for the current set of base items
+        if not self.enabled or self._used == self._blocks:
+            return
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = BLOCK_CACHE_PATH.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "blocks": self._used}, f)
+        os.replace(tmp, BLOCK_CACHE_PATH)
 
-type_names = {0: 'Active Tool (Weapon)', 1: 'Passive Gear (Armor/Jewelry)', 2: 'Modifier (Gem)', 3: 'Consumable', 4: 'Material', 5: 'Blueprint'}
-cat_names = {0: 'Sword', 1: 'Mace', 2: 'Bow', 3: 'Staff', 4: 'Dagger', 5: 'Shield', 6: 'Axe',
-             7: 'Helmet', 8: 'Chestplate', 9: 'Gloves', 10: 'Legs', 11: 'Boots', 12: 'Necklace', 13: 'Ring'}
 
-# Group by type then category
-grouped = defaultdict(lambda: defaultdict(list))
-for base, info in sorted(base_items.items(), key=lambda x: x[1]['name']):
-    t = info['item_type']
-    c = info['category']
-    grouped[t][c].append(info)
-
-lines = []
-lines.append('# Item Sprite Generation Checklist')
-lines.append('')
-lines.append('For each item: generate a sprite at the specified pixel size, matching the grid shape.')
-lines.append('Style: **fantasy pixel art, top-down view, transparent background, warm palette, clean edges.**')
-lines.append('')
-lines.append('---')
-lines.append('')
-
-for t in sorted(grouped.keys()):
-    lines.append(f'## {type_names.get(t, f"Type {t}")}')
+def render_checklist(base_items: dict, shapes: dict, blocks: BlockCache) -> str:
+    # Group by type then category
+    grouped = defaultdict(lambda: defaultdict(list))
+    for base, info in sorted(base_items.items(), key=lambda x: x[1]['name']):
+        grouped[info['item_type']][info['category']].append(info)
+
+    lines = []
+    lines.append('# Item Sprite Generation Checklist')
+    lines.append('')
+    lines.append('For each item: generate a sprite at the specified pixel size, matching the grid shape.')
+    lines.append('Style: **fantasy pixel art, top-down view, transparent background, warm palette, clean edges.**')
     lines.append('')
-    for c in sorted(grouped[t].keys()):
-        cat_label = cat_names.get(c, '')
-        if cat_label:
-            lines.append(f'### {cat_label}')
-            lines.append('')
-        for info in grouped[t][c]:
-            cells = shapes.get(info['shape_id'], [(0,0)])
-            size = pixel_size(cells)
-            shape_visual = render_shape(cells)
-
-            name = info['name']
-            desc = info['desc']
-            shape_name = info['shape_id'].replace('shape_', '').replace('_', ' ')
-
-            prompt_parts = [
-                f'Pixel art icon of a "{name}"',
-            ]
-            if desc:
-                prompt_parts.append(f'({desc})')
-            prompt_parts.append(f'for a tactical RPG inventory grid.')
-            prompt_parts.append(f'Top-down view, transparent background, fantasy style.')
-            prompt_parts.append(f'Image size: {size} pixels.')
-            prompt_parts.append(f'The sprite must fill a {shape_name} grid pattern where each cell is 64x64px.')
-            prompt_parts.append(f'Only draw within the filled cells, leave empty cells transparent.')
-            prompt_parts.append(f'Clean pixel art with visible outlines, warm color palette.')
-
-            prompt = ' '.join(prompt_parts)
-
-            lines.append(f'- [ ] **{name}** (`{info["base"]}.png` | {size})')
-            lines.append(f'  - Shape: `{info["shape_id"]}` ({len(cells)} cells)')
-            lines.append(f'  {shape_visual}')
-            if desc:
-                lines.append(f'  - *{desc}*')
-            lines.append(f'  - **Prompt:** {prompt}')
-            lines.append('')
     lines.append('---')
     lines.append('')
 
-with open('data/SPRITE_GENERATION_CHECKLIST.md', 'w', encoding='utf-8') as f:
-    f.write('\n'.join(lines))
+    for t in sorted(grouped.keys()):
+        lines.append(f'## {type_names.get(t, f"Type {t}")}')
+        lines.append('')
+        for c in sorted(grouped[t].keys()):
+            cat_label = cat_names.get(c, '')
+            if cat_label:
+                lines.append(f'### {cat_label}')
+                lines.append('')
+            for info in grouped[t][c]:
+                cells = shapes.get(info['shape_id'], [(0, 0)])
+                lines.extend(blocks.entry(info, cells))
+        lines.append('---')
+        lines.append('')
+
+    return '\n'.join(lines)
+
+
+# ─── main ────────────────────────────────────────────────────────────────────
+
+def main():
+    check = "--check" in sys.argv
+    use_cache = "--no-cache" not in sys.argv
+
+    cache = FileCache("sprite_checklist", CACHE_VERSION, enabled=use_cache)
+    shapes, shape_paths = load_shapes(cache)
+    base_items, item_paths = load_base_items(cache)
+    blocks = BlockCache(enabled=use_cache)
+    content = render_checklist(base_items, shapes, blocks)
+
+    cache.prune(shape_paths + item_paths)
+    cache.save()
+    blocks.save()
+
+    parsed = f"{cache.misses} of {len(shape_paths) + len(item_paths)} file(s) parsed"
+    print(f"{len(base_items)} items ({parsed}, {blocks.rendered} entries rendered)")
+
+    current = None
+    if CHECKLIST_PATH.exists():
+        with open(CHECKLIST_PATH, "r", encoding="utf-8", newline="") as f:
+            current = f.read()
+
+    if current == content:
+        print(f"{cache_key(CHECKLIST_PATH)} is up to date")
+        return
+    if check:
+        print(f"{cache_key(CHECKLIST_PATH)} is stale — run tools/gen_sprite_checklist.py")
+        sys.exit(1)
+
+    with open(CHECKLIST_PATH, "w", encoding="utf-8", newline="\n") as f:
+        f.write(content)
+    print(f'Written {len(base_items)} items to {cache_key(CHECKLIST_PATH)}')
+
 
-print(f'Written {len(base_items)} items to data/SPRITE_GENERATION_CHECKLIST.md')
+if __name__ == "__main__":
+    main()
@@ -12,12 +12,14 @@ Usage:
 """
 
 import os
-import random
-import string
 import sys
 
+from staged_writes import StagedWrites
+from tres_document import stable_id
+
 PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..")
 OUTPUT_PATH = os.path.join(PROJECT_ROOT, "data", "element_skill_table.tres")
+TABLE_ID = "element_skill_table"  # seeds the stable resource ids
 
 # Element enum values
 FIRE = 0
@@ -74,17 +76,12 @@ ENTRIES = [
 ]
 
 
-def random_id(length=5):
-    chars = string.ascii_lowercase + string.digits
-    return "".join(random.choice(chars) for _ in range(length))
-
-
 def generate_tres():
     ext_id_counter = [1]
     ext_resources = []
 
     def add_ext(res_type, path):
-        eid = f"{ext_id_counter[0]}_{random_id()}"
+        eid = f"{ext_id_counter[0]}_{stable_id(TABLE_ID, path)}"
         ext_id_counter[0] += 1
         ext_resources.append((res_type, path, eid))
         return eid
@@ -108,7 +105,7 @@ def generate_tres():
     sub_lines = []
     sub_ids = []
     for i, (skill_id, _path, req_points) in enumerate(ENTRIES):
-        sid = f"Resource_{random_id()}"
+        sid = f"Resource_{stable_id(TABLE_ID, f'entries/{skill_id}')}"
         sub_ids.append(sid)
         sub_lines.append(f'[sub_resource type="Resource" id="{sid}"]')
         sub_lines.append(f'script = ExtResource("{eid_entry}")')
@@ -148,14 +145,11 @@ def main():
 
     print()
 
-    if apply:
-        os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-        content = generate_tres()
-        with open(OUTPUT_PATH, "w", encoding="utf-8", newline="\n") as f:
-            f.write(content)
-        print(f"  Created: data/element_skill_table.tres")
-    else:
-        print(f"  Would create: data/element_skill_table.tres")
+    with StagedWrites("generate_element_skill_table", apply) as staged:
+        staged.stage(OUTPUT_PATH, generate_tres())
+        staged.commit()
+    staged.report()
+    if not apply:
         print("\nRun with --apply to write file.")
 
 
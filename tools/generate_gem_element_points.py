@@ -7,17 +7,18 @@ Scans data/items/modifiers/*.tres, identifies gem families, and:
 
 Element enum values: FIRE=0, WATER=1, AIR=2, EARTH=3, PLANT=4, LIGHT=5, DARK=6
 
+Gems that already have element_points or whose family is unknown are left
+alone. Runs as a tres_codemod rule (see run_codemods.py).
+
 Usage:
     python tools/generate_gem_element_points.py           # dry run
+    python tools/generate_gem_element_points.py --diff    # dry run with a unified diff
     python tools/generate_gem_element_points.py --apply   # write files
 """
 
-import os
-import re
-import sys
+from pathlib import Path
 
-PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..")
-MODIFIERS_DIR = os.path.join(PROJECT_ROOT, "data", "items", "modifiers")
+from tres_codemod import Rule, main
 
 # Element enum values
 FIRE = 0
@@ -62,85 +63,32 @@ def format_element_points(points):
     return "{ " + ", ".join(parts) + " }"
 
 
-def process_gem_file(filepath, element_points, apply):
-    """Process a single gem .tres file."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    lines = content.split("\n")
-    new_lines = []
-    changes = []
-    in_resource_section = False
-
-    for line in lines:
-        # Track when we enter the main [resource] section
-        if line.strip() == "[resource]":
-            in_resource_section = True
+def is_unmigrated_gem(path, doc):
+    """A gem of a known family that has no element_points yet."""
+    return get_gem_family(Path(path).name) is not None and "element_points" not in doc.resource
 
-        # Remove granted_skills from conditional modifier rule sub-resources
-        if line.startswith("granted_skills = ") and not in_resource_section:
-            changes.append("  Removed granted_skills from conditional rule")
-            continue
 
-        # Add element_points before base_price in the main [resource] section
-        if in_resource_section and line.startswith("base_price = "):
-            pts_str = format_element_points(element_points)
-            new_lines.append(f"element_points = {pts_str}")
-            changes.append(f"  Added element_points = {pts_str}")
+def add_element_points(path, doc):
+    """Drop granted_skills from the conditional rules and add the family's element_points."""
+    changes = []
 
-        new_lines.append(line)
+    # Remove granted_skills from conditional modifier rule sub-resources
+    for sub in doc.sub_resources:
+        if sub.remove("granted_skills"):
+            changes.append("removed granted_skills from conditional rule")
 
-    if changes and apply:
-        with open(filepath, "w", encoding="utf-8", newline="\n") as f:
-            f.write("\n".join(new_lines))
+    # Add element_points before base_price in the main [resource] section
+    if "base_price" in doc.resource:
+        pts_str = format_element_points(GEM_ELEMENT_MAP[get_gem_family(Path(path).name)])
+        doc.resource.set_raw("element_points", pts_str, before="base_price")
+        changes.append(f"added element_points = {pts_str}")
 
     return changes
 
 
-def main():
-    apply = "--apply" in sys.argv
-    mode = "APPLYING" if apply else "DRY RUN"
-    print(f"=== {mode} ===\n")
-
-    total_modified = 0
-    total_skipped = 0
-
-    for filename in sorted(os.listdir(MODIFIERS_DIR)):
-        if not filename.endswith(".tres"):
-            continue
-
-        family = get_gem_family(filename)
-        if family is None:
-            print(f"  SKIP (unknown family): {filename}")
-            total_skipped += 1
-            continue
-
-        element_points = GEM_ELEMENT_MAP[family]
-        filepath = os.path.join(MODIFIERS_DIR, filename)
-
-        # Check if already has element_points
-        with open(filepath, "r", encoding="utf-8") as f:
-            content = f.read()
-        if "element_points = " in content:
-            print(f"  SKIP (already has element_points): {filename}")
-            total_skipped += 1
-            continue
-
-        changes = process_gem_file(filepath, element_points, apply)
-        if changes:
-            action = "Modified" if apply else "Would modify"
-            print(f"  {action}: {filename}")
-            for change in changes:
-                print(f"    {change}")
-            total_modified += 1
-
-    print(f"\n{'Modified' if apply else 'Would modify'}: {total_modified} files")
-    if total_skipped:
-        print(f"Skipped: {total_skipped} files")
-
-    if not apply:
-        print("\nRun with --apply to write files.")
+RULE = Rule("gem_element_points", add_element_points, paths=["data/items/modifiers/*.tres"],
+            where=is_unmigrated_gem)
 
 
 if __name__ == "__main__":
-    main()
+    main([RULE])
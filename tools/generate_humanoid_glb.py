@@ -2,21 +2,27 @@
 """Generate a low-poly humanoid character model in GLB format.
 
 Produces ~16 separate meshes with transform-based animations.
-Compatible with Godot 4's native GLB import.
+Compatible with Godot 4's native GLB import. Index buffers are
+cache-optimised with optimize_glb.py before saving.
 
-Usage: python tools/generate_humanoid_glb.py
+Usage:
+    python tools/generate_humanoid_glb.py              # float32 vertex data
+    python tools/generate_humanoid_glb.py --quantize   # KHR_mesh_quantization (see quantize_glb.py)
 Output: assets/models/characters/humanoid_test.glb
 """
 
 import struct
 import math
 import os
+import sys
 from pygltflib import (
     GLTF2, Asset, Scene, Node, Mesh, Primitive, Attributes,
     Accessor, BufferView, Buffer, Material, PbrMetallicRoughness,
     Animation, AnimationChannel, AnimationSampler, AnimationChannelTarget,
 )
 
+from optimize_glb import optimize_gltf
+
 # glTF constants
 ELEMENT_ARRAY_BUFFER = 34963
 ARRAY_BUFFER = 34962
@@ -716,12 +722,20 @@ class GLBBuilder:
 # ──────────────────────────────────────────────
 
 def main():
+    quantize = "--quantize" in sys.argv
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     output_path = os.path.join(OUTPUT_DIR, OUTPUT_FILE)
 
     print("Generating humanoid GLB model...")
     builder = GLBBuilder()
     gltf = builder.build()
+    opt = optimize_gltf(gltf)
+    print(f"  ACMR:       {opt['misses_before'] / opt['triangles']:.3f} -> "
+          f"{opt['misses_after'] / opt['triangles']:.3f}")
+    if quantize:
+        from quantize_glb import quantize_gltf
+        stats = quantize_gltf(gltf)
+        print(f"  Quantized:  {stats['quantized']} meshes (KHR_mesh_quantization)")
 
     # Stats
     total_tris = 0
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Regenerate every item family in one pass through item_generation.py.
+
+Validates all family tables first (any error means nothing is written),
+renders every item × rarity through the shared template and writes the
+results in one batch; files whose content did not change are left alone.
+
+Usage:
+    python tools/generate_items.py                          # dry run
+    python tools/generate_items.py --apply                  # write new files
+    python tools/generate_items.py --apply --force          # also rewrite existing files
+    python tools/generate_items.py --family=armor,jewelry   # only some families
+    python tools/generate_items.py --apply --jobs=8         # render pool size for large catalogs
+"""
+
+import sys
+
+import generate_armor
+import generate_innate_weapons
+import generate_jewelry
+import generate_legendary_items
+import generate_weapons
+from item_generation import main as generate
+from tool_cache import arg_value
+
+FAMILIES = [
+    generate_weapons.FAMILY,
+    generate_innate_weapons.FAMILY,
+    generate_armor.FAMILY,
+    generate_jewelry.FAMILY,
+    generate_legendary_items.FAMILY,
+]
+
+
+def main():
+    wanted = [n for n in arg_value("family").split(",") if n]
+    unknown = sorted(set(wanted) - {f["name"] for f in FAMILIES})
+    if unknown:
+        print(f"Unknown family: {', '.join(unknown)} "
+              f"(known: {', '.join(f['name'] for f in FAMILIES)})")
+        sys.exit(1)
+    generate([f for f in FAMILIES if not wanted or f["name"] in wanted])
+
+
+if __name__ == "__main__":
+    main()
@@ -15,7 +15,8 @@ Usage:
 import os
 import sys
 
-PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..")
+from staged_writes import StagedWrites
+
 
 FILES = {}
 
@@ -117,20 +118,11 @@ def main():
     mode = "APPLYING" if apply else "DRY RUN"
     print(f"=== {mode} ===\n")
 
-    total = 0
-    for rel_path, content in FILES.items():
-        filepath = os.path.join(PROJECT_ROOT, rel_path)
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-
-        if apply:
-            with open(filepath, "w", encoding="utf-8", newline="\n") as f:
-                f.write(content)
-            print(f"  Created: {rel_path}")
-        else:
-            print(f"  Would create: {rel_path}")
-        total += 1
-
-    print(f"\n{'Created' if apply else 'Would create'}: {total} files")
+    with StagedWrites("generate_legendary_data", apply) as staged:
+        for rel_path, content in FILES.items():
+            staged.stage(rel_path, content)
+        staged.commit()
+    staged.report()
     if not apply:
         print("\nRun with --apply to write files.")
 
@@ -4,72 +4,26 @@
 Skills are now unlocked via the element points system, so weapons
 no longer grant skills directly.
 
+Runs as a tres_codemod rule; run_codemods.py applies it together with
+the other data migrations in one pass.
+
 Usage:
     python tools/generate_weapon_skill_removal.py           # dry run
+    python tools/generate_weapon_skill_removal.py --diff    # dry run with a unified diff
     python tools/generate_weapon_skill_removal.py --apply   # write files
 """
 
-import os
-import sys
-
-PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..")
-WEAPONS_DIR = os.path.join(PROJECT_ROOT, "data", "items", "weapons")
-
-
-def process_weapon_file(filepath, apply):
-    """Remove granted_skills line from a weapon .tres file."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    if "granted_skills = " not in content:
-        return False
-
-    lines = content.split("\n")
-    new_lines = []
-    removed = False
-
-    for line in lines:
-        if line.startswith("granted_skills = "):
-            removed = True
-            continue
-        new_lines.append(line)
-
-    if removed and apply:
-        with open(filepath, "w", encoding="utf-8", newline="\n") as f:
-            f.write("\n".join(new_lines))
-
-    return removed
-
-
-def main():
-    apply = "--apply" in sys.argv
-    mode = "APPLYING" if apply else "DRY RUN"
-    print(f"=== {mode} ===\n")
-
-    total_modified = 0
-    total_skipped = 0
-
-    for filename in sorted(os.listdir(WEAPONS_DIR)):
-        if not filename.endswith(".tres"):
-            continue
+from tres_codemod import Rule, main
 
-        filepath = os.path.join(WEAPONS_DIR, filename)
-        removed = process_weapon_file(filepath, apply)
 
-        if removed:
-            action = "Modified" if apply else "Would modify"
-            print(f"  {action}: {filename} (removed granted_skills)")
-            total_modified += 1
-        else:
-            total_skipped += 1
+def remove_granted_skills(_path, doc):
+    """Remove the granted_skills property from every section."""
+    return [f"removed granted_skills from [{section.tag}]"
+            for section in doc.sections if section.remove("granted_skills")]
 
-    print(f"\n{'Modified' if apply else 'Would modify'}: {total_modified} files")
-    if total_skipped:
-        print(f"Skipped (no granted_skills): {total_skipped} files")
 
-    if not apply:
-        print("\nRun with --apply to write files.")
+RULE = Rule("weapon_skill_removal", remove_granted_skills, paths=["data/items/weapons/*.tres"])
 
 
 if __name__ == "__main__":
-    main()
+    main([RULE])
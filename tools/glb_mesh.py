@@ -0,0 +1,349 @@
+"""Shared helpers for reading and rewriting GLB mesh data with NumPy.
+
+Used by the GLB processing tools (quantization, auditing, optimisation) so
+each one does not re-implement accessor decoding and buffer repacking.
+
+    gltf = load_glb(path)
+    positions = read_accessor_float(gltf, prim.attributes.POSITION)
+    editor = GlbEditor(gltf)
+    prim.attributes.POSITION = editor.add_accessor(new_positions, FLOAT, "VEC3",
+                                                   target=ARRAY_BUFFER, bounds=True)
+    editor.finish()          # drops unreferenced data, rebuilds the binary blob
+    gltf.save(path)
+"""
+
+import warnings
+
+import numpy as np
+from pygltflib import GLTF2, Accessor, BufferView, Buffer, BufferFormat
+
+# glTF constants
+ELEMENT_ARRAY_BUFFER = 34963
+ARRAY_BUFFER = 34962
+BYTE = 5120
+UNSIGNED_BYTE = 5121
+SHORT = 5122
+UNSIGNED_SHORT = 5123
+UNSIGNED_INT = 5125
+FLOAT = 5126
+
+COMPONENT_DTYPES = {
+    BYTE: np.int8,
+    UNSIGNED_BYTE: np.uint8,
+    SHORT: np.int16,
+    UNSIGNED_SHORT: np.uint16,
+    UNSIGNED_INT: np.uint32,
+    FLOAT: np.float32,
+}
+
+TYPE_COMPONENTS = {
+    "SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4,
+    "MAT2": 4, "MAT3": 9, "MAT4": 16,
+}
+
+# Divisors for decoding normalized integer components (glTF 2.0 §3.11)
+NORMALIZED_DIVISORS = {
+    BYTE: 127.0,
+    UNSIGNED_BYTE: 255.0,
+    SHORT: 32767.0,
+    UNSIGNED_SHORT: 65535.0,
+}
+
+# Extensions that store geometry outside plain accessors — we can't rewrite those
+UNSUPPORTED_EXTENSIONS = {"KHR_draco_mesh_compression", "EXT_meshopt_compression"}
+
+VERTEX_ALIGNMENT = 4
+
+
+# ──────────────────────────────────────────────
+#  Loading / reading
+# ──────────────────────────────────────────────
+
+def load_glb(path: str) -> GLTF2:
+    """Load a .glb or .gltf file with all buffers merged into one binary blob."""
+    gltf = GLTF2().load(path)
+    if gltf.binary_blob() is None and gltf.buffers:
+        with warnings.catch_warnings():
+            # The external .bin stays in use by the .gltf; nothing is orphaned
+            warnings.filterwarnings("ignore", message="Conversion will leave")
+            gltf.convert_buffers(BufferFormat.BINARYBLOB)
+    return gltf
+
+
+def is_rewritable(gltf: GLTF2) -> bool:
+    """True if every mesh is stored as plain accessors we know how to rewrite."""
+    required = set(gltf.extensionsRequired or [])
+    return not (required & UNSUPPORTED_EXTENSIONS)
+
+
+def read_accessor(gltf: GLTF2, index: int) -> np.ndarray:
+    """Return accessor data in its stored component type.
+
+    Shape is (count,) for SCALAR accessors and (count, components) otherwise.
+    Handles interleaved buffer views and sparse accessors.
+    """
+    acc = gltf.accessors[index]
+    dtype = np.dtype(COMPONENT_DTYPES[acc.componentType]).newbyteorder("<")
+    ncomp = TYPE_COMPONENTS[acc.type]
+
+    if acc.bufferView is None:
+        data = np.zeros((acc.count, ncomp), dtype=dtype)
+    else:
+        bv = gltf.bufferViews[acc.bufferView]
+        blob = gltf.binary_blob()
+        start = (bv.byteOffset or 0) + (acc.byteOffset or 0)
+        elem_size = dtype.itemsize * ncomp
+        stride = bv.byteStride or elem_size
+        data = np.ndarray(
+            shape=(acc.count, ncomp), dtype=dtype, buffer=blob,
+            offset=start, strides=(stride, dtype.itemsize),
+        ).copy()
+
+    if acc.sparse is not None:
+        _apply_sparse(gltf, acc, data)
+
+    if ncomp == 1:
+        return data.reshape(acc.count)
+    return data
+
+
+def _apply_sparse(gltf: GLTF2, acc: Accessor, data: np.ndarray):
+    """Overwrite `data` rows with the sparse substitution values of `acc`."""
+    blob = gltf.binary_blob()
+    sparse = acc.sparse
+    idx_bv = gltf.bufferViews[sparse.indices.bufferView]
+    idx_dtype = np.dtype(COMPONENT_DTYPES[sparse.indices.componentType]).newbyteorder("<")
+    idx_start = (idx_bv.byteOffset or 0) + (sparse.indices.byteOffset or 0)
+    rows = np.frombuffer(blob, dtype=idx_dtype, count=sparse.count, offset=idx_start)
+
+    val_bv = gltf.bufferViews[sparse.values.bufferView]
+    val_start = (val_bv.byteOffset or 0) + (sparse.values.byteOffset or 0)
+    values = np.frombuffer(
+        blob, dtype=data.dtype, count=sparse.count * data.shape[1], offset=val_start
+    ).reshape(sparse.count, data.shape[1])
+    data[rows.astype(np.int64)] = values
+
+
+def read_accessor_float(gltf: GLTF2, index: int) -> np.ndarray:
+    """Return accessor data as float32, decoding normalized integer components."""
+    acc = gltf.accessors[index]
+    data = read_accessor(gltf, index).astype(np.float32)
+    if acc.normalized and acc.componentType in NORMALIZED_DIVISORS:
+        data = np.maximum(data / NORMALIZED_DIVISORS[acc.componentType], -1.0)
+    return data
+
+
+def read_indices(gltf: GLTF2, prim) -> np.ndarray:
+    """Return a primitive's triangle indices as uint32 (generated if non-indexed)."""
+    if prim.indices is not None:
+        return read_accessor(gltf, prim.indices).astype(np.uint32)
+    count = gltf.accessors[prim.attributes.POSITION].count
+    return np.arange(count, dtype=np.uint32)
+
+
+def primitive_attributes(prim) -> dict:
+    """Return {semantic: accessor index} for every attribute set on a primitive."""
+    return {k: v for k, v in vars(prim.attributes).items() if v is not None}
+
+
+# ──────────────────────────────────────────────
+#  Writing
+# ──────────────────────────────────────────────
+
+class GlbEditor:
+    """Appends new accessors to a loaded GLTF2 and repacks its binary blob.
+
+    Accessors replaced by the caller stay in the blob until finish(), which
+    drops every accessor and buffer view that is no longer referenced.
+    """
+
+    def __init__(self, gltf: GLTF2):
+        self.gltf = gltf
+        self._bin = bytearray(gltf.binary_blob() or b"")
+        if not gltf.buffers:
+            gltf.buffers = [Buffer(byteLength=0)]
+
+    def add_buffer_view(self, data: bytes, target: int = None, byte_stride: int = None) -> int:
+        """Append data to the blob (4-byte aligned), create a BufferView, return its index."""
+        pad = (VERTEX_ALIGNMENT - len(self._bin) % VERTEX_ALIGNMENT) % VERTEX_ALIGNMENT
+        self._bin.extend(b"\x00" * pad)
+
+        offset = len(self._bin)
+        self._bin.extend(data)
+
+        bv = BufferView(buffer=0, byteOffset=offset, byteLength=len(data))
+        if target:
+            bv.target = target
+        if byte_stride:
+            bv.byteStride = byte_stride
+        idx = len(self.gltf.bufferViews)
+        self.gltf.bufferViews.append(bv)
+        return idx
+
+    def add_accessor(self, array: np.ndarray, comp_type: int, acc_type: str,
+                     target: int = None, normalized: bool = False, bounds: bool = False) -> int:
+        """Store `array` as a new accessor, return its index.
+
+        Vertex attributes (target=ARRAY_BUFFER) are padded so every element
+        starts on a 4-byte boundary, as glTF requires for int8/int16 VEC3.
+        """
+        dtype = np.dtype(COMPONENT_DTYPES[comp_type]).newbyteorder("<")
+        ncomp = TYPE_COMPONENTS[acc_type]
+        values = np.ascontiguousarray(array, dtype=dtype).reshape(-1, ncomp)
+        count = values.shape[0]
+
+        elem_size = dtype.itemsize * ncomp
+        stride = None
+        if target == ARRAY_BUFFER and elem_size % VERTEX_ALIGNMENT:
+            stride = elem_size + (VERTEX_ALIGNMENT - elem_size % VERTEX_ALIGNMENT)
+            padded = np.zeros((count, stride), dtype=np.uint8)
+            padded[:, :elem_size] = values.view(np.uint8).reshape(count, elem_size)
+            data = padded.tobytes()
+        else:
+            data = values.tobytes()
+
+        bv = self.add_buffer_view(data, target, stride)
+        acc = Accessor(bufferView=bv, componentType=comp_type, count=count, type=acc_type)
+        if normalized:
+            acc.normalized = True
+        if bounds and count:
+            acc.min = _bound_list(values.min(axis=0), comp_type)
+            acc.max = _bound_list(values.max(axis=0), comp_type)
+        idx = len(self.gltf.accessors)
+        self.gltf.accessors.append(acc)
+        return idx
+
+    def finish(self) -> GLTF2:
+        """Drop unreferenced accessors/buffer views and rewrite a compact blob."""
+        gltf = self.gltf
+        acc_map = _compact_accessors(gltf)
+        _remap_accessor_refs(gltf, acc_map)
+
+        bv_refs = _referenced_buffer_views(gltf)
+        new_bin = bytearray()
+        bv_map = {}
+        new_views = []
+        for old_idx in sorted(bv_refs):
+            bv = gltf.bufferViews[old_idx]
+            start = bv.byteOffset or 0
+            pad = (VERTEX_ALIGNMENT - len(new_bin) % VERTEX_ALIGNMENT) % VERTEX_ALIGNMENT
+            new_bin.extend(b"\x00" * pad)
+            bv_map[old_idx] = len(new_views)
+            new_offset = len(new_bin)
+            new_bin.extend(self._bin[start:start + bv.byteLength])
+            bv.byteOffset = new_offset
+            bv.buffer = 0
+            new_views.append(bv)
+        gltf.bufferViews = new_views
+        _remap_buffer_view_refs(gltf, bv_map)
+
+        gltf.buffers = [Buffer(byteLength=len(new_bin))]
+        gltf.set_binary_blob(bytes(new_bin))
+        self._bin = new_bin
+        return gltf
+
+
+def _bound_list(values: np.ndarray, comp_type: int) -> list:
+    if comp_type == FLOAT:
+        return [float(v) for v in values]
+    return [int(v) for v in values]
+
+
+def add_extension(gltf: GLTF2, name: str, required: bool = True):
+    """Declare a glTF extension as used (and required) on the asset."""
+    used = list(gltf.extensionsUsed or [])
+    if name not in used:
+        used.append(name)
+    gltf.extensionsUsed = used
+    if required:
+        req = list(gltf.extensionsRequired or [])
+        if name not in req:
+            req.append(name)
+        gltf.extensionsRequired = req
+
+
+def glb_size(gltf: GLTF2) -> int:
+    """Byte size the asset would have when saved as .glb."""
+    return sum(len(chunk) for chunk in gltf.save_to_bytes())
+
+
+# ──────────────────────────────────────────────
+#  Reference bookkeeping
+# ──────────────────────────────────────────────
+
+def _accessor_ref_slots(gltf: GLTF2):
+    """Yield (owner, key) pairs for every accessor reference in the asset.
+
+    owner is either an object (key is an attribute name) or a dict.
+    """
+    for mesh in gltf.meshes or []:
+        for prim in mesh.primitives:
+            for sem, val in vars(prim.attributes).items():
+                if val is not None:
+                    yield prim.attributes, sem
+            if prim.indices is not None:
+                yield prim, "indices"
+            for target in prim.targets or []:
+                if isinstance(target, dict):
+                    for sem in target:
+                        yield target, sem
+                else:
+                    for sem, val in vars(target).items():
+                        if val is not None:
+                            yield target, sem
+    for anim in gltf.animations or []:
+        for sampler in anim.samplers:
+            yield sampler, "input"
+            yield sampler, "output"
+    for skin in gltf.skins or []:
+        if skin.inverseBindMatrices is not None:
+            yield skin, "inverseBindMatrices"
+
+
+def _get_slot(owner, key):
+    return owner[key] if isinstance(owner, dict) else getattr(owner, key)
+
+
+def _set_slot(owner, key, value):
+    if isinstance(owner, dict):
+        owner[key] = value
+    else:
+        setattr(owner, key, value)
+
+
+def _compact_accessors(gltf: GLTF2) -> dict:
+    used = sorted({_get_slot(o, k) for o, k in _accessor_ref_slots(gltf)})
+    acc_map = {old: new for new, old in enumerate(used)}
+    gltf.accessors = [gltf.accessors[i] for i in used]
+    return acc_map
+
+
+def _remap_accessor_refs(gltf: GLTF2, acc_map: dict):
+    for owner, key in list(_accessor_ref_slots(gltf)):
+        _set_slot(owner, key, acc_map[_get_slot(owner, key)])
+
+
+def _referenced_buffer_views(gltf: GLTF2) -> set:
+    refs = set()
+    for acc in gltf.accessors:
+        if acc.bufferView is not None:
+            refs.add(acc.bufferView)
+        if acc.sparse is not None:
+            refs.add(acc.sparse.indices.bufferView)
+            refs.add(acc.sparse.values.bufferView)
+    for img in gltf.images or []:
+        if img.bufferView is not None:
+            refs.add(img.bufferView)
+    return refs
+
+
+def _remap_buffer_view_refs(gltf: GLTF2, bv_map: dict):
+    for acc in gltf.accessors:
+        if acc.bufferView is not None:
+            acc.bufferView = bv_map[acc.bufferView]
+        if acc.sparse is not None:
+            acc.sparse.indices.bufferView = bv_map[acc.sparse.indices.bufferView]
+            acc.sparse.values.bufferView = bv_map[acc.sparse.values.bufferView]
+    for img in gltf.images or []:
+        if img.bufferView is not None:
+            img.bufferView = bv_map[img.bufferView]
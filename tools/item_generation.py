@@ -0,0 +1,449 @@
+"""Declarative item generation engine shared by the item family generators.
+
+An item family is plain data: a dict of family-wide settings plus a list of
+item specs. The engine validates every spec, expands each one over the
+family's rarity tiers and renders all of them through the single template
+in render_item(), then streams the results through StreamWriter into a
+StagedWrites transaction: unchanged files are left untouched and the changed
+ones are committed together once every file rendered and validated.
+
+    FAMILY = {
+        "name": "weapons",
+        "dir": "weapons",                  # data/items/<dir>/, an item may override
+        "rarities": RARITIES,              # tiers to expand, see LEGENDARY_TIER
+        "defaults": {"item_type": ITEM_ACTIVE_TOOL},
+        "armor_slot": "category",          # or "gear": passive gear and shields only
+        "innate_chance": "item",           # or "rarity": chance/stacks from the tier
+        "grant_skills": False,             # write granted_skills from "skills"
+        "icons": {},                       # category -> icon overrides
+        "items": [ {...}, ... ],
+    }
+
+Item spec keys are listed in ITEM_KEYS; unknown keys are a validation
+error, so a typo cannot silently drop a field. Stats scale with the tier's
+power_mult (positive values stay >= 1, zeros are dropped), prices with its
+price_mult. Skills are tiered by the rarity's skill_suffix.
+
+Each family module (generate_weapons.py, generate_armor.py, ...) only holds
+its table; generate_items.py rebuilds every family in one pass and
+benchmark_item_generation.py measures the pipeline on 10k+ synthetic items.
+"""
+
+import queue
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from staged_writes import StagedWrites
+from tool_cache import arg_value
+from tres_document import ExtResource, SubResource, TypedArray, format_tres, stable_id
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ITEMS_DIR = PROJECT_ROOT / "data" / "items"
+
+# Below this many files, rendering inline beats starting a process pool
+MIN_POOL_ITEMS = 2000
+# Jobs submitted to the render pool at a time
+RENDER_WINDOW = 4096
+
+# Streaming writer: I/O threads and rendered files waiting for them
+WRITE_WORKERS = 8
+WRITE_QUEUE_SIZE = 256
+
+# ─── enums (from enums.gd) ───────────────────────────────────────────────────
+
+STAT_MAX_HP = 0
+STAT_MAX_MP = 1
+STAT_SPEED = 2
+STAT_LUCK = 3
+STAT_PHYS_ATK = 4
+STAT_PHYS_DEF = 5
+STAT_MAG_ATK = 6
+STAT_MAG_DEF = 7
+STAT_CRIT_RATE = 8
+STAT_CRIT_DMG = 9
+
+ITEM_ACTIVE_TOOL = 0
+ITEM_PASSIVE_GEAR = 1
+
+# EquipmentCategory (armor_slot uses the same values)
+CAT_SWORD = 0
+CAT_MACE = 1
+CAT_BOW = 2
+CAT_STAFF = 3
+CAT_DAGGER = 4
+CAT_SHIELD = 5
+CAT_AXE = 6
+CAT_HELMET = 7
+CAT_CHESTPLATE = 8
+CAT_GLOVES = 9
+CAT_LEGS = 10
+CAT_BOOTS = 11
+CAT_NECKLACE = 12
+CAT_RING = 13
+
+# ─── shared tables ───────────────────────────────────────────────────────────
+
+# chance / stacks / crit_stacks drive innate status effects for families
+# with "innate_chance": "rarity"; skill_suffix picks the skill tier
+RARITIES = [
+    {"name": "common",    "enum_val": 0, "power_mult": 1.0, "price_mult": 1.0,  "skill_suffix": "",
+     "chance": 0.05, "stacks": 1, "crit_stacks": 2},
+    {"name": "uncommon",  "enum_val": 1, "power_mult": 1.4, "price_mult": 1.56, "skill_suffix": "",
+     "chance": 0.15, "stacks": 1, "crit_stacks": 2},
+    {"name": "rare",      "enum_val": 2, "power_mult": 1.8, "price_mult": 2.04, "skill_suffix": "_ii",
+     "chance": 0.25, "stacks": 1, "crit_stacks": 3},
+    {"name": "elite",     "enum_val": 3, "power_mult": 2.2, "price_mult": 2.64, "skill_suffix": "_ii",
+     "chance": 0.35, "stacks": 2, "crit_stacks": 3},
+    {"name": "legendary", "enum_val": 4, "power_mult": 3.0, "price_mult": 3.60, "skill_suffix": "_iii",
+     "chance": 0.45, "stacks": 2, "crit_stacks": 4},
+    {"name": "unique",    "enum_val": 5, "power_mult": 4.0, "price_mult": 4.80, "skill_suffix": "_iii",
+     "chance": 0.60, "stacks": 3, "crit_stacks": 5},
+]
+
+# Single-tier family: one file per item, no id suffix, stats and price as written
+LEGENDARY_TIER = {"name": None, "enum_val": 5, "power_mult": 1.0, "price_mult": 1.0, "skill_suffix": ""}
+
+SHAPES = {
+    "1x1": "res://data/shapes/shape_1x1.tres",
+    "1x2": "res://data/shapes/shape_1x2.tres",
+    "1x3": "res://data/shapes/shape_1x3.tres",
+    "1x4": "res://data/shapes/shape_1x4.tres",
+    "2x2": "res://data/shapes/shape_2x2.tres",
+    "2x3": "res://data/shapes/shape_2x3.tres",
+    "axe": "res://data/shapes/shape_axe.tres",
+    "bow": "res://data/shapes/shape_bow.tres",
+    "l": "res://data/shapes/shape_l.tres",
+    "shortbow": "res://data/shapes/shape_shortbow.tres",
+    "longbow": "res://data/shapes/shape_longbow.tres",
+    "cross": "res://data/shapes/shape_cross.tres",
+    "bold_u": "res://data/shapes/shape_bold_u.tres",
+    "great_axe": "res://data/shapes/shape_great_axe.tres",
+    "double_scythe": "res://data/shapes/shape_double_scythe.tres",
+    "staff_custom": "res://data/shapes/shape_custom_212525.tres",
+}
+
+# Placeholder icon per category; items may be pointed at their own art later,
+# so these paths are not required to exist
+ICONS = {
+    CAT_SWORD: "res://assets/sprites/items/sword_common.png",
+    CAT_MACE: "res://assets/sprites/items/mace_common.png",
+    CAT_BOW: "res://assets/sprites/items/bow_common.png",
+    CAT_STAFF: "res://assets/sprites/items/staff_common.png",
+    CAT_DAGGER: "res://assets/sprites/items/dagger_common.png",
+    CAT_SHIELD: "res://assets/sprites/items/shield_common.png",
+    CAT_AXE: "res://assets/sprites/items/mace_common.png",  # axes use the mace icon
+    CAT_HELMET: "res://assets/sprites/items/helmet_common.png",
+    CAT_CHESTPLATE: "res://assets/sprites/items/chestplate_common.png",
+    CAT_GLOVES: "res://assets/sprites/items/chestplate_common.png",
+    CAT_LEGS: "res://assets/sprites/items/boots_common.png",
+    CAT_BOOTS: "res://assets/sprites/items/boots_common.png",
+    CAT_NECKLACE: "res://assets/sprites/items/ring_common.png",
+    CAT_RING: "res://assets/sprites/items/ring_common.png",
+}
+
+SCRIPTS = {
+    "item_data": "res://scripts/resources/item_data.gd",
+    "stat_modifier": "res://scripts/resources/stat_modifier.gd",
+    "skill_data": "res://scripts/resources/skill_data.gd",
+}
+
+
+def skill_path(skill: str) -> str:
+    return f"res://data/skills/{skill}.tres"
+
+
+def status_effect_path(status: str) -> str:
+    return f"res://data/status_effects/{status}.tres"
+
+
+# ─── validation ──────────────────────────────────────────────────────────────
+
+REQUIRED_KEYS = {"id", "name", "description", "category", "shape", "stats", "base_price"}
+ITEM_KEYS = REQUIRED_KEYS | {
+    "item_type", "hands", "base_power", "magical_power", "skills", "icon", "dir", "min_rarity",
+    "innate_effect",  # (status key, chance); the chance is ignored with "innate_chance": "rarity"
+    "granted_effects", "extra_hit_count", "extra_hit_damage_fraction", "innate_force_aoe",
+    "innate_lifesteal_percent", "on_kill_heal_percent",
+}
+FAMILY_KEYS = {"name", "dir", "rarities", "defaults", "armor_slot", "innate_chance", "grant_skills",
+               "icons", "items"}
+STAT_IDS = set(range(STAT_MAX_HP, STAT_CRIT_DMG + 1))
+CATEGORY_IDS = set(range(CAT_SWORD, CAT_RING + 1))
+
+
+def _res_exists(res_path: str) -> bool:
+    return (PROJECT_ROOT / res_path[len("res://"):]).exists()
+
+
+def validate_family(family: dict) -> list[str]:
+    """Human-readable problems with a family spec (empty when it can be rendered)."""
+    name = family.get("name", "?")
+    errors = [f"{name}: unknown family key {k!r}" for k in sorted(set(family) - FAMILY_KEYS)]
+    if family.get("armor_slot", "category") not in ("category", "gear"):
+        errors.append(f"{name}: armor_slot must be 'category' or 'gear'")
+    if family.get("innate_chance", "item") not in ("item", "rarity"):
+        errors.append(f"{name}: innate_chance must be 'item' or 'rarity'")
+
+    seen = set()
+    for raw in family.get("items", []):
+        spec = {**family.get("defaults", {}), **raw}
+        where = f"{name}/{spec.get('id', '?')}"
+        errors += [f"{where}: missing {k!r}" for k in sorted(REQUIRED_KEYS - set(spec))]
+        errors += [f"{where}: unknown key {k!r}" for k in sorted(set(spec) - ITEM_KEYS)]
+        if spec.get("id") in seen:
+            errors.append(f"{where}: duplicate id")
+        seen.add(spec.get("id"))
+
+        if spec.get("category") not in CATEGORY_IDS:
+            errors.append(f"{where}: unknown category {spec.get('category')!r}")
+        if spec.get("item_type", ITEM_ACTIVE_TOOL) not in (ITEM_ACTIVE_TOOL, ITEM_PASSIVE_GEAR):
+            errors.append(f"{where}: unknown item_type {spec['item_type']!r}")
+        if spec.get("shape") not in SHAPES:
+            errors.append(f"{where}: unknown shape {spec.get('shape')!r}")
+        elif not _res_exists(SHAPES[spec["shape"]]):
+            errors.append(f"{where}: shape file missing: {SHAPES[spec['shape']]}")
+        for stat in spec.get("stats", []):
+            if len(stat) != 2 or stat[0] not in STAT_IDS or not isinstance(stat[1], (int, float)):
+                errors.append(f"{where}: bad stat {stat!r}")
+
+        icon = spec.get("icon") or family.get("icons", {}).get(spec.get("category"),
+                                                               ICONS.get(spec.get("category")))
+        if icon is None:
+            errors.append(f"{where}: no icon for category {spec.get('category')!r}")
+        if spec.get("innate_effect"):
+            status = spec["innate_effect"][0]
+            if not _res_exists(status_effect_path(status)):
+                errors.append(f"{where}: unknown status effect {status!r}")
+        if family.get("grant_skills"):
+            suffixes = {r["skill_suffix"] for r in family.get("rarities", RARITIES)}
+            for skill in spec.get("skills", []):
+                for suffix in sorted(suffixes):
+                    if not _res_exists(skill_path(skill + suffix)):
+                        errors.append(f"{where}: skill missing: {skill}{suffix}")
+    return errors
+
+
+# ─── rendering ───────────────────────────────────────────────────────────────
+
+def _scale_stat(value, mult: float):
+    """Positive stats never scale below 1; penalties scale without clamping."""
+    if value > 0:
+        return max(1, round(value * mult))
+    return round(value * mult)
+
+
+def expand_family(family: dict) -> list[tuple[dict, dict, dict]]:
+    """(family settings, spec, rarity) for every file the family produces."""
+    settings = {k: v for k, v in family.items() if k != "items"}
+    jobs = []
+    for raw in family["items"]:
+        spec = {**family.get("defaults", {}), **raw}
+        for rarity in family.get("rarities", RARITIES):
+            if rarity["enum_val"] >= spec.get("min_rarity", 0):
+                jobs.append((settings, spec, rarity))
+    return jobs
+
+
+def _item_id(spec: dict, rarity: dict) -> str:
+    return spec["id"] if rarity["name"] is None else f"{spec['id']}_{rarity['name']}"
+
+
+def item_path(job: tuple) -> str:
+    """Project-relative path render_item() writes the job to."""
+    family, spec, rarity = job
+    return f"data/items/{spec.get('dir', family['dir'])}/{_item_id(spec, rarity)}.tres"
+
+
+def render_item(job: tuple) -> tuple[str, str]:
+    """Render one item at one rarity; returns (project-relative path, file text)."""
+    family, spec, rarity = job
+    item_id = _item_id(spec, rarity)
+    mult = rarity["power_mult"]
+    category = spec["category"]
+    item_type = spec.get("item_type", ITEM_ACTIVE_TOOL)
+
+    ext_resources = []
+    ext_ids = {}
+
+    def ext(res_type: str, path: str) -> ExtResource:
+        # ext_resources are declared in order of first use
+        if path not in ext_ids:
+            ext_ids[path] = f"{len(ext_resources) + 1}_{stable_id(item_id, path)}"
+            ext_resources.append((res_type, path, ext_ids[path]))
+        return ExtResource(ext_ids[path])
+
+    props = {
+        "script": ext("Script", SCRIPTS["item_data"]),
+        "id": item_id,
+        "display_name": spec["name"],
+        "description": spec["description"],
+        "icon": ext("Texture2D", spec.get("icon") or family.get("icons", {}).get(category, ICONS[category])),
+    }
+    if item_type != ITEM_ACTIVE_TOOL:
+        props["item_type"] = item_type
+    if category != CAT_SWORD:
+        props["category"] = category
+    if rarity["enum_val"] != 0:
+        props["rarity"] = rarity["enum_val"]
+    if spec.get("hands", 0) > 0:
+        props["hand_slots_required"] = spec["hands"]
+    if family.get("armor_slot", "category") == "category":
+        props["armor_slot"] = category
+    elif item_type == ITEM_PASSIVE_GEAR or category == CAT_SHIELD:
+        props["armor_slot"] = category
+    props["shape"] = ext("Resource", SHAPES[spec["shape"]])
+
+    sub_resources = []
+    stats = [(s, _scale_stat(v, mult)) for s, v in spec["stats"] if v != 0]
+    if stats:
+        stat_script = ext("Script", SCRIPTS["stat_modifier"])
+        for i, (stat, value) in enumerate(stats):
+            sid = f"Resource_{stable_id(item_id, f'stat_modifiers/{i}')}"
+            sub_resources.append(("Resource", sid, {"script": stat_script, "stat": stat, "value": float(value)}))
+        props["stat_modifiers"] = TypedArray(stat_script, [SubResource(s[1]) for s in sub_resources])
+
+    for key in ("base_power", "magical_power"):
+        if spec.get(key, 0) > 0:
+            props[key] = round(spec[key] * mult)
+
+    if spec.get("innate_effect"):
+        status, chance = spec["innate_effect"]
+        props["innate_status_effect"] = ext("Resource", status_effect_path(status))
+        if family.get("innate_chance", "item") == "rarity":
+            props["innate_status_effect_chance"] = rarity["chance"]
+            if rarity["stacks"] != 1:
+                props["innate_status_stacks"] = rarity["stacks"]
+            if rarity["crit_stacks"] != 2:
+                props["innate_crit_status_stacks"] = rarity["crit_stacks"]
+        else:
+            props["innate_status_effect_chance"] = chance
+
+    if family.get("grant_skills") and spec.get("skills"):
+        skills = [ext("Resource", skill_path(s + rarity["skill_suffix"])) for s in spec["skills"]]
+        props["granted_skills"] = TypedArray(ext("Script", SCRIPTS["skill_data"]), skills)
+
+    # Legendary effects
+    if spec.get("granted_effects"):
+        props["granted_effects"] = TypedArray("String", spec["granted_effects"])
+    if spec.get("extra_hit_count", 0) > 0:
+        props["extra_hit_count"] = spec["extra_hit_count"]
+        props["extra_hit_damage_fraction"] = spec["extra_hit_damage_fraction"]
+    if spec.get("innate_force_aoe"):
+        props["innate_force_aoe"] = True
+    for key in ("innate_lifesteal_percent", "on_kill_heal_percent"):
+        if spec.get(key, 0) > 0:
+            props[key] = spec[key]
+
+    props["base_price"] = max(1, round(spec["base_price"] * rarity["price_mult"]))
+
+    return item_path(job), format_tres("ItemData", ext_resources, sub_resources, props)
+
+
+def iter_rendered(work: list[tuple], jobs: int = None):
+    """Yield (path, text) for every job in order, without holding the whole catalog.
+
+    Large catalogs render in a process pool, RENDER_WINDOW jobs at a time so
+    that finished files are consumed before the next window is submitted.
+    """
+    if len(work) < MIN_POOL_ITEMS:
+        for job in work:
+            yield render_item(job)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for start in range(0, len(work), RENDER_WINDOW):
+            yield from pool.map(render_item, work[start:start + RENDER_WINDOW], chunksize=64)
+
+
+def render_families(families: list[dict], jobs: int = None) -> list[tuple[str, str]]:
+    """Render every file of every family into memory (for checks and tests)."""
+    return list(iter_rendered([job for family in families for job in expand_family(family)], jobs))
+
+
+# ─── streaming writes ────────────────────────────────────────────────────────
+
+class StreamWriter:
+    """Feeds rendered files to a StagedWrites through a bounded queue and I/O threads.
+
+    put() blocks while `queue_size` files are waiting, so memory stays flat
+    however large the catalog is. The threads compare each file against the
+    one on disk and stage the changed ones; nothing in the project changes
+    until the caller commits the transaction, which moves every staged file
+    into place in one os.replace burst. close() drains the queue and
+    re-raises the first error a writer hit.
+    """
+
+    def __init__(self, staged: StagedWrites, overwrite: bool = True,
+                 workers: int = WRITE_WORKERS, queue_size: int = WRITE_QUEUE_SIZE):
+        self.staged = staged
+        self.overwrite = overwrite
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._threads = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    def put(self, path: str, content: str):
+        if self._error:
+            raise self._error
+        self._queue.put((path, content))
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                if not self._error:
+                    self.staged.stage(*item, overwrite=self.overwrite)
+            except Exception as e:
+                self._error = e
+
+    def close(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join()
+        if self._error:
+            raise self._error
+
+
+# ─── main ────────────────────────────────────────────────────────────────────
+
+def main(families: list[dict]):
+    """Shared CLI: validate the families, render and stage every file, then commit."""
+    apply = "--apply" in sys.argv
+    force = "--force" in sys.argv
+    jobs = int(arg_value("jobs", "0")) or None
+    mode = "APPLYING" if apply else "DRY RUN"
+    if force:
+        mode += " (FORCE OVERWRITE)"
+    print(f"=== {mode} ===\n")
+
+    errors = [e for family in families for e in validate_family(family)]
+    for error in errors:
+        print(f"  ERROR {error}")
+    if errors:
+        print(f"\n{len(errors)} error(s) — nothing written.")
+        sys.exit(1)
+
+    work = [job for family in families for job in expand_family(family)]
+    duplicates = sorted(p for p, n in Counter(map(item_path, work)).items() if n > 1)
+    if duplicates:
+        for path in duplicates:
+            print(f"  ERROR two items render to {path}")
+        sys.exit(1)
+
+    with StagedWrites(Path(sys.argv[0]).stem, apply) as staged:
+        writer = StreamWriter(staged, overwrite=force)
+        try:
+            for path, content in iter_rendered(work, jobs):
+                writer.put(path, content)
+        finally:
+            writer.close()
+        staged.commit()
+    staged.report(ITEMS_DIR)
+    if not apply:
+        print("\nRun with --apply to write files.")
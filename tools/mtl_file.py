@@ -0,0 +1,51 @@
+"""Shared Wavefront .mtl reader for the model tools (texture maps per material).
+
+Exported .mtl files often carry the exporter's absolute Windows path, spaces
+included (map_Kd C:\\Users\\...\\Vedia Games\\...\\x.png); such a map falls
+back to its file name next to the .mtl, where the textures are shipped.
+
+    for material, keyword, raw, path in read_mtl_maps(mtl_path):
+        ...                                # path is None if nothing resolves
+"""
+
+from pathlib import Path, PureWindowsPath
+
+
+def map_file_name(value: str) -> str:
+    """The file part of a map_* statement's arguments.
+
+    Map options (-bm 0.5, -clamp on, ...) come before the file name, which
+    may contain spaces.
+    """
+    raw = value.strip()
+    if raw.startswith("-"):
+        raw = raw.split()[-1]
+    return raw
+
+
+def resolve_map(mtl_path: Path, raw: str) -> Path | None:
+    """The texture file a map path points at, relative to the .mtl, or None."""
+    for candidate in (mtl_path.parent / raw, mtl_path.parent / PureWindowsPath(raw).name):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def read_mtl_maps(mtl_path: Path) -> list[tuple[str | None, str, str, Path | None]]:
+    """[(material, map keyword, raw path, resolved file or None)] of a .mtl."""
+    maps = []
+    if not mtl_path.exists():
+        return maps
+    material = None
+    with open(mtl_path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            parts = line.split(None, 1)
+            if len(parts) < 2:
+                continue
+            keyword, value = parts
+            if keyword == "newmtl":
+                material = value.strip()
+            elif keyword.startswith("map_"):
+                raw = map_file_name(value)
+                maps.append((material, keyword, raw, resolve_map(mtl_path, raw)))
+    return maps
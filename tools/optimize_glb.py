@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""Optimise GLB index and vertex buffers for the GPU.
+
+For every triangle primitive:
+  1. weld   — vertices whose stored attributes are all identical are merged
+  2. cache  — triangles are reordered for post-transform vertex cache
+              locality (Tipsify: fan around the most recently used vertex,
+              jump back along a dead-end stack when a fan runs out)
+  3. overdraw — the clusters Tipsify produces are sorted so outward-facing
+              geometry is drawn first and occludes what is behind it
+  4. fetch  — vertices are renumbered in first-use order so the vertex
+              fetch walks memory linearly; unreferenced vertices are dropped
+
+Primitives that share one vertex buffer (e.g. one primitive per material)
+are welded and renumbered together. Primitives whose vertex data is
+partially shared, or that have morph targets, only get steps 2 and 3.
+
+ACMR (average cache miss ratio: transformed vertices per triangle, 0.5 is
+the ideal for large regular meshes, 3.0 the worst) is reported for a FIFO
+cache of CACHE_SIZE entries before and after.
+
+Usage:
+    python tools/optimize_glb.py                        # dry run over assets/models
+    python tools/optimize_glb.py --apply                # rewrite GLBs in place
+    python tools/optimize_glb.py --no-overdraw          # cache order only
+    python tools/optimize_glb.py path/a.glb some/dir    # specific files / folders
+"""
+
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+from pygltflib import GLTF2
+
+from glb_mesh import (
+    ARRAY_BUFFER, ELEMENT_ARRAY_BUFFER, UNSIGNED_SHORT, UNSIGNED_INT,
+    GlbEditor, glb_size, is_rewritable, load_glb, primitive_attributes,
+    read_accessor, read_accessor_float, read_indices,
+)
+from quantize_glb import collect_glb_paths
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+CACHE_SIZE = 16           # FIFO entries assumed by the reorder and the ACMR report
+TRIANGLES = 4             # glTF primitive mode
+MAX_UINT16_INDEX = 65535
+
+
+# ──────────────────────────────────────────────
+#  Index-buffer algorithms (pure NumPy / Python)
+# ──────────────────────────────────────────────
+
+def cache_misses(indices: np.ndarray, cache_size: int = CACHE_SIZE) -> int:
+    """Number of vertex transforms for `indices` with a FIFO cache of `cache_size`."""
+    stamp = {}
+    clock = 0
+    misses = 0
+    for v in indices.tolist():
+        t = stamp.get(v)
+        if t is None or clock - t > cache_size:
+            stamp[v] = clock
+            clock += 1
+            misses += 1
+    return misses
+
+
+def acmr(indices: np.ndarray, cache_size: int = CACHE_SIZE) -> float:
+    """Average cache miss ratio (transformed vertices per triangle)."""
+    tris = len(indices) // 3
+    return cache_misses(indices, cache_size) / tris if tris else 0.0
+
+
+def weld_vertices(attrs: dict, indices: np.ndarray):
+    """Merge vertices whose values match in every attribute.
+
+    `attrs` maps semantic -> (count, components) array in stored type.
+    Returns (welded attrs, remapped indices). Vertex order follows first
+    occurrence, so an already-welded mesh comes back unchanged.
+    """
+    count = len(next(iter(attrs.values())))
+    columns = [np.ascontiguousarray(a).reshape(count, -1).view(np.uint8).reshape(count, -1)
+               for a in attrs.values()]
+    packed = np.ascontiguousarray(np.hstack(columns))
+    keys = packed.view(np.dtype((np.void, packed.shape[1]))).ravel()
+    _unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    remap = rank[inverse.ravel()]
+    keep = first[order]
+    welded = {k: a[keep] for k, a in attrs.items()}
+    return welded, remap[indices].astype(np.uint32)
+
+
+def tipsify(indices: np.ndarray, vertex_count: int, cache_size: int = CACHE_SIZE):
+    """Reorder triangles for vertex cache locality (Sander et al. 2007).
+
+    Returns (reordered indices, cluster start offsets in triangles). A new
+    cluster starts wherever the fan walk had to jump to a vertex outside
+    the cache, so clusters can be reordered without hurting the cache.
+    """
+    tris = indices.reshape(-1, 3)
+    tri_count = len(tris)
+    if not tri_count:
+        return indices.copy(), [0]
+
+    flat = tris.ravel()
+    valence = np.bincount(flat, minlength=vertex_count)
+    offsets = np.concatenate([[0], np.cumsum(valence)]).tolist()
+    adjacency = (np.argsort(flat, kind="stable") // 3).tolist()
+    tri_list = tris.tolist()
+
+    live = valence.tolist()
+    cache_time = [0] * vertex_count
+    emitted = bytearray(tri_count)
+    dead_end = []
+    out = []
+    clusters = [0]
+    clock = cache_size + 1
+    cursor = 0
+    fan = int(flat[0])
+
+    while fan >= 0:
+        candidates = []
+        for t in adjacency[offsets[fan]:offsets[fan + 1]]:
+            if emitted[t]:
+                continue
+            emitted[t] = 1
+            for v in tri_list[t]:
+                out.append(v)
+                dead_end.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if clock - cache_time[v] > cache_size:
+                    cache_time[v] = clock
+                    clock += 1
+
+        # Next fan: the candidate that stays in cache longest while we finish it
+        fan = -1
+        best = -1
+        for v in candidates:
+            if live[v] <= 0:
+                continue
+            priority = 0
+            age = clock - cache_time[v]
+            if age + 2 * live[v] <= cache_size:
+                priority = age
+            if priority > best:
+                best = priority
+                fan = v
+        if fan >= 0:
+            continue
+
+        # Dead end: go back to a recent vertex, else to the next unfinished one
+        while dead_end:
+            v = dead_end.pop()
+            if live[v] > 0:
+                fan = v
+                break
+        else:
+            while cursor < vertex_count and live[cursor] <= 0:
+                cursor += 1
+            fan = cursor if cursor < vertex_count else -1
+        if fan >= 0 and clock - cache_time[fan] > cache_size:
+            clusters.append(len(out) // 3)
+
+    return np.asarray(out, dtype=np.uint32), clusters
+
+
+def sort_clusters_for_overdraw(indices: np.ndarray, positions: np.ndarray, clusters: list):
+    """Draw outward-facing clusters first (view-independent overdraw ordering).
+
+    Each cluster is scored by how far its centroid lies along its own
+    average normal from the mesh centroid; higher scores are drawn first.
+    """
+    if len(clusters) < 2:
+        return indices
+    tris = indices.reshape(-1, 3)
+    p0, p1, p2 = (positions[tris[:, i]].astype(np.float64) for i in range(3))
+    cross = np.cross(p1 - p0, p2 - p0)              # area-weighted normals (x2)
+    area = np.linalg.norm(cross, axis=1)
+    centroid = (p0 + p1 + p2) / 3.0
+
+    total_area = area.sum()
+    if total_area <= 0:
+        return indices
+    mesh_centroid = (centroid * area[:, None]).sum(axis=0) / total_area
+
+    starts = np.asarray(clusters)
+    c_area = np.add.reduceat(area, starts)
+    c_normal = np.add.reduceat(cross, starts, axis=0)
+    c_centroid = np.add.reduceat(centroid * area[:, None], starts, axis=0)
+    c_centroid /= np.maximum(c_area, 1e-20)[:, None]
+    c_normal /= np.maximum(np.linalg.norm(c_normal, axis=1), 1e-20)[:, None]
+    score = ((c_centroid - mesh_centroid) * c_normal).sum(axis=1)
+
+    ends = np.append(starts[1:], len(tris))
+    order = np.argsort(-score, kind="stable")
+    return np.concatenate([tris[starts[c]:ends[c]] for c in order]).ravel()
+
+
+def fetch_order(index_lists: list, vertex_count: int):
+    """First-use vertex order over one or more index buffers.
+
+    Returns (old vertex index for each new slot, old -> new remap array).
+    Vertices never referenced are dropped.
+    """
+    flat = np.concatenate(index_lists) if index_lists else np.zeros(0, np.uint32)
+    used, first = np.unique(flat, return_index=True)
+    new_to_old = used[np.argsort(first, kind="stable")]
+    remap = np.zeros(vertex_count, dtype=np.uint32)
+    remap[new_to_old] = np.arange(len(new_to_old), dtype=np.uint32)
+    return new_to_old, remap
+
+
+def optimize_indices(indices: np.ndarray, vertex_count: int, positions: np.ndarray = None,
+                     overdraw: bool = True) -> np.ndarray:
+    """Cache-order (and, given positions, overdraw-sort) one triangle list."""
+    indices = indices[:len(indices) - len(indices) % 3]
+    ordered, clusters = tipsify(indices, vertex_count)
+    if overdraw and positions is not None:
+        ordered = sort_clusters_for_overdraw(ordered, positions, clusters)
+    return ordered
+
+
+# ──────────────────────────────────────────────
+#  GLB pass
+# ──────────────────────────────────────────────
+
+def _eligible(prim) -> bool:
+    return (prim.mode in (None, TRIANGLES)
+            and prim.attributes.POSITION is not None
+            and not prim.targets)
+
+
+def vertex_groups(gltf: GLTF2):
+    """Group eligible primitives by identical vertex attributes.
+
+    Returns [(attrs, [primitives], exclusive)] where `exclusive` means no
+    other primitive touches any of the group's vertex accessors, so the
+    vertices may be welded and renumbered.
+    """
+    groups = defaultdict(list)
+    users = defaultdict(set)
+    for mesh in gltf.meshes or []:
+        for prim in mesh.primitives:
+            key = tuple(sorted(primitive_attributes(prim).items()))
+            if _eligible(prim):
+                groups[key].append(prim)
+            else:
+                key = ("ineligible", id(prim))
+            for _semantic, acc in primitive_attributes(prim).items():
+                users[acc].add(key)
+
+    return [
+        (dict(key), prims, all(len(users[acc]) == 1 for _s, acc in key))
+        for key, prims in groups.items()
+    ]
+
+
+def _write_indices(editor: GlbEditor, indices: np.ndarray, vertex_count: int) -> int:
+    comp = UNSIGNED_SHORT if vertex_count <= MAX_UINT16_INDEX else UNSIGNED_INT
+    return editor.add_accessor(indices, comp, "SCALAR", target=ELEMENT_ARRAY_BUFFER, bounds=True)
+
+
+def optimize_gltf(gltf: GLTF2, overdraw: bool = True) -> dict:
+    """Weld and reorder every triangle primitive in-place. Returns a stats dict."""
+    stats = {"primitives": 0, "triangles": 0, "vertices_before": 0, "vertices_after": 0,
+             "misses_before": 0, "misses_after": 0}
+    if not is_rewritable(gltf):
+        return stats
+
+    editor = GlbEditor(gltf)
+    for attrs, prims, exclusive in vertex_groups(gltf):
+        vertex_count = gltf.accessors[attrs["POSITION"]].count
+        index_lists = [read_indices(gltf, p) for p in prims]
+        index_lists = [idx[:len(idx) - len(idx) % 3] for idx in index_lists]
+        for idx in index_lists:
+            stats["misses_before"] += cache_misses(idx)
+            stats["triangles"] += len(idx) // 3
+        stats["primitives"] += len(prims)
+        stats["vertices_before"] += vertex_count
+
+        if exclusive:
+            data = {k: read_accessor(gltf, a) for k, a in attrs.items()}
+            offsets = np.cumsum([0] + [len(i) for i in index_lists])
+            welded, merged = weld_vertices(data, np.concatenate(index_lists))
+            index_lists = [merged[offsets[i]:offsets[i + 1]] for i in range(len(prims))]
+            vertex_count = len(welded["POSITION"])
+            positions = welded["POSITION"].astype(np.float32)
+        else:
+            positions = read_accessor_float(gltf, attrs["POSITION"])
+
+        index_lists = [optimize_indices(idx, vertex_count, positions, overdraw)
+                       for idx in index_lists]
+
+        if exclusive:
+            new_to_old, remap = fetch_order(index_lists, vertex_count)
+            index_lists = [remap[idx] for idx in index_lists]
+            vertex_count = len(new_to_old)
+            new_attrs = {}
+            for semantic, acc_idx in attrs.items():
+                acc = gltf.accessors[acc_idx]
+                new_attrs[semantic] = editor.add_accessor(
+                    welded[semantic][new_to_old], acc.componentType, acc.type,
+                    target=ARRAY_BUFFER, normalized=bool(acc.normalized),
+                    bounds=semantic == "POSITION",
+                )
+            for prim in prims:
+                for semantic, acc_idx in new_attrs.items():
+                    setattr(prim.attributes, semantic, acc_idx)
+
+        for prim, idx in zip(prims, index_lists):
+            prim.indices = _write_indices(editor, idx, vertex_count)
+            stats["misses_after"] += cache_misses(idx)
+        stats["vertices_after"] += vertex_count
+
+    if stats["primitives"]:
+        editor.finish()
+    return stats
+
+
+def _acmr_text(misses: int, tris: int) -> str:
+    return f"{misses / tris:.3f}" if tris else "-"
+
+
+# ──────────────────────────────────────────────
+#  Main
+# ──────────────────────────────────────────────
+
+def _rel(path: Path) -> str:
+    try:
+        return str(path.resolve().relative_to(PROJECT_ROOT))
+    except ValueError:
+        return str(path)
+
+
+def main():
+    apply = "--apply" in sys.argv
+    overdraw = "--no-overdraw" not in sys.argv
+    targets = [a for a in sys.argv[1:] if not a.startswith("--")]
+    mode = "APPLYING" if apply else "DRY RUN"
+    print(f"=== {mode} ===\n")
+
+    totals = defaultdict(int)
+    changed = 0
+
+    for path in collect_glb_paths(targets):
+        before = os.path.getsize(path)
+        try:
+            gltf = load_glb(str(path))
+            stats = optimize_gltf(gltf, overdraw)
+        except Exception as e:
+            print(f"  ERROR {_rel(path)}: {e}")
+            continue
+
+        if not stats["primitives"]:
+            print(f"  SKIP  {_rel(path)} (no triangle primitives)")
+            continue
+        if (stats["misses_after"] >= stats["misses_before"]
+                and stats["vertices_after"] >= stats["vertices_before"]):
+            print(f"  SKIP  {_rel(path)} (already optimal, ACMR "
+                  f"{_acmr_text(stats['misses_before'], stats['triangles'])})")
+            continue
+
+        for key, value in stats.items():
+            totals[key] += value
+        if apply:
+            gltf.save_binary(str(path))
+        changed += 1
+
+        after = glb_size(gltf)
+        print(f"  {_rel(path)}: {stats['triangles']} tris, "
+              f"verts {stats['vertices_before']} -> {stats['vertices_after']}, "
+              f"ACMR {_acmr_text(stats['misses_before'], stats['triangles'])} -> "
+              f"{_acmr_text(stats['misses_after'], stats['triangles'])}, "
+              f"{before / 1024:.1f} KB -> {after / 1024:.1f} KB")
+
+    if changed:
+        print(f"\n{'Optimised' if apply else 'Would optimise'}: {changed} files, "
+              f"{totals['triangles']} tris, "
+              f"verts {totals['vertices_before']} -> {totals['vertices_after']}, "
+              f"ACMR {_acmr_text(totals['misses_before'], totals['triangles'])} -> "
+              f"{_acmr_text(totals['misses_after'], totals['triangles'])} "
+              f"(FIFO {CACHE_SIZE})")
+    else:
+        print("\nNothing to optimise.")
+
+    if not apply:
+        print("\nRun with --apply to write files.")
+
+
+if __name__ == "__main__":
+    main()
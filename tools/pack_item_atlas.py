@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""Pack item icons into power-of-two atlas pages with Godot AtlasTextures.
+
+Reads every icon referenced by data/items/**/*.tres, packs the distinct
+sprites into as few pages as possible (MaxRects, best-short-side-fit),
+each sprite surrounded by PADDING px of extruded edge texels. Every sprite
+is colour-bled PADDING texels into its own transparent margin before it is
+blitted, so filtering never pulls in black fringes. Pages are trimmed to
+the smallest power-of-two size that holds their content.
+
+Output (assets/sprites/atlas/):
+    items_atlas_<n>.png          the pages
+    items/<sprite>.tres          one AtlasTexture per icon (filter_clip on)
+    items_atlas.json             manifest: source res:// path -> page + region
+
+An AtlasTexture is a Texture2D, so an item's `icon` can point at it
+directly; --link-items rewrites the item .tres icon references to do that.
+Linked icons are read back to their source sprite through the manifest, so
+the source PNGs stay the input of every later run.
+
+Usage:
+    python tools/pack_item_atlas.py                       # dry run: pages, fill, memory
+    python tools/pack_item_atlas.py --apply               # write pages, .tres and manifest
+    python tools/pack_item_atlas.py --apply --link-items  # also repoint item icons
+    python tools/pack_item_atlas.py --max-size=1024       # smaller pages
+"""
+
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from detect_sprite_shapes import ATLAS_MANIFEST, scan_item_tres_files
+from sprite_image import alpha_bleed, load_rgba, save_rgba
+from tool_cache import arg_value
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+ATLAS_DIR = ATLAS_MANIFEST.parent
+ATLAS_RES = "res://assets/sprites/atlas"
+PAGE_PREFIX = "items_atlas_"
+MANIFEST_NAME = ATLAS_MANIFEST.name
+IMAGE_EXTENSIONS = {".png", ".webp", ".jpg", ".jpeg"}
+
+MAX_PAGE_SIZE = 2048
+PADDING = 2               # px of extruded border around every sprite
+BYTES_PER_TEXEL = 4       # RGBA8, uncompressed (compress/mode=0 on item sprites)
+
+
+# ─── packing ──────────────────────────────────────────────────────────────────
+
+class MaxRectsPage:
+    """One atlas page packed with the MaxRects best-short-side-fit heuristic."""
+
+    def __init__(self, width: int, height: int):
+        self.free = [(0, 0, width, height)]
+        self.placed = []  # (x, y, w, h) including padding
+
+    def insert(self, w: int, h: int):
+        """Place a w x h rect; return (x, y) or None if it does not fit."""
+        best = None
+        for fx, fy, fw, fh in self.free:
+            if w <= fw and h <= fh:
+                short_side = min(fw - w, fh - h)
+                long_side = max(fw - w, fh - h)
+                score = (short_side, long_side, fy, fx)
+                if best is None or score < best[0]:
+                    best = (score, fx, fy)
+        if best is None:
+            return None
+        _score, x, y = best
+        self._split(x, y, w, h)
+        self.placed.append((x, y, w, h))
+        return x, y
+
+    def _split(self, x, y, w, h):
+        new_free = []
+        for fx, fy, fw, fh in self.free:
+            if x >= fx + fw or x + w <= fx or y >= fy + fh or y + h <= fy:
+                new_free.append((fx, fy, fw, fh))
+                continue
+            if x > fx:
+                new_free.append((fx, fy, x - fx, fh))
+            if x + w < fx + fw:
+                new_free.append((x + w, fy, fx + fw - x - w, fh))
+            if y > fy:
+                new_free.append((fx, fy, fw, y - fy))
+            if y + h < fy + fh:
+                new_free.append((fx, y + h, fw, fy + fh - y - h))
+        # Drop free rects contained in another one
+        self.free = [
+            a for i, a in enumerate(new_free)
+            if not any(i != j and _contains(b, a) and (b != a or j < i)
+                       for j, b in enumerate(new_free))
+        ]
+
+    def used_size(self) -> tuple[int, int]:
+        """Smallest power-of-two (width, height) covering every placed rect."""
+        right = max((x + w for x, _y, w, _h in self.placed), default=1)
+        bottom = max((y + h for _x, y, _w, h in self.placed), default=1)
+        return _next_pow2(right), _next_pow2(bottom)
+
+
+def _contains(outer, inner) -> bool:
+    ox, oy, ow, oh = outer
+    ix, iy, iw, ih = inner
+    return ix >= ox and iy >= oy and ix + iw <= ox + ow and iy + ih <= oy + oh
+
+
+def _next_pow2(n: int) -> int:
+    p = 1
+    while p < n:
+        p *= 2
+    return p
+
+
+def pack(sizes: dict, page_size: tuple[int, int], padding: int = PADDING):
+    """Pack {key: (w, h)} into pages of page_size = (width, height).
+
+    Returns (pages, placements, oversized) where placements maps key ->
+    (page index, x, y) of the sprite itself (inside its padding) and
+    oversized lists keys that cannot fit on any page.
+    """
+    pages = []
+    placements = {}
+    oversized = []
+    order = sorted(sizes, key=lambda k: (-max(sizes[k]), -sizes[k][0] * sizes[k][1], k))
+    for key in order:
+        w, h = sizes[key]
+        pw, ph = w + 2 * padding, h + 2 * padding
+        if pw > page_size[0] or ph > page_size[1]:
+            oversized.append(key)
+            continue
+        for index, page in enumerate(pages):
+            pos = page.insert(pw, ph)
+            if pos:
+                break
+        else:
+            pages.append(MaxRectsPage(*page_size))
+            index = len(pages) - 1
+            pos = pages[index].insert(pw, ph)
+        placements[key] = (index, pos[0] + padding, pos[1] + padding)
+    return pages, placements, oversized
+
+
+def pack_smallest(sizes: dict, max_size: int = MAX_PAGE_SIZE, padding: int = PADDING):
+    """Try every power-of-two page size up to max_size and keep the packing
+    with the least texture memory (then the fewest pages)."""
+    fits_max = {k: s for k, s in sizes.items()
+                if s[0] + 2 * padding <= max_size and s[1] + 2 * padding <= max_size}
+    largest = max((max(s) + 2 * padding for s in fits_max.values()), default=1)
+    candidates = []
+    side = _next_pow2(largest)
+    dims = []
+    while side <= max_size:
+        dims.append(side)
+        side *= 2
+    for width in dims:
+        for height in dims:
+            pages, placements, oversized = pack(sizes, (width, height), padding)
+            if len(oversized) > len(sizes) - len(fits_max):
+                continue
+            texels = sum(pw * ph for pw, ph in (p.used_size() for p in pages))
+            candidates.append(((texels, len(pages), -width), (pages, placements, oversized)))
+    if not candidates:
+        return pack(sizes, (max_size, max_size), padding)
+    return min(candidates, key=lambda c: c[0])[1]
+
+
+def render_page(size: tuple[int, int], sprites: list, padding: int = PADDING) -> np.ndarray:
+    """Compose one page from [(rgba, x, y)], each sprite bled `padding` texels
+    into its transparent margin; the gaps between blocks stay empty."""
+    width, height = size
+    page = np.zeros((height, width, 4), dtype=np.uint8)
+    for rgba, x, y in sprites:
+        h, w = rgba.shape[:2]
+        block = np.pad(alpha_bleed(rgba, passes=padding),
+                       ((padding, padding), (padding, padding), (0, 0)), mode="edge")
+        page[y - padding:y + h + padding, x - padding:x + w + padding] = block
+    return page
+
+
+# ─── Godot output ─────────────────────────────────────────────────────────────
+
+def atlas_texture_tres(page_res: str, region: tuple) -> str:
+    x, y, w, h = region
+    return (
+        '[gd_resource type="AtlasTexture" load_steps=2 format=3]\n'
+        "\n"
+        f'[ext_resource type="Texture2D" path="{page_res}" id="1_atlas"]\n'
+        "\n"
+        "[resource]\n"
+        'atlas = ExtResource("1_atlas")\n'
+        f"region = Rect2({x}, {y}, {w}, {h})\n"
+        "filter_clip = true\n"
+    )
+
+
+def atlas_names(sprite_res_paths: list) -> dict:
+    """Stable .tres file name per sprite (stem, prefixed by folder on clashes)."""
+    by_stem = {}
+    for res in sprite_res_paths:
+        by_stem.setdefault(Path(res).stem, []).append(res)
+    names = {}
+    for stem, paths in by_stem.items():
+        for res in paths:
+            if len(paths) == 1:
+                names[res] = stem
+            else:
+                names[res] = f"{Path(res).parent.name}_{stem}"
+    return names
+
+
+def link_items(items: list, tres_for_sprite: dict, apply: bool) -> int:
+    """Repoint item icon ext_resources at the generated AtlasTextures.
+
+    Matches the path the .tres references now, so already linked icons
+    follow a renamed AtlasTexture and are otherwise left alone.
+    """
+    changed = 0
+    for item in items:
+        target = tres_for_sprite.get(item["sprite_res_path"])
+        if not target or target == item["icon_res_path"]:
+            continue
+        path = item["tres_path"]
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+        pattern = re.compile(
+            r'(\[ext_resource type="Texture2D"[^\]]*?)'
+            r'(?: uid="[^"]*")?( path=")' + re.escape(item["icon_res_path"]) + '"'
+        )
+        new_content = pattern.sub(lambda m: f'{m.group(1)}{m.group(2)}{target}"', content)
+        if new_content != content:
+            changed += 1
+            if apply:
+                with open(path, "w", encoding="utf-8", newline="\n") as f:
+                    f.write(new_content)
+    return changed
+
+
+# ─── main ─────────────────────────────────────────────────────────────────────
+
+def main():
+    apply = "--apply" in sys.argv
+    link = "--link-items" in sys.argv
+    max_size = int(arg_value("max-size", str(MAX_PAGE_SIZE)))
+    mode = "APPLYING" if apply else "DRY RUN"
+    print(f"=== {mode} ===\n")
+
+    items = scan_item_tres_files(str(DATA_DIR))
+    sprite_res_paths = sorted({it["sprite_res_path"] for it in items
+                               if it["sprite_res_path"].startswith("res://")})
+    images = {}
+    for res in sprite_res_paths:
+        path = PROJECT_ROOT / res.replace("res://", "")
+        if path.suffix.lower() not in IMAGE_EXTENSIONS:
+            print(f"  SKIP  {res} (not an image; missing from {_rel(ATLAS_MANIFEST)}?)")
+        elif path.exists():
+            images[res] = load_rgba(path)
+        else:
+            print(f"  MISSING {res}")
+
+    sizes = {res: (img.shape[1], img.shape[0]) for res, img in images.items()}
+    pages, placements, oversized = pack_smallest(sizes, max_size)
+    names = atlas_names(list(placements))
+
+    manifest = {"pages": [], "regions": {}}
+    page_sprites = [[] for _ in pages]
+    for res, (index, x, y) in placements.items():
+        w, h = sizes[res]
+        page_sprites[index].append((images[res], x, y))
+        manifest["regions"][res] = {
+            "page": index,
+            "region": [x, y, w, h],
+            "atlas_texture": f"{ATLAS_RES}/items/{names[res]}.tres",
+        }
+
+    before_bytes = sum(w * h for w, h in sizes.values()) * BYTES_PER_TEXEL
+    after_bytes = sum(sizes[r][0] * sizes[r][1] for r in oversized) * BYTES_PER_TEXEL
+    for index, page in enumerate(pages):
+        pw, ph = page.used_size()
+        used = sum(w * h for res, (i, _x, _y) in placements.items() if i == index
+                   for w, h in [sizes[res]])
+        after_bytes += pw * ph * BYTES_PER_TEXEL
+        page_res = f"{ATLAS_RES}/{PAGE_PREFIX}{index}.png"
+        manifest["pages"].append({"path": page_res, "size": [pw, ph]})
+        print(f"  page {index}: {pw}x{ph}, {len(page_sprites[index])} sprites, "
+              f"{used / (pw * ph):.0%} filled")
+    for res in oversized:
+        print(f"  SKIP  {res} ({sizes[res][0]}x{sizes[res][1]} exceeds {max_size} px page)")
+
+    print(f"\nIcons: {len(images)} textures -> {len(pages)} page(s)"
+          f"{f' + {len(oversized)} standalone' if oversized else ''}")
+    print(f"Memory (RGBA8): {before_bytes / 1024:.0f} KB -> {after_bytes / 1024:.0f} KB")
+
+    tres_for_sprite = {res: entry["atlas_texture"] for res, entry in manifest["regions"].items()}
+    if link:
+        changed = link_items(items, tres_for_sprite, apply)
+        print(f"Item icons {'relinked' if apply else 'to relink'}: {changed} .tres files")
+
+    if not apply:
+        print("\nRun with --apply to write files.")
+        return
+
+    items_dir = ATLAS_DIR / "items"
+    items_dir.mkdir(parents=True, exist_ok=True)
+    written_pages = set()
+    for index, page in enumerate(pages):
+        page_path = ATLAS_DIR / f"{PAGE_PREFIX}{index}.png"
+        save_rgba(render_page(page.used_size(), page_sprites[index]), page_path)
+        written_pages.add(page_path.name)
+
+    written_tres = set()
+    for res, entry in manifest["regions"].items():
+        page_res = manifest["pages"][entry["page"]]["path"]
+        tres_path = items_dir / f"{names[res]}.tres"
+        with open(tres_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(atlas_texture_tres(page_res, tuple(entry["region"])))
+        written_tres.add(tres_path.name)
+
+    with open(ATLAS_DIR / MANIFEST_NAME, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+    # Remove pages / AtlasTextures left over from a previous, larger packing
+    for fname in os.listdir(ATLAS_DIR):
+        if fname.startswith(PAGE_PREFIX) and fname.endswith(".png") and fname not in written_pages:
+            os.remove(ATLAS_DIR / fname)
+    for fname in os.listdir(items_dir):
+        if fname.endswith(".tres") and fname not in written_tres:
+            os.remove(items_dir / fname)
+
+    print(f"\nWritten: {len(pages)} page(s), {len(written_tres)} AtlasTextures, "
+          f"{_rel(ATLAS_DIR / MANIFEST_NAME)}")
+
+
+def _rel(path: Path) -> str:
+    return path.relative_to(PROJECT_ROOT).as_posix()
+
+
+if __name__ == "__main__":
+    main()
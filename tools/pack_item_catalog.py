@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Compile every ItemData .tres into one packed item catalog.
+
+ItemDatabase loads ~700 item resources one by one at boot, each pulling in
+its script, shape, skills and status effects. This build step flattens the
+same directories into two files that the game can read in one go:
+
+    data/catalog/items.jsonl        one JSON object per item, sorted by id
+    data/catalog/items.index.json   {"version", "count", "hash", "source_hash",
+                                     "offsets": {id: [byte offset, byte length]}}
+
+A record holds the item's stored properties in .tres order (defaults are
+left out, as in the .tres) plus "path", its res:// file:
+  - ExtResource references become res:// paths (icon, skills, status effects)
+  - sub_resources are inlined without their script (stat_modifiers become
+    [{"stat": 5, "value": 7.0}, ...])
+  - Vector2i and other constructors become plain lists
+  - the shape also gets "shape_cells", read from the shape .tres
+
+The index lets a reader seek straight to one record. "hash" is the SHA-1 of
+items.jsonl (compare it to detect a half-copied or mismatched pair);
+"source_hash" covers every item and shape file the catalog was built from,
+so --check can tell that data/ changed since the last build. Items are
+parsed once and cached in tools/.cache, so a rebuild after editing a few
+items only re-parses those.
+
+Non-resource files are only exported when the preset's include_filter
+lists them (e.g. "data/catalog/*").
+
+Usage:
+    python tools/pack_item_catalog.py             # dry run: what would change
+    python tools/pack_item_catalog.py --apply     # write the catalog
+    python tools/pack_item_catalog.py --check     # exit 1 if the catalog is stale
+    python tools/pack_item_catalog.py --no-cache  # reparse every item
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import tres_document
+from staged_writes import StagedWrites
+from tool_cache import FileCache, cache_key
+from tres_document import Call, ExtResource, SubResource, TypedArray
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CATALOG_DIR = PROJECT_ROOT / "data" / "catalog"
+RECORDS_NAME = "items.jsonl"
+INDEX_NAME = "items.index.json"
+SHAPES_DIR = PROJECT_ROOT / "data" / "shapes"
+
+# Same directories, same order as ItemDatabase.ITEM_DIRS (not recursive)
+ITEM_DIRS = ["weapons", "armor", "consumables", "modifiers", "blueprints", "jewelry"]
+
+# Bump when the record layout changes (also invalidates the parse cache)
+CATALOG_VERSION = 1
+
+
+# ─── records ─────────────────────────────────────────────────────────────────
+
+def _plain(value, doc: tres_document.TresDocument):
+    """A parsed .tres value as JSON-ready data."""
+    if isinstance(value, ExtResource):
+        return doc.ext_path(value)
+    if isinstance(value, SubResource):
+        section = next((s for s in doc.sub_resources if s.id == value.id), None)
+        if section is None:
+            return None
+        return {k: _plain(v, doc) for k, v in section.properties().items() if k != "script"}
+    if isinstance(value, (list, tuple, TypedArray, Call)):
+        return [_plain(v, doc) for v in value]
+    if isinstance(value, dict):
+        return {str(_plain(k, doc)): _plain(v, doc) for k, v in value.items()}
+    if isinstance(value, str):
+        return str(value)  # StringName
+    return value
+
+
+def item_record(path_str: str) -> dict | None:
+    """The catalog record of one item file, or None if it is not an ItemData."""
+    path = Path(path_str)
+    doc = tres_document.load(path)
+    if doc.script_class != "ItemData":
+        return None
+    record = {k: _plain(v, doc) for k, v in doc.resource.properties().items() if k != "script"}
+    if not record.get("id"):
+        record["id"] = path.stem  # ResourceLoaderHelper does the same
+    record["path"] = f"res://{cache_key(path)}"
+    return record
+
+
+def load_shapes() -> dict:
+    """{shape res:// path: [[x, y], ...]}"""
+    shapes = {}
+    for path in tres_document.iter_tres(SHAPES_DIR):
+        doc = tres_document.load(path)
+        shapes[f"res://{cache_key(path)}"] = _plain(doc.resource.get("cells", []), doc)
+    return shapes
+
+
+def replaces(kept: str, new: str) -> bool:
+    """Whether res:// path `new` replaces `kept` for the same id.
+
+    As in ResourceLoaderHelper.load_dirs(): load_dir() keeps the later file
+    within one directory, and merge() keeps the first directory's entry.
+    """
+    return kept.rsplit("/", 1)[0] == new.rsplit("/", 1)[0]
+
+
+def item_files() -> list[Path]:
+    files = []
+    for name in ITEM_DIRS:
+        files.extend(sorted((PROJECT_ROOT / "data" / "items" / name).glob("*.tres")))
+    return files
+
+
+def build_records(files: list[Path], use_cache: bool = True) -> tuple[list[dict], str, list[str]]:
+    """(records sorted by id, source hash, warnings)."""
+    cache = FileCache("item_catalog", CATALOG_VERSION, enabled=use_cache)
+    source = hashlib.sha1()
+    by_id = {}
+    warnings = []
+    for path in files:
+        record = cache.lookup(path)
+        if record is None:
+            record = item_record(str(path)) or {}
+            cache.store(path, record)
+        source.update(f"{cache_key(path)}:{cache.digest(path)}\n".encode("utf-8"))
+        if not record:
+            continue
+        kept = by_id.get(record["id"])
+        if kept is not None:
+            warnings.append(f'duplicate id "{record["id"]}": {kept["path"]} and {record["path"]}')
+            if not replaces(kept["path"], record["path"]):
+                continue
+        by_id[record["id"]] = record
+    cache.prune(files)
+    cache.save()
+
+    shapes = load_shapes()
+    for path in tres_document.iter_tres(SHAPES_DIR):
+        source.update(f"{cache_key(path)}:{cache.digest(path)}\n".encode("utf-8"))
+
+    records = []
+    for item_id in sorted(by_id):
+        record = dict(by_id[item_id])
+        shape = record.get("shape")
+        if isinstance(shape, str):
+            if shape in shapes:
+                record["shape_cells"] = shapes[shape]
+            else:
+                warnings.append(f"{record['path']}: shape {shape} not found")
+        records.append(record)
+    return records, source.hexdigest(), warnings
+
+
+def pack(records: list[dict], source_hash: str) -> tuple[bytes, str]:
+    """(items.jsonl bytes, items.index.json text)."""
+    offsets = {}
+    lines = []
+    pos = 0
+    for record in records:
+        line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        offsets[record["id"]] = [pos, len(line)]
+        lines.append(line)
+        pos += len(line)
+    data = b"".join(lines)
+    index = {
+        "version": CATALOG_VERSION,
+        "count": len(records),
+        "hash": hashlib.sha1(data).hexdigest(),
+        "source_hash": source_hash,
+        "offsets": offsets,
+    }
+    return data, json.dumps(index, separators=(",", ":")) + "\n"
+
+
+def read_record(item_id: str, catalog_dir: Path = CATALOG_DIR) -> dict | None:
+    """One record via the index, the way a lazy reader would."""
+    with open(catalog_dir / INDEX_NAME, "r", encoding="utf-8") as f:
+        entry = json.load(f)["offsets"].get(item_id)
+    if entry is None:
+        return None
+    with open(catalog_dir / RECORDS_NAME, "rb") as f:
+        f.seek(entry[0])
+        return json.loads(f.read(entry[1]))
+
+
+def is_stale(source_hash: str, catalog_dir: Path = CATALOG_DIR) -> bool:
+    try:
+        with open(catalog_dir / INDEX_NAME, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        data = (catalog_dir / RECORDS_NAME).read_bytes()
+    except (OSError, ValueError):
+        return True
+    return (index.get("version") != CATALOG_VERSION or index.get("source_hash") != source_hash
+            or index.get("hash") != hashlib.sha1(data).hexdigest())
+
+
+# ─── main ────────────────────────────────────────────────────────────────────
+
+def main():
+    apply = "--apply" in sys.argv
+    check = "--check" in sys.argv
+    use_cache = "--no-cache" not in sys.argv
+
+    records, source_hash, warnings = build_records(item_files(), use_cache)
+    for warning in warnings:
+        print(f"  WARNING {warning}")
+
+    if check:
+        if is_stale(source_hash):
+            print(f"Item catalog is stale ({len(records)} items) — run with --apply.")
+            sys.exit(1)
+        print(f"Item catalog is up to date ({len(records)} items).")
+        return
+
+    mode = "APPLYING" if apply else "DRY RUN"
+    print(f"=== {mode} ===\n")
+    data, index = pack(records, source_hash)
+    with StagedWrites(Path(sys.argv[0]).stem, apply) as staged:
+        staged.stage(CATALOG_DIR / RECORDS_NAME, data)
+        staged.stage(CATALOG_DIR / INDEX_NAME, index)
+        staged.commit()
+    staged.report(PROJECT_ROOT)
+    print(f"Items: {len(records)}, {len(data) / 1024:.0f} KB")
+    if not apply:
+        print("\nRun with --apply to write files.")
+
+
+if __name__ == "__main__":
+    main()
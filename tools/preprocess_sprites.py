@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Trim, alpha-bleed and (optionally) premultiply sprite PNGs.
+
+Sprites are authored on full 64 px cell canvases (see detect_sprite_shapes),
+so most of every texture is transparent margin, and transparent texels are
+black, which filtering pulls into the edges as dark fringes. For each
+source sprite this tool:
+  - crops to the tight bounds of texels with alpha > 0
+  - bleeds colour BLEED_PASSES texels into the remaining transparent ones
+  - premultiplies RGB by alpha when --premultiply is given
+
+The sources are left untouched (shape detection needs the full canvas);
+results go to a mirror tree under assets/sprites/processed/ together with
+trim_manifest.json, which records for every sprite its original size and
+the trim offset + size, so the untrimmed placement can be reconstructed
+(e.g. as AtlasTexture.margin).
+
+Work runs in a process pool. Sprites whose content hash and options are
+unchanged since the last run are skipped (tools/.cache/sprite_preprocess.json).
+
+Usage:
+    python tools/preprocess_sprites.py                       # dry run over assets/sprites/items
+    python tools/preprocess_sprites.py --apply               # write processed sprites + manifest
+    python tools/preprocess_sprites.py --apply --premultiply # premultiplied alpha output
+    python tools/preprocess_sprites.py assets/sprites/ui     # other folders / files
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from sprite_image import alpha_bleed, alpha_bounds, load_rgba, premultiply, save_rgba
+from tool_cache import FileCache, cache_key
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SPRITES_DIR = PROJECT_ROOT / "assets" / "sprites"
+DEFAULT_SOURCE = SPRITES_DIR / "items"
+OUTPUT_DIR = SPRITES_DIR / "processed"
+# Generated sprite folders never taken as sources (pack_item_atlas.py pages)
+GENERATED_DIRS = [OUTPUT_DIR, SPRITES_DIR / "atlas"]
+MANIFEST_NAME = "trim_manifest.json"
+
+# Bump when the processing itself changes
+PREPROCESS_VERSION = "1"
+# Texels of colour bleed around visible content; enough for bilinear filtering
+# and a few mip levels, without flooding large empty canvases
+BLEED_PASSES = 8
+
+
+def output_path(source: Path) -> Path:
+    """Mirror location of `source` under OUTPUT_DIR."""
+    try:
+        rel = source.resolve().relative_to(SPRITES_DIR)
+    except ValueError:
+        rel = Path(source.name)
+    return OUTPUT_DIR / rel
+
+
+def process_sprite(source_str: str, out_str: str, premultiplied: bool) -> dict:
+    """Process-pool entry point: write the processed sprite, return its manifest entry."""
+    try:
+        rgba = load_rgba(source_str)
+    except Exception as e:
+        return {"error": str(e)}
+
+    height, width = rgba.shape[:2]
+    bounds = alpha_bounds(rgba)
+    entry = {"source_size": [width, height]}
+    if bounds is None:
+        entry["trim"] = None  # fully transparent: nothing to draw
+        return entry
+
+    x, y, w, h = bounds
+    trimmed = alpha_bleed(rgba[y:y + h, x:x + w], BLEED_PASSES)
+    if premultiplied:
+        trimmed = premultiply(trimmed)
+    Path(out_str).parent.mkdir(parents=True, exist_ok=True)
+    save_rgba(trimmed, out_str)
+    entry["trim"] = [x, y, w, h]
+    return entry
+
+
+def collect_pngs(args: list[str]) -> list[Path]:
+    roots = [Path(a).resolve() for a in args] or [DEFAULT_SOURCE]
+    paths = []
+    for root in roots:
+        if root.is_dir():
+            paths.extend(p for p in sorted(root.rglob("*.png"))
+                         if not any(d in p.parents for d in GENERATED_DIRS))
+        elif root.suffix.lower() == ".png":
+            paths.append(root)
+    return paths
+
+
+def main():
+    apply = "--apply" in sys.argv
+    premultiplied = "--premultiply" in sys.argv
+    targets = [a for a in sys.argv[1:] if not a.startswith("--")]
+    mode = "APPLYING" if apply else "DRY RUN"
+    print(f"=== {mode} ===\n")
+
+    sources = collect_pngs(targets)
+    cache = FileCache("sprite_preprocess",
+                      version=f"{PREPROCESS_VERSION}:{int(premultiplied)}")
+
+    manifest_path = OUTPUT_DIR / MANIFEST_NAME
+    manifest = {"premultiplied": premultiplied, "sprites": {}}
+    if manifest_path.exists():
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous.get("premultiplied") == premultiplied:
+            manifest["sprites"] = previous.get("sprites", {})
+
+    todo = []
+    skipped = 0
+    for source in sources:
+        out = output_path(source)
+        entry = cache.lookup(source)
+        if entry is not None and (entry["trim"] is None or out.exists()):
+            manifest["sprites"][f"res://{cache_key(source)}"] = entry
+            skipped += 1
+        else:
+            todo.append((source, out))
+
+    if apply and todo:
+        with ProcessPoolExecutor() as pool:
+            results = list(pool.map(process_sprite,
+                                    [str(s) for s, _o in todo],
+                                    [str(o) for _s, o in todo],
+                                    [premultiplied] * len(todo), chunksize=8))
+    else:
+        results = []
+
+    errors = 0
+    before_texels = 0
+    after_texels = 0
+    for (source, out), entry in zip(todo, results):
+        if "error" in entry:
+            print(f"  ERROR {cache_key(source)}: {entry['error']}")
+            errors += 1
+            continue
+        cache.store(source, entry)
+        manifest["sprites"][f"res://{cache_key(source)}"] = entry
+
+    if not apply:
+        # Dry run: measure only, nothing is written or cached
+        for source, _out in todo:
+            rgba = load_rgba(source)
+            bounds = alpha_bounds(rgba)
+            manifest["sprites"][f"res://{cache_key(source)}"] = {
+                "source_size": [rgba.shape[1], rgba.shape[0]],
+                "trim": list(bounds) if bounds else None,
+            }
+
+    for source in sources:
+        entry = manifest["sprites"].get(f"res://{cache_key(source)}")
+        if not entry:
+            continue
+        sw, sh = entry["source_size"]
+        before_texels += sw * sh
+        if entry["trim"]:
+            after_texels += entry["trim"][2] * entry["trim"][3]
+
+    verb = "processed" if apply else "to process"
+    print(f"Sprites: {len(sources)} ({len(sources) - skipped - errors} {verb}, "
+          f"{skipped} unchanged, {errors} errors)")
+    if before_texels:
+        print(f"Texels: {before_texels} -> {after_texels} "
+              f"(-{(1 - after_texels / before_texels) * 100:.1f}%)")
+
+    if not apply:
+        print("\nRun with --apply to write files.")
+        return
+
+    # Forget sprites whose source is gone
+    live = {f"res://{cache_key(s)}" for s in sources}
+    if not targets:
+        manifest["sprites"] = {k: v for k, v in manifest["sprites"].items() if k in live}
+        cache.prune(sources)
+    manifest["sprites"] = dict(sorted(manifest["sprites"].items()))
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = manifest_path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, manifest_path)
+    cache.save()
+    print(f"Manifest: {cache_key(manifest_path)}")
+
+
+if __name__ == "__main__":
+    main()
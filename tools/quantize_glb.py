@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""Quantize GLB vertex data using KHR_mesh_quantization.
+
+Stores POSITION as normalized int16 and NORMAL as normalized int8 instead of
+float32 (12 -> 8 and 12 -> 4 bytes per vertex after 4-byte alignment).
+Positions are quantized relative to each mesh's bounding box; the
+dequantization transform (center offset + uniform scale) is folded into the
+node that instances the mesh, or into a new child node when the node is
+animated or has children, so the model renders exactly where it did before.
+
+Skinned meshes and meshes with morph targets are left untouched, because
+their vertices are not placed through the node transform.
+
+Note: code that pulls a bare Mesh out of an imported scene (e.g.
+PropScatter._find_mesh_in_node) drops node transforms, so quantized models
+must be instanced as scenes.
+
+Usage:
+    python tools/quantize_glb.py                        # dry run over assets/models
+    python tools/quantize_glb.py --apply                # rewrite GLBs in place
+    python tools/quantize_glb.py path/a.glb some/dir    # specific files / folders
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+from pygltflib import GLTF2, Node
+
+from glb_mesh import (
+    ARRAY_BUFFER, BYTE, FLOAT, SHORT,
+    GlbEditor, add_extension, glb_size, is_rewritable, load_glb, read_accessor_float,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MODELS_DIR = PROJECT_ROOT / "assets" / "models"
+
+EXTENSION_NAME = "KHR_mesh_quantization"
+POSITION_MAX = 32767  # int16 normalized
+NORMAL_MAX = 127      # int8 normalized
+
+
+# ──────────────────────────────────────────────
+#  Transform helpers
+# ──────────────────────────────────────────────
+
+def _quat_rotate(q, v):
+    """Rotate vector v by quaternion q (x, y, z, w)."""
+    qx, qy, qz, qw = q
+    vx, vy, vz = v
+    # t = 2 * cross(q.xyz, v)
+    tx = 2 * (qy * vz - qz * vy)
+    ty = 2 * (qz * vx - qx * vz)
+    tz = 2 * (qx * vy - qy * vx)
+    return (
+        vx + qw * tx + (qy * tz - qz * ty),
+        vy + qw * ty + (qz * tx - qx * tz),
+        vz + qw * tz + (qx * ty - qy * tx),
+    )
+
+
+def _fold_into_node(node: Node, center, scale: float):
+    """Post-multiply a node's local transform by translate(center) * scale(scale)."""
+    if node.matrix:
+        m = np.array(node.matrix, dtype=np.float64).reshape(4, 4).T  # column-major
+        d = np.eye(4)
+        d[:3, :3] *= scale
+        d[:3, 3] = center
+        node.matrix = [float(x) for x in (m @ d).T.reshape(16)]
+        return
+
+    t = node.translation or [0.0, 0.0, 0.0]
+    r = node.rotation or [0.0, 0.0, 0.0, 1.0]
+    s = node.scale or [1.0, 1.0, 1.0]
+    # T R S (Tc Sc) = T * T(R S c) * R * (S Sc), since S and Sc are diagonal
+    offset = _quat_rotate(r, (s[0] * center[0], s[1] * center[1], s[2] * center[2]))
+    node.translation = [float(t[i] + offset[i]) for i in range(3)]
+    node.scale = [float(s[i] * scale) for i in range(3)]
+
+
+def _animated_nodes(gltf: GLTF2) -> set:
+    """Indices of nodes whose TRS is driven by an animation channel."""
+    nodes = set()
+    for anim in gltf.animations or []:
+        for ch in anim.channels:
+            if ch.target.node is not None and ch.target.path != "weights":
+                nodes.add(ch.target.node)
+    return nodes
+
+
+# ──────────────────────────────────────────────
+#  Quantization
+# ──────────────────────────────────────────────
+
+def _mesh_is_quantizable(gltf: GLTF2, mesh, skinned_meshes: set, mesh_idx: int) -> bool:
+    if mesh_idx in skinned_meshes:
+        return False
+    for prim in mesh.primitives:
+        if prim.targets:
+            return False
+        pos = prim.attributes.POSITION
+        if pos is None or gltf.accessors[pos].componentType != FLOAT:
+            return False
+    return True
+
+
+def _mesh_bounds(gltf: GLTF2, mesh):
+    mn = np.full(3, np.inf)
+    mx = np.full(3, -np.inf)
+    for prim in mesh.primitives:
+        pos = read_accessor_float(gltf, prim.attributes.POSITION)
+        if len(pos):
+            mn = np.minimum(mn, pos.min(axis=0))
+            mx = np.maximum(mx, pos.max(axis=0))
+    return mn, mx
+
+
+def _quantize_mesh(gltf: GLTF2, editor: GlbEditor, mesh):
+    """Rewrite a mesh's POSITION/NORMAL accessors. Returns (center, scale)."""
+    mn, mx = _mesh_bounds(gltf, mesh)
+    if not np.all(np.isfinite(mn)):
+        return None
+    center = (mn + mx) / 2.0
+    scale = float(np.max(mx - mn) / 2.0) or 1.0
+
+    converted = {}
+    for prim in mesh.primitives:
+        attrs = prim.attributes
+        if attrs.POSITION not in converted:
+            pos = read_accessor_float(gltf, attrs.POSITION)
+            q = np.clip(np.round((pos - center) / scale * POSITION_MAX),
+                        -POSITION_MAX, POSITION_MAX).astype(np.int16)
+            converted[attrs.POSITION] = editor.add_accessor(
+                q, SHORT, "VEC3", target=ARRAY_BUFFER, normalized=True, bounds=True
+            )
+        attrs.POSITION = converted[attrs.POSITION]
+
+        if attrs.NORMAL is not None and gltf.accessors[attrs.NORMAL].componentType == FLOAT:
+            if attrs.NORMAL not in converted:
+                nrm = read_accessor_float(gltf, attrs.NORMAL)
+                q = np.clip(np.round(nrm * NORMAL_MAX), -NORMAL_MAX, NORMAL_MAX).astype(np.int8)
+                converted[attrs.NORMAL] = editor.add_accessor(
+                    q, BYTE, "VEC3", target=ARRAY_BUFFER, normalized=True
+                )
+            attrs.NORMAL = converted[attrs.NORMAL]
+
+    return [float(c) for c in center], scale
+
+
+def _compensate_nodes(gltf: GLTF2, mesh_idx: int, center, scale: float, animated: set):
+    """Apply the dequantization transform to every node instancing `mesh_idx`."""
+    for node_idx in range(len(gltf.nodes)):
+        node = gltf.nodes[node_idx]
+        if node.mesh != mesh_idx:
+            continue
+        if node.children or node_idx in animated:
+            # Keep the animated/parent transform intact; move the mesh to a child
+            child = Node(
+                name=f"{node.name or 'node'}_mesh", mesh=mesh_idx,
+                translation=list(center), scale=[scale, scale, scale],
+            )
+            node.mesh = None
+            node.children = list(node.children or []) + [len(gltf.nodes)]
+            gltf.nodes.append(child)
+        else:
+            _fold_into_node(node, center, scale)
+
+
+def quantize_gltf(gltf: GLTF2) -> dict:
+    """Quantize every eligible mesh in-place. Returns a stats dict."""
+    stats = {"quantized": 0, "skipped": 0, "max_error": 0.0}
+    if not is_rewritable(gltf):
+        stats["skipped"] = len(gltf.meshes or [])
+        return stats
+
+    skinned = {n.mesh for n in gltf.nodes or [] if n.mesh is not None and n.skin is not None}
+    animated = _animated_nodes(gltf)
+    editor = GlbEditor(gltf)
+
+    for mesh_idx, mesh in enumerate(gltf.meshes or []):
+        if not _mesh_is_quantizable(gltf, mesh, skinned, mesh_idx):
+            stats["skipped"] += 1
+            continue
+        result = _quantize_mesh(gltf, editor, mesh)
+        if result is None:
+            stats["skipped"] += 1
+            continue
+        center, scale = result
+        _compensate_nodes(gltf, mesh_idx, center, scale, animated)
+        stats["quantized"] += 1
+        stats["max_error"] = max(stats["max_error"], scale / POSITION_MAX / 2)
+
+    if stats["quantized"]:
+        editor.finish()
+        add_extension(gltf, EXTENSION_NAME)
+    return stats
+
+
+# ──────────────────────────────────────────────
+#  Main
+# ──────────────────────────────────────────────
+
+def collect_glb_paths(args: list[str], suffixes: tuple = (".glb",)) -> list[Path]:
+    """Expand file/folder arguments into a sorted list of model files (.glb by default)."""
+    roots = [Path(a) for a in args] or [DEFAULT_MODELS_DIR]
+    paths = []
+    for root in roots:
+        if root.is_dir():
+            paths.extend(sorted(p for p in root.rglob("*") if p.suffix.lower() in suffixes))
+        elif root.suffix.lower() in suffixes:
+            paths.append(root)
+    return paths
+
+
+def _rel(path: Path) -> str:
+    try:
+        return str(path.resolve().relative_to(PROJECT_ROOT))
+    except ValueError:
+        return str(path)
+
+
+def main():
+    apply = "--apply" in sys.argv
+    targets = [a for a in sys.argv[1:] if not a.startswith("--")]
+    mode = "APPLYING" if apply else "DRY RUN"
+    print(f"=== {mode} ===\n")
+
+    total_before = 0
+    total_after = 0
+    changed = 0
+
+    for path in collect_glb_paths(targets):
+        before = os.path.getsize(path)
+        try:
+            gltf = load_glb(str(path))
+            stats = quantize_gltf(gltf)
+        except Exception as e:
+            print(f"  ERROR {_rel(path)}: {e}")
+            continue
+
+        if not stats["quantized"]:
+            print(f"  SKIP  {_rel(path)} (nothing to quantize)")
+            continue
+
+        after = glb_size(gltf)
+        if after >= before:
+            print(f"  SKIP  {_rel(path)} (no size gain)")
+            continue
+
+        if apply:
+            gltf.save_binary(str(path))
+
+        total_before += before
+        total_after += after
+        changed += 1
+        pct = (1 - after / before) * 100
+        print(f"  {_rel(path)}: {before / 1024:.1f} KB -> {after / 1024:.1f} KB "
+              f"(-{pct:.1f}%, {stats['quantized']} mesh(es), "
+              f"max error {stats['max_error'] * 1000:.3f} mm)")
+
+    if changed:
+        pct = (1 - total_after / total_before) * 100
+        print(f"\n{'Quantized' if apply else 'Would quantize'}: {changed} files, "
+              f"{total_before / 1024:.1f} KB -> {total_after / 1024:.1f} KB (-{pct:.1f}%)")
+    else:
+        print("\nNothing to quantize.")
+
+    if not apply:
+        print("\nRun with --apply to write files.")
+
+
+if __name__ == "__main__":
+    main()
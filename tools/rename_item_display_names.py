@@ -7,16 +7,15 @@ items are named by their type alone. Rarity is shown via color + tooltip.
 
 Also applies fantasy name renames for crafted weapons.
 
+Runs as a tres_codemod rule (see run_codemods.py).
+
 Usage:
     python tools/rename_item_display_names.py           # dry run
+    python tools/rename_item_display_names.py --diff    # dry run with a unified diff
     python tools/rename_item_display_names.py --apply    # write changes
 """
 
-import os
-import re
-import sys
-
-ITEMS_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "items")
+from tres_codemod import Rule, main
 
 # Rarity prefixes to strip (order matters — longest first)
 RARITY_PREFIXES = ["Legendary ", "Superior ", "Mythic ", "Elite ", "Fine "]
@@ -72,6 +71,10 @@ def clean_display_name(name: str) -> str:
             cleaned = cleaned[len(prefix):]
             break
 
+    # Fantasy names are final ("Iron Fists" keeps its "Iron ")
+    if cleaned in FANTASY_RENAMES.values():
+        return cleaned
+
     # Strip material prefix
     for prefix in MATERIAL_PREFIXES:
         if cleaned.startswith(prefix):
@@ -87,66 +90,22 @@ def clean_display_name(name: str) -> str:
     return cleaned
 
 
-def process_file(filepath: str, apply: bool) -> tuple[str, str] | None:
-    """Process a single .tres file. Returns (old, new) name if changed."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        content = f.read()
+def rename_display_name(_path, doc):
+    """Set display_name to its cleaned form."""
+    old_name = doc.resource.get("display_name")
+    new_name = clean_display_name(old_name)
+    if old_name == new_name:
+        return []
+    doc.resource.set("display_name", new_name)
+    return [f"{old_name} -> {new_name}"]
 
-    match = re.search(r'display_name\s*=\s*"([^"]*)"', content)
-    if not match:
-        return None
 
-    old_name = match.group(1)
-    new_name = clean_display_name(old_name)
+def has_display_name(_path, doc):
+    return isinstance(doc.resource.get("display_name"), str)
 
-    if old_name == new_name:
-        return None
-
-    if apply:
-        new_content = content.replace(
-            f'display_name = "{old_name}"',
-            f'display_name = "{new_name}"',
-        )
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(new_content)
-
-    return (old_name, new_name)
-
-
-def main():
-    apply = "--apply" in sys.argv
-    mode = "APPLYING" if apply else "DRY RUN"
-    print(f"=== {mode} ===\n")
-
-    changes = []
-    for root, _dirs, files in os.walk(ITEMS_DIR):
-        for fname in sorted(files):
-            if not fname.endswith(".tres"):
-                continue
-            filepath = os.path.join(root, fname)
-            result = process_file(filepath, apply)
-            if result:
-                old, new = result
-                rel = os.path.relpath(filepath, ITEMS_DIR)
-                changes.append((rel, old, new))
-
-    if not changes:
-        print("No changes needed.")
-        return
-
-    # Group by directory
-    current_dir = None
-    for rel, old, new in changes:
-        d = os.path.dirname(rel)
-        if d != current_dir:
-            current_dir = d
-            print(f"\n--- {d}/ ---")
-        print(f"  {old:40s} -> {new}")
-
-    print(f"\nTotal: {len(changes)} renames")
-    if not apply:
-        print("\nRun with --apply to write changes.")
+
+RULE = Rule("display_names", rename_display_name, paths=["data/items/**/*.tres"], where=has_display_name)
 
 
 if __name__ == "__main__":
-    main()
+    main([RULE])
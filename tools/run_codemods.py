@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Run the .tres data migrations in one pass through tres_codemod.py.
+
+Every file is read, parsed and written at most once, whichever rules
+apply to it; rules run in the order listed below. Dry run by default,
+with a per-file list of changes, a unified diff on request and an
+idempotency check. Nothing is written if any rule fails it.
+
+Usage:
+    python tools/run_codemods.py                                    # dry run, all rules
+    python tools/run_codemods.py --diff                             # ... with a unified diff
+    python tools/run_codemods.py --rules=display_names,weapon_skill_removal
+    python tools/run_codemods.py --apply                            # write files
+"""
+
+import sys
+
+import generate_gem_element_points
+import generate_weapon_skill_removal
+import rename_item_display_names
+from tres_codemod import main as run
+from tool_cache import arg_value
+
+RULES = [
+    generate_gem_element_points.RULE,
+    generate_weapon_skill_removal.RULE,
+    rename_item_display_names.RULE,
+]
+
+
+def main():
+    wanted = [n for n in arg_value("rules").split(",") if n]
+    unknown = sorted(set(wanted) - {r.name for r in RULES})
+    if unknown:
+        print(f"Unknown rule: {', '.join(unknown)} (known: {', '.join(r.name for r in RULES)})")
+        sys.exit(1)
+    run([r for r in RULES if not wanted or r.name in wanted])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Shared RGBA image helpers for the sprite tools (NumPy arrays via PIL).
+
+    rgba = load_rgba(path)                 # (height, width, 4) uint8
+    x, y, w, h = alpha_bounds(rgba)        # tight box of visible texels
+    rgba = alpha_bleed(rgba, passes=4)     # colour into transparent texels
+    rgba = premultiply(rgba)
+    save_rgba(rgba, out_path)
+"""
+
+import numpy as np
+from PIL import Image
+
+# 8-neighbourhood offsets used by alpha_bleed
+_NEIGHBOURS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+def load_rgba(path) -> np.ndarray:
+    """Load any PIL-readable image as a (height, width, 4) uint8 array."""
+    with Image.open(path) as img:
+        return np.asarray(img.convert("RGBA")).copy()
+
+
+def save_rgba(rgba: np.ndarray, path):
+    """Write a (height, width, 4) uint8 array as an optimised PNG."""
+    Image.fromarray(np.ascontiguousarray(rgba, dtype=np.uint8), "RGBA").save(path, optimize=True)
+
+
+def alpha_bleed(rgba: np.ndarray, passes: int = 0) -> np.ndarray:
+    """Spread colour from visible texels into fully transparent ones.
+
+    Each pass gives every transparent texel touching a coloured one the
+    average RGB of its coloured 8-neighbours; alpha is left untouched, so
+    the image looks the same but bilinear filtering no longer pulls in
+    black fringes. passes=0 repeats until every texel has a colour.
+    """
+    out = rgba.copy()
+    known = out[..., 3] > 0
+    if known.all() or not known.any():
+        return out
+
+    rgb = out[..., :3].astype(np.float32)
+    height, width = known.shape
+    remaining = passes or (height + width)
+    while remaining and not known.all():
+        remaining -= 1
+        padded_rgb = np.pad(rgb * known[..., None], ((1, 1), (1, 1), (0, 0)))
+        padded_known = np.pad(known, 1).astype(np.float32)
+        total = np.zeros_like(rgb)
+        count = np.zeros(known.shape, dtype=np.float32)
+        for dy, dx in _NEIGHBOURS:
+            total += padded_rgb[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+            count += padded_known[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+        grow = ~known & (count > 0)
+        if not grow.any():
+            break
+        rgb[grow] = total[grow] / count[grow][:, None]
+        known = known | grow
+
+    out[..., :3] = np.clip(np.round(rgb), 0, 255).astype(np.uint8)
+    return out
+
+
+def alpha_bounds(rgba: np.ndarray, min_alpha: int = 0):
+    """Tight (x, y, width, height) of texels with alpha > min_alpha, or None if none."""
+    mask = rgba[..., 3] > min_alpha
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    if not len(rows):
+        return None
+    return int(cols[0]), int(rows[0]), int(cols[-1] - cols[0] + 1), int(rows[-1] - rows[0] + 1)
+
+
+def premultiply(rgba: np.ndarray) -> np.ndarray:
+    """Return a copy with RGB multiplied by alpha (rounded to nearest)."""
+    out = rgba.copy()
+    alpha = out[..., 3:4].astype(np.uint32)
+    out[..., :3] = ((out[..., :3].astype(np.uint32) * alpha + 127) // 255).astype(np.uint8)
+    return out
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""Transactional staged writes shared by the --apply data tools.
+
+A tool stages every output first and nothing in the project changes until
+commit(): staged .tres files are validated, the files about to be replaced
+are backed up, and everything is moved into place with os.replace in one
+burst. An exception while rendering leaves data/ untouched, and Godot's
+file watcher sees one reimport wave instead of a trickle.
+
+    with StagedWrites("generate_legendary_data", apply) as staged:
+        for path, content in outputs:
+            staged.stage(path, content)
+        staged.commit()
+    staged.report()
+
+stage() compares against the file on disk: unchanged outputs are counted
+but not staged, and with overwrite=False an existing file that differs is
+counted as skipped. In a dry run (apply=False) nothing is written and the
+statuses say what would happen. If validation fails, the errors are listed
+and the tool exits with status 1 before anything is written; if a rename
+fails partway, the files already moved are restored.
+
+Each transaction lives in tools/.cache/staging/<tool>_<random>/ (same
+filesystem as the project, so the renames are atomic):
+  files/<path>    staged content
+  backup/<path>   originals of the files the commit replaced
+  journal.json    tool, state and per-file status and hash
+
+The last committed transaction is kept so that it can be undone. Rollback
+restores replaced files, deletes created ones, and leaves alone any file
+that was changed again after the commit.
+
+Usage:
+    python tools/staged_writes.py                     # show the last transaction
+    python tools/staged_writes.py --rollback          # dry run: what a rollback would restore
+    python tools/staged_writes.py --rollback --apply  # restore it
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from collections import Counter
+from pathlib import Path
+
+from tool_cache import CACHE_DIR
+from tres_document import TresDocument
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STAGING_DIR = CACHE_DIR / "staging"
+JOURNAL_NAME = "journal.json"
+
+
+class StagingError(RuntimeError):
+    """Staged output failed validation; nothing was written."""
+
+    def __init__(self, errors: list[str]):
+        super().__init__(f"{len(errors)} staged file(s) failed validation")
+        self.errors = errors
+
+
+def validate_tres(text: str) -> str | None:
+    """Why `text` is not a loadable .tres file, or None."""
+    try:
+        doc = TresDocument.parse(text)
+        if not doc.sections or doc.header.tag != "gd_resource":
+            return "missing [gd_resource] header"
+        for section in doc.sections:
+            section.properties()  # parses every value
+    except ValueError as e:  # includes TresParseError
+        return str(e)
+    return None
+
+
+def _sha1(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+class StagedWrites:
+    """One transaction: stage outputs, then commit them all or none."""
+
+    def __init__(self, tool: str, apply: bool = True, root: Path = PROJECT_ROOT,
+                 staging_dir: Path = None, validate: bool = True):
+        self.tool = tool
+        self.apply = apply
+        self.root = Path(root)
+        self.validate = validate
+        self.counts = Counter()
+        self.changed = {}  # path -> (status, sha1) for created/modified outputs
+        self.errors = []
+        self.bytes_staged = 0
+        self.committed = False
+        self._lock = threading.Lock()
+        self.dir = None
+        if apply:
+            base = staging_dir or (STAGING_DIR if self.root == PROJECT_ROOT else self.root / ".staging")
+            base.mkdir(parents=True, exist_ok=True)
+            self.dir = Path(tempfile.mkdtemp(prefix=f"{tool}_", dir=base))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.committed:
+            self.discard()
+        if isinstance(exc, StagingError):
+            for error in exc.errors:
+                print(f"  ERROR {error}")
+            print(f"\n{exc} — nothing written.")
+            sys.exit(1)
+        return False
+
+    def _key(self, path) -> str:
+        rel = os.path.relpath(os.path.join(self.root, path), self.root)
+        if rel.startswith(".."):
+            raise ValueError(f"{path} is outside {self.root}")
+        return Path(rel).as_posix()
+
+    def stage(self, path, content, overwrite: bool = True) -> str:
+        """Stage one output; returns created / modified / unchanged / skipped.
+
+        `path` is absolute or relative to the root. Safe to call from
+        several threads.
+        """
+        key = self._key(path)
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        try:
+            with open(self.root / key, "rb") as f:
+                status = "unchanged" if f.read() == data else "modified"
+        except FileNotFoundError:
+            status = "created"
+        if status == "modified" and not overwrite:
+            status = "skipped"
+
+        error = None
+        if status in ("created", "modified"):
+            if self.validate and key.endswith(".tres"):
+                error = validate_tres(data.decode("utf-8"))
+            if self.apply and not error:
+                staged = self.dir / "files" / key
+                staged.parent.mkdir(parents=True, exist_ok=True)
+                with open(staged, "wb") as f:
+                    f.write(data)
+
+        with self._lock:
+            if key in self.changed:
+                raise ValueError(f"{key} staged twice")
+            self.counts[status] += 1
+            if error:
+                self.errors.append(f"{key}: {error}")
+            elif status in ("created", "modified"):
+                self.changed[key] = (status, _sha1(data))
+                self.bytes_staged += len(data)
+        return status
+
+    def _write_journal(self, state: str):
+        journal = {
+            "tool": self.tool,
+            "root": str(self.root),
+            "state": state,
+            "files": {k: list(v) for k, v in sorted(self.changed.items())},
+        }
+        with open(self.dir / JOURNAL_NAME, "w", encoding="utf-8") as f:
+            json.dump(journal, f, indent=1)
+
+    def commit(self) -> Counter:
+        """Move every staged file into place; all or nothing. Returns the counts."""
+        if self.errors:
+            raise StagingError(self.errors)
+        if not self.apply or not self.changed:
+            self.discard()
+            self.committed = True
+            return self.counts
+
+        self._write_journal("committing")
+        moved = []
+        try:
+            # Back up first so the rename burst below has nothing else to do
+            for key, (status, _digest) in self.changed.items():
+                target = self.root / key
+                if status == "modified":
+                    backup = self.dir / "backup" / key
+                    backup.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copy2(target, backup)
+                else:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+            for key in self.changed:
+                os.replace(self.dir / "files" / key, self.root / key)
+                moved.append(key)
+        except BaseException:
+            _restore(self.root, self.dir, {k: self.changed[k] for k in moved})
+            self._write_journal("rolled_back")
+            raise
+        self._write_journal("committed")
+        self.committed = True
+        _prune(self.dir)
+        return self.counts
+
+    def discard(self):
+        """Drop the staged files (uncommitted transactions only)."""
+        if self.dir is not None and not self.committed:
+            shutil.rmtree(self.dir, ignore_errors=True)
+            self.dir = None
+
+    def report(self, base: Path = None, list_files: bool = True):
+        """Print the changed files (relative to `base`) and the summary line."""
+        for key, (status, _digest) in sorted(self.changed.items()) if list_files else ():
+            shown = os.path.relpath(self.root / key, base) if base else key
+            print(f"  {status.capitalize() if self.apply else 'Would be ' + status}: {shown}")
+        action = "Written" if self.apply else "Would write"
+        print(f"\n{action}: {self.counts['created']} created, {self.counts['modified']} modified, "
+              f"{self.counts['unchanged']} unchanged")
+        if self.counts["skipped"]:
+            print(f"Skipped (already exist, use --force): {self.counts['skipped']}")
+
+
+def _restore(root: Path, txn: Path, files: dict, apply: bool = True) -> Counter:
+    """Undo `files` ({path: (status, sha1)}) of a transaction."""
+    counts = Counter()
+    for key, (status, digest) in sorted(files.items()):
+        target = root / key
+        try:
+            current = _sha1(target.read_bytes())
+        except FileNotFoundError:
+            current = None
+        if current != digest:
+            counts["changed since"] += 1
+            continue
+        if status == "modified":
+            if apply:
+                os.replace(txn / "backup" / key, target)
+            counts["restored"] += 1
+        else:
+            if apply:
+                target.unlink()
+            counts["deleted"] += 1
+    return counts
+
+
+def _prune(keep: Path):
+    """Remove every other finished transaction next to `keep`.
+
+    Transactions left in "committing" (a crashed run) are kept for --rollback.
+    """
+    for txn in keep.parent.iterdir():
+        if txn == keep or not txn.is_dir():
+            continue
+        if _read_journal(txn).get("state") != "committing":
+            shutil.rmtree(txn, ignore_errors=True)
+
+
+def _read_journal(txn: Path) -> dict:
+    try:
+        with open(txn / JOURNAL_NAME, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def transactions(staging_dir: Path = STAGING_DIR) -> list[tuple[Path, dict]]:
+    """(dir, journal) of the committed or interrupted transactions, newest first."""
+    if not staging_dir.is_dir():
+        return []
+    found = [(txn, _read_journal(txn)) for txn in staging_dir.iterdir() if txn.is_dir()]
+    found = [(txn, j) for txn, j in found if j.get("state") in ("committed", "committing")]
+    return sorted(found, key=lambda t: (t[0] / JOURNAL_NAME).stat().st_mtime, reverse=True)
+
+
+# ─── main ────────────────────────────────────────────────────────────────────
+
+def main():
+    rollback = "--rollback" in sys.argv
+    apply = "--apply" in sys.argv
+
+    found = transactions()
+    if not found:
+        print("No committed transaction to roll back.")
+        return
+    txn, journal = found[0]
+    files = {k: tuple(v) for k, v in journal["files"].items()}
+    kinds = Counter(status for status, _digest in files.values())
+    print(f"Last transaction: {journal['tool']} ({journal['state']}), "
+          f"{kinds['created']} created, {kinds['modified']} modified")
+    if not rollback:
+        for key, (status, _digest) in sorted(files.items()):
+            print(f"  {status}: {key}")
+        print("\nRun with --rollback to undo it.")
+        return
+
+    mode = "APPLYING" if apply else "DRY RUN"
+    print(f"\n=== {mode} ===\n")
+    counts = _restore(Path(journal["root"]), txn, files, apply)
+    if apply:
+        print(f"Restored: {counts['restored']}, deleted: {counts['deleted']}")
+    else:
+        print(f"Would restore: {counts['restored']}, would delete: {counts['deleted']}")
+    if counts["changed since"]:
+        print(f"Left alone (changed after the commit): {counts['changed since']}")
+    if apply:
+        shutil.rmtree(txn, ignore_errors=True)
+    else:
+        print("\nRun with --rollback --apply to restore.")
+
+
+if __name__ == "__main__":
+    main()
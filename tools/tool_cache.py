@@ -0,0 +1,153 @@
+"""Persistent per-file result cache shared by the asset and data tools.
+
+Results are stored as JSON under tools/.cache/<name>.json, keyed by the
+file's project-relative path. An entry is reused when the file's size and
+mtime are unchanged (no read needed) or, failing that, when its content hash
+still matches. Bumping `version` (e.g. because an analysis constant changed)
+discards every entry.
+
+    cache = FileCache("asset_audit", version="2")
+    result = cache.lookup(path)
+    if result is None:
+        result = analyse(path)
+        cache.store(path, result)
+    cache.prune(seen_paths)
+    cache.save()
+
+arg_value() reads a --name=value flag; the tools parse sys.argv by hand.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = PROJECT_ROOT / "tools" / ".cache"
+
+_HASH_CHUNK = 1 << 20
+
+
+def file_digest(path) -> str:
+    """Return the SHA-1 hex digest of a file's content."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_key(path) -> str:
+    """Project-relative, forward-slash key for a path (absolute if outside the project)."""
+    p = Path(path).resolve()
+    try:
+        return p.relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return p.as_posix()
+
+
+class FileCache:
+    """JSON-backed map of file path -> cached result, validated by stat and hash."""
+
+    def __init__(self, name: str, version: str = "1", enabled: bool = True):
+        self.path = CACHE_DIR / f"{name}.json"
+        self.version = str(version)
+        self.enabled = enabled
+        self._entries = {}
+        self._digests = {}  # key -> digest computed during lookup, reused by store
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if enabled:
+            self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == self.version:
+            self._entries = data.get("entries", {})
+
+    def lookup(self, path):
+        """Return the cached result for `path`, or None if missing or stale."""
+        if not self.enabled:
+            self.misses += 1
+            return None
+        key = cache_key(path)
+        entry = self._entries.get(key)
+        st = os.stat(path)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            self.hits += 1
+            return entry["result"]
+
+        digest = file_digest(path)
+        self._digests[key] = digest
+        if entry and entry["hash"] == digest:
+            # Touched but unchanged — refresh the stat fields only
+            entry["size"] = st.st_size
+            entry["mtime_ns"] = st.st_mtime_ns
+            self._dirty = True
+            self.hits += 1
+            return entry["result"]
+
+        self.misses += 1
+        return None
+
+    def store(self, path, result, digest: str = None):
+        """Record `result` for the current content of `path`."""
+        if not self.enabled:
+            return
+        key = cache_key(path)
+        st = os.stat(path)
+        digest = digest or self._digests.pop(key, None) or file_digest(path)
+        self._entries[key] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "hash": digest,
+            "result": result,
+        }
+        self._dirty = True
+
+    def digest(self, path) -> str:
+        """Content hash of `path`, reusing the cached value when stat is unchanged."""
+        key = cache_key(path)
+        entry = self._entries.get(key)
+        st = os.stat(path)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["hash"]
+        if key not in self._digests:
+            self._digests[key] = file_digest(path)
+        return self._digests[key]
+
+    def prune(self, live_paths):
+        """Forget entries for files that no longer exist in `live_paths`."""
+        live = {cache_key(p) for p in live_paths}
+        stale = [k for k in self._entries if k not in live]
+        for k in stale:
+            del self._entries[k]
+        if stale:
+            self._dirty = True
+
+    def save(self):
+        if not (self.enabled and self._dirty):
+            return
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "entries": self._entries}, f)
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+def arg_value(name: str, default: str = "") -> str:
+    """Value of a --name=value command-line flag, or `default`."""
+    prefix = f"--{name}="
+    for a in sys.argv[1:]:
+        if a.startswith(prefix):
+            return a[len(prefix):]
+    return default
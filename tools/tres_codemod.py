@@ -0,0 +1,179 @@
+"""Single-pass codemod engine for .tres data migrations.
+
+A migration is a Rule: which files it applies to (path globs, script
+class, a predicate on the parsed document) and a transform that edits the
+TresDocument in place and returns one note per change. run_codemods()
+reads and parses every candidate file once, applies every matching rule to
+that one document in order, and writes the result once, so chaining
+migrations costs one sweep however many rules there are.
+
+    RULE = Rule(
+        "weapon_skill_removal",
+        remove_granted_skills,                 # (path, doc) -> list of notes
+        paths=["data/items/weapons/*.tres"],
+        script_class="ItemData",
+        where=has_granted_skills,              # optional (path, doc) -> bool filter
+    )
+
+    if __name__ == "__main__":
+        main([RULE])
+
+Every changed file is re-parsed and put through the rules again; a rule
+that would change its own output is reported as not idempotent and nothing
+is written. Files are processed in a process pool above MIN_POOL_FILES.
+Writes go through one StagedWrites transaction. Transforms and predicates
+must be module-level functions so the pool can pickle them.
+
+run_codemods.py runs every registered migration in one pass.
+"""
+
+import difflib
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import tres_document
+from staged_writes import StagedWrites
+from tool_cache import arg_value
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Below this many files, running inline beats starting a process pool
+MIN_POOL_FILES = 64
+
+
+class Rule:
+    """One migration step, matched per file and applied to the parsed document."""
+
+    def __init__(self, name: str, transform, paths: list[str], script_class: str = None, where=None):
+        self.name = name
+        self.transform = transform
+        self.paths = paths
+        self.script_class = script_class
+        self.where = where
+
+    def matches(self, path: str, doc: tres_document.TresDocument) -> bool:
+        """Document-level filter; the path globs are resolved by candidate_files()."""
+        if self.script_class and doc.script_class != self.script_class:
+            return False
+        return self.where is None or self.where(path, doc)
+
+    def __repr__(self):
+        return f"Rule({self.name!r})"
+
+
+def candidate_files(rules: list[Rule]) -> dict[str, tuple[int, ...]]:
+    """Project-relative path -> indices of the rules whose globs match it, in path order."""
+    found = {}
+    for i, rule in enumerate(rules):
+        for pattern in rule.paths:
+            for p in PROJECT_ROOT.glob(pattern):
+                found.setdefault(p.relative_to(PROJECT_ROOT).as_posix(), set()).add(i)
+    return {path: tuple(sorted(found[path])) for path in sorted(found)}
+
+
+def _apply_rules(rules: list[Rule], path: str, doc) -> list[tuple[str, str]]:
+    """Apply the matching rules in order; (rule name, note) for every change."""
+    notes = []
+    for rule in rules:
+        if rule.matches(path, doc):
+            notes.extend((rule.name, note) for note in rule.transform(path, doc))
+    return notes
+
+
+def process_file(all_rules: list[Rule], job: tuple) -> dict | None:
+    """Process-pool entry point: apply the matching rules to one file.
+
+    `job` is (path, rule indices). Returns None when nothing changed, else
+    the new text, the notes per rule, a unified diff and the rules that
+    were not idempotent.
+    """
+    path, indices = job
+    rules = [all_rules[i] for i in indices]
+    with open(PROJECT_ROOT / path, "r", encoding="utf-8", newline="") as f:
+        old = f.read()
+    try:
+        doc = tres_document.loads(old)
+        notes = _apply_rules(rules, path, doc)
+    except ValueError as e:
+        return {"path": path, "error": str(e)}
+    new = doc.dumps()
+    if new == old:
+        return None
+
+    # Idempotency: a second run over the output must not change it
+    again = tres_document.loads(new)
+    not_idempotent = []
+    text = new
+    for rule in rules:
+        if rule.matches(path, again):
+            rule.transform(path, again)
+            if again.dumps() != text:
+                not_idempotent.append(rule.name)
+                text = again.dumps()
+
+    diff = "".join(difflib.unified_diff(
+        old.splitlines(keepends=True), new.splitlines(keepends=True), f"a/{path}", f"b/{path}"))
+    return {"path": path, "text": new, "notes": notes, "diff": diff, "not_idempotent": not_idempotent}
+
+
+def run_codemods(rules: list[Rule], jobs: int = None) -> tuple[int, list[dict]]:
+    """(files scanned, results for the changed files), in path order."""
+    todo = list(candidate_files(rules).items())
+    work = partial(process_file, rules)
+    if len(todo) >= MIN_POOL_FILES:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(work, todo, chunksize=32))
+    else:
+        results = [work(job) for job in todo]
+    return len(todo), [r for r in results if r]
+
+
+# ─── main ────────────────────────────────────────────────────────────────────
+
+def main(rules: list[Rule], tool: str = None):
+    """Shared CLI: one pass over the files, notes (and --diff), then one commit."""
+    apply = "--apply" in sys.argv
+    show_diff = "--diff" in sys.argv
+    jobs = int(arg_value("jobs", "0")) or None
+    mode = "APPLYING" if apply else "DRY RUN"
+    print(f"=== {mode} ===\n")
+    print(f"Rules: {', '.join(r.name for r in rules)}\n")
+
+    scanned, results = run_codemods(rules, jobs)
+    errors = [r for r in results if "error" in r]
+    broken = [r for r in results if r.get("not_idempotent")]
+    changed = [r for r in results if "text" in r]
+
+    per_rule = {r.name: 0 for r in rules}
+    for r in changed:
+        print(f"  {'Modified' if apply else 'Would modify'}: {r['path']}")
+        for name, note in r["notes"]:
+            print(f"    [{name}] {note}")
+        for name in {name for name, _note in r["notes"]}:
+            per_rule[name] += 1
+    if show_diff and changed:
+        print()
+        for r in changed:
+            sys.stdout.write(r["diff"])
+
+    print(f"\nScanned: {scanned} files, {len(changed)} to change")
+    for name, count in per_rule.items():
+        print(f"  {name:<28} {count} file(s)")
+
+    for r in errors:
+        print(f"  ERROR {r['path']}: {r['error']}")
+    for r in broken:
+        print(f"  NOT IDEMPOTENT {r['path']}: {', '.join(r['not_idempotent'])} would change it again")
+    if errors or broken:
+        print(f"\n{len(errors) + len(broken)} problem(s) — nothing written.")
+        sys.exit(1)
+
+    with StagedWrites(tool or Path(sys.argv[0]).stem, apply) as staged:
+        for r in changed:
+            staged.stage(r["path"], r["text"])
+        staged.commit()
+    staged.report(list_files=False)
+    if not apply:
+        print("\nRun with --apply to write files (--diff shows the changes).")
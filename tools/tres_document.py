@@ -0,0 +1,659 @@
+"""Lossless reader/writer for Godot text resources (.tres), shared by the data tools.
+
+A file is split into its sections ([gd_resource], [ext_resource],
+[sub_resource], [resource]); each section keeps its header attributes and an
+ordered list of properties. Every piece keeps its original text, so
+`dumps()` reproduces the file byte for byte and an edit only touches the
+properties that were changed. Property values are parsed on first access
+into Python values:
+
+    "text" -> str      1 -> int      1.5 -> float      true -> bool     null -> None
+    [a, b] -> list     { 0: 3 } -> dict
+    ExtResource("1_abc") / SubResource("Resource_x")  -> ExtResource / SubResource
+    Array[Vector2i]([...])                            -> TypedArray
+    Vector2i(0, 1), Color(...), PackedStringArray(...) -> Call
+    &"name"                                           -> StringName
+
+Values may span several lines (long arrays, dictionaries, strings with
+newlines); the property runs until its brackets and quotes are closed.
+
+    doc = load(path)
+    item_id = doc.resource.get("id")
+    icon_path = doc.ext_path(doc.resource.get("icon"))
+    doc.resource.set("element_points", {0: 3}, before="base_price")
+    doc.resource.remove("granted_skills")
+    doc.save(path)
+
+Generators build new files with format_tres(), use stable_id() for
+ext/sub-resource ids and write_if_changed() so that regenerating unchanged
+content leaves the files untouched.
+"""
+
+import hashlib
+import math
+import os
+import re
+import string
+from pathlib import Path
+
+
+# ─── values ──────────────────────────────────────────────────────────────────
+
+class ExtResource:
+    """Reference to an [ext_resource] by id."""
+    __slots__ = ("id",)
+
+    def __init__(self, id: str):
+        self.id = id
+
+    def __eq__(self, other):
+        return type(other) is ExtResource and other.id == self.id
+
+    def __hash__(self):
+        return hash(("ExtResource", self.id))
+
+    def __repr__(self):
+        return f'ExtResource("{self.id}")'
+
+
+class SubResource:
+    """Reference to a [sub_resource] by id."""
+    __slots__ = ("id",)
+
+    def __init__(self, id: str):
+        self.id = id
+
+    def __eq__(self, other):
+        return type(other) is SubResource and other.id == self.id
+
+    def __hash__(self):
+        return hash(("SubResource", self.id))
+
+    def __repr__(self):
+        return f'SubResource("{self.id}")'
+
+
+class StringName(str):
+    """A &"name" literal; behaves as the plain string."""
+
+    def __repr__(self):
+        return f"&{str.__repr__(self)}"
+
+
+class Call:
+    """A constructor literal: Vector2i(0, 1), Color(1, 1, 1, 1), PackedStringArray("a")."""
+    __slots__ = ("name", "args")
+
+    def __init__(self, name: str, args):
+        self.name = name
+        self.args = tuple(args)
+
+    def __eq__(self, other):
+        return type(other) is Call and other.name == self.name and other.args == self.args
+
+    def __hash__(self):
+        return hash((self.name, self.args))
+
+    def __iter__(self):
+        return iter(self.args)
+
+    def __repr__(self):
+        return format_value(self)
+
+
+class TypedArray:
+    """Array[T]([...]); `type` is a class name or an ExtResource for script types."""
+    __slots__ = ("type", "items")
+
+    def __init__(self, type, items):
+        self.type = type
+        self.items = list(items)
+
+    def __eq__(self, other):
+        return type(other) is TypedArray and other.type == self.type and other.items == self.items
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __repr__(self):
+        return format_value(self)
+
+
+class TresParseError(ValueError):
+    pass
+
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<str>&?"(?:[^"\\]|\\.)*")
+      | (?P<num>[-+]?(?:inf|nan|(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?))
+      | (?P<ident>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<punct>[\[\]{}(),:=])
+    )""", re.VERBOSE | re.DOTALL)
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f",
+            '"': '"', "'": "'", "\\": "\\"}
+_ESCAPE = re.compile(r"\\(u[0-9a-fA-F]{4}|U[0-9a-fA-F]{6}|.)", re.DOTALL)
+_CONSTANTS = {"true": True, "false": False, "null": None, "nil": None}
+
+
+def _unescape(body: str) -> str:
+    if "\\" not in body:
+        return body
+
+    def repl(m):
+        s = m.group(1)
+        if len(s) > 1:
+            return chr(int(s[1:], 16))
+        return _ESCAPES.get(s, s)
+    return _ESCAPE.sub(repl, body)
+
+
+def _tokenize(text: str) -> list[tuple[str, str]]:
+    tokens = []
+    pos = 0
+    end = len(text.rstrip())
+    while pos < end:
+        m = _TOKEN.match(text, pos)
+        if m is None:
+            raise TresParseError(f"unexpected character at {pos}: {text[pos:pos + 20]!r}")
+        tokens.append((m.lastgroup, m.group(m.lastgroup)))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self, expected: str = None) -> tuple[str, str]:
+        if self.pos >= len(self.tokens):
+            raise TresParseError("unexpected end of value")
+        tok = self.tokens[self.pos]
+        if expected is not None and tok[1] != expected:
+            raise TresParseError(f"expected {expected!r}, got {tok[1]!r}")
+        self.pos += 1
+        return tok
+
+    def value(self):
+        kind, text = self.take()
+        if kind == "str":
+            if text[0] == "&":
+                return StringName(_unescape(text[2:-1]))
+            return _unescape(text[1:-1])
+        if kind == "num":
+            if any(c in text for c in ".eEn"):  # also inf / nan
+                return float(text)
+            return int(text)
+        if kind == "ident":
+            if text in _CONSTANTS:
+                return _CONSTANTS[text]
+            if text == "Array" and self.peek()[1] == "[":
+                self.take("[")
+                if self.peek()[0] == "ident" and self.tokens[self.pos + 1][1] == "]":
+                    element_type = self.take()[1]
+                else:
+                    element_type = self.value()
+                self.take("]")
+                self.take("(")
+                items = self.value()
+                self.take(")")
+                return TypedArray(element_type, items)
+            self.take("(")
+            args = self.sequence(")")
+            if text == "ExtResource":
+                return ExtResource(args[0])
+            if text == "SubResource":
+                return SubResource(args[0])
+            return Call(text, args)
+        if text == "[":
+            return self.sequence("]")
+        if text == "{":
+            result = {}
+            while self.peek()[1] != "}":
+                key = self.value()
+                self.take(":")
+                result[key] = self.value()
+                if self.peek()[1] == ",":
+                    self.take(",")
+            self.take("}")
+            return result
+        raise TresParseError(f"unexpected {text!r}")
+
+    def sequence(self, close: str) -> list:
+        items = []
+        while self.peek()[1] != close:
+            items.append(self.value())
+            if self.peek()[1] == ",":
+                self.take(",")
+        self.take(close)
+        return items
+
+
+def parse_value(text: str):
+    """Parse one Godot variant literal."""
+    parser = _Parser(text)
+    result = parser.value()
+    if parser.pos != len(parser.tokens):
+        raise TresParseError(f"trailing text after value: {text!r}")
+    return result
+
+
+def _format_real(v: float) -> str:
+    if math.isinf(v):
+        return "inf" if v > 0 else "-inf"
+    if math.isnan(v):
+        return "nan"
+    return repr(v)
+
+
+def format_string(s: str) -> str:
+    return '"' + s.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def format_value(v) -> str:
+    """Format a Python value as the Godot literal a .tres would contain."""
+    if v is True:
+        return "true"
+    if v is False:
+        return "false"
+    if v is None:
+        return "null"
+    if isinstance(v, StringName):
+        return "&" + format_string(v)
+    if isinstance(v, str):
+        return format_string(v)
+    if isinstance(v, int):
+        return str(v)
+    if isinstance(v, float):
+        return _format_real(v)
+    if isinstance(v, (ExtResource, SubResource)):
+        return f'{type(v).__name__}("{v.id}")'
+    if isinstance(v, Call):
+        return f"{v.name}({', '.join(format_value(a) for a in v.args)})"
+    if isinstance(v, TypedArray):
+        element_type = v.type if isinstance(v.type, str) else format_value(v.type)
+        return f"Array[{element_type}]({format_value(v.items)})"
+    if isinstance(v, (list, tuple)):
+        return "[" + ", ".join(format_value(x) for x in v) + "]"
+    if isinstance(v, dict):
+        if not v:
+            return "{}"
+        return "{ " + ", ".join(f"{format_value(k)}: {format_value(x)}" for k, x in v.items()) + " }"
+    raise TypeError(f"cannot format {type(v).__name__} as a Godot value")
+
+
+def iter_refs(value):
+    """Yield every ExtResource / SubResource inside a parsed value."""
+    if isinstance(value, (ExtResource, SubResource)):
+        yield value
+    elif isinstance(value, (list, TypedArray)):
+        if isinstance(value, TypedArray) and isinstance(value.type, ExtResource):
+            yield value.type
+        for v in value:
+            yield from iter_refs(v)
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            yield from iter_refs(k)
+            yield from iter_refs(v)
+    elif isinstance(value, Call):
+        for v in value.args:
+            yield from iter_refs(v)
+
+
+# ─── document ────────────────────────────────────────────────────────────────
+
+_HEADER = re.compile(r"\[([a-z_]+)(.*)\]\s*$", re.DOTALL)
+_PROPERTY = re.compile(r"([A-Za-z0-9_/:.\-]+|\"(?:[^\"\\]|\\.)*\") = ")
+_ATTR = re.compile(r'(\w+)=("(?:[^"\\]|\\.)*"|[^\s"(]+(?:\([^)]*\))?)')
+_BRACKETS = re.compile(r'"(?:[^"\\]|\\.)*"|[\[{(]|[\]})]|"')
+
+
+def _is_complete(value: str) -> bool:
+    """True once every bracket and string opened in `value` is closed."""
+    if '"' not in value and not any(c in value for c in "[{("):
+        return True
+    depth = 0
+    for m in _BRACKETS.finditer(value):
+        c = m.group()
+        if c == '"':
+            return False  # unterminated string
+        if c in "[{(":
+            depth += 1
+        elif c in "]})":
+            depth -= 1
+    return depth <= 0
+
+
+class Property:
+    """One `key = value` entry; `text` is its exact source, including the newline."""
+    __slots__ = ("key", "text", "_raw", "_value", "_parsed")
+
+    def __init__(self, key: str, text: str, raw: str):
+        self.key = key
+        self.text = text
+        self._raw = raw
+        self._parsed = False
+        self._value = None
+
+    @property
+    def raw(self) -> str:
+        """The value exactly as written (may span lines)."""
+        return self._raw
+
+    @property
+    def value(self):
+        if not self._parsed:
+            self._value = parse_value(self._raw)
+            self._parsed = True
+        return self._value
+
+    def set_raw(self, raw: str, newline: str = "\n"):
+        self._raw = raw
+        self._parsed = False
+        self.text = f"{self.key} = {raw}{newline}"
+
+    def __repr__(self):
+        return f"Property({self.key} = {self._raw})"
+
+
+class Section:
+    """A bracketed section: its header attributes plus ordered properties.
+
+    `entries` holds Property objects and verbatim strings (blank lines and
+    ; comments) in file order.
+    """
+
+    def __init__(self, tag: str, attrs: dict, header: str):
+        self.tag = tag
+        self.attrs = attrs
+        self.header = header
+        self.entries = []
+        self._props = {}
+
+    @classmethod
+    def new(cls, tag: str, attrs: dict = None) -> "Section":
+        attrs = dict(attrs or {})
+        parts = [tag] + [f"{k}={format_value(v)}" for k, v in attrs.items()]
+        section = cls(tag, attrs, "[" + " ".join(parts) + "]\n")
+        return section
+
+    @property
+    def id(self):
+        return self.attrs.get("id")
+
+    @property
+    def type(self):
+        return self.attrs.get("type")
+
+    @property
+    def path(self):
+        return self.attrs.get("path")
+
+    def _add(self, prop: Property):
+        self.entries.append(prop)
+        self._props[prop.key] = prop
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._props
+
+    def keys(self) -> list[str]:
+        return list(self._props)
+
+    def properties(self) -> dict:
+        """Parsed {key: value} of every property, in file order."""
+        return {k: p.value for k, p in self._props.items()}
+
+    def prop(self, key: str):
+        return self._props.get(key)
+
+    def get(self, key: str, default=None):
+        prop = self._props.get(key)
+        return default if prop is None else prop.value
+
+    def raw(self, key: str, default=None):
+        prop = self._props.get(key)
+        return default if prop is None else prop.raw
+
+    def set(self, key: str, value, before: str = None):
+        """Set a property to a Python value (see set_raw for placement)."""
+        self.set_raw(key, format_value(value), before)
+
+    def set_raw(self, key: str, raw: str, before: str = None):
+        """Set a property's literal text.
+
+        An existing property is rewritten in place; a new one is inserted
+        before the property `before` when present, else after the last
+        property of the section.
+        """
+        prop = self._props.get(key)
+        if prop is not None:
+            if prop.raw != raw:
+                prop.set_raw(raw)
+            return
+        prop = Property(key, f"{key} = {raw}\n", raw)
+        anchor = self._props.get(before) if before else None
+        if anchor is not None:
+            index = self.entries.index(anchor)
+        else:
+            index = len(self.entries)
+            while index and not isinstance(self.entries[index - 1], Property):
+                index -= 1
+        self.entries.insert(index, prop)
+        self._props[key] = prop
+
+    def remove(self, key: str) -> bool:
+        prop = self._props.pop(key, None)
+        if prop is None:
+            return False
+        self.entries.remove(prop)
+        return True
+
+    def dumps(self) -> str:
+        return self.header + "".join(e if isinstance(e, str) else e.text for e in self.entries)
+
+    def __repr__(self):
+        return f"Section({self.header.strip()})"
+
+
+def _parse_header(line: str) -> Section:
+    m = _HEADER.match(line)
+    if m is None:
+        raise TresParseError(f"bad section header: {line!r}")
+    attrs = {}
+    for key, value in _ATTR.findall(m.group(2)):
+        if value[0] == '"':
+            attrs[key] = _unescape(value[1:-1])
+        elif value.isdigit():
+            attrs[key] = int(value)
+        else:
+            attrs[key] = parse_value(value)
+    return Section(m.group(1), attrs, line)
+
+
+class TresDocument:
+    """A parsed .tres file. `preamble` is any text before the first section."""
+
+    def __init__(self, sections: list, preamble: str = ""):
+        self.sections = sections
+        self.preamble = preamble
+
+    @classmethod
+    def parse(cls, text: str) -> "TresDocument":
+        sections = []
+        preamble = []
+        current = None
+        pending = None  # (key, start of text, raw value lines) of a multi-line value
+        for line in text.splitlines(keepends=True):
+            if pending is not None:
+                pending[2].append(line)
+                raw = "".join(pending[2])
+                if _is_complete(raw):
+                    body = raw.rstrip("\r\n")
+                    current._add(Property(pending[0], pending[1] + raw, body))
+                    pending = None
+                continue
+            if line.startswith("["):
+                current = _parse_header(line)
+                sections.append(current)
+                continue
+            m = _PROPERTY.match(line)
+            if m is None or current is None:
+                (current.entries if current is not None else preamble).append(line)
+                continue
+            key = m.group(1)
+            if key.startswith('"'):
+                key = _unescape(key[1:-1])
+            rest = line[m.end():]
+            if _is_complete(rest):
+                current._add(Property(key, line, rest.rstrip("\r\n")))
+            else:
+                pending = (key, line[:m.end()], [rest])
+        if pending is not None:
+            raise TresParseError(f"unterminated value for {pending[0]!r}")
+        return cls(sections, "".join(preamble))
+
+    # ── sections ──
+
+    @property
+    def header(self) -> Section:
+        """The [gd_resource] section."""
+        return self.sections[0]
+
+    @property
+    def script_class(self):
+        return self.header.attrs.get("script_class")
+
+    @property
+    def ext_resources(self) -> list[Section]:
+        return [s for s in self.sections if s.tag == "ext_resource"]
+
+    @property
+    def sub_resources(self) -> list[Section]:
+        return [s for s in self.sections if s.tag == "sub_resource"]
+
+    @property
+    def resource(self) -> Section:
+        """The main [resource] section (an empty one if the file has none)."""
+        for s in self.sections:
+            if s.tag == "resource":
+                return s
+        return Section("resource", {}, "[resource]\n")
+
+    def ext_resource(self, ref) -> Section | None:
+        """The [ext_resource] for an ExtResource reference or id."""
+        ext_id = ref.id if isinstance(ref, ExtResource) else ref
+        for s in self.sections:
+            if s.tag == "ext_resource" and s.attrs.get("id") == ext_id:
+                return s
+        return None
+
+    def ext_path(self, ref) -> str | None:
+        """res:// path of an ExtResource reference (None for anything else)."""
+        if not isinstance(ref, (ExtResource, str)):
+            return None
+        s = self.ext_resource(ref)
+        return s.attrs.get("path") if s else None
+
+    def sub_resource(self, ref) -> Section | None:
+        """The [sub_resource] for a SubResource reference or id."""
+        sub_id = ref.id if isinstance(ref, SubResource) else ref
+        for s in self.sections:
+            if s.tag == "sub_resource" and s.attrs.get("id") == sub_id:
+                return s
+        return None
+
+    # ── output ──
+
+    def dumps(self) -> str:
+        return self.preamble + "".join(s.dumps() for s in self.sections)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(self.dumps())
+
+
+def loads(text: str) -> TresDocument:
+    return TresDocument.parse(text)
+
+
+def load(path) -> TresDocument:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return TresDocument.parse(f.read())
+
+
+def iter_tres(root) -> list[Path]:
+    """Every .tres under `root`, in sorted order."""
+    return sorted(Path(root).rglob("*.tres"))
+
+
+# ─── generation ──────────────────────────────────────────────────────────────
+
+_ID_CHARS = string.ascii_lowercase + string.digits
+
+
+def stable_id(*parts, length: int = 5) -> str:
+    """Deterministic resource id, e.g. stable_id(item_id, res_path) or
+    stable_id(item_id, "stat_modifiers/0").
+
+    Same alphabet and length as the editor's random ids, but the same
+    inputs always give the same id, so regenerating unchanged content
+    reproduces the file byte for byte.
+    """
+    n = int.from_bytes(hashlib.sha1("\x1f".join(map(str, parts)).encode("utf-8")).digest()[:8], "big")
+    chars = []
+    for _ in range(length):
+        n, r = divmod(n, len(_ID_CHARS))
+        chars.append(_ID_CHARS[r])
+    return "".join(chars)
+
+
+def format_tres(script_class: str, ext_resources: list, sub_resources: list, properties: dict,
+                resource_type: str = "Resource") -> str:
+    """Text of a new .tres file in the editor's layout.
+
+    ext_resources are (type, path, id) tuples, sub_resources are
+    (type, id, {key: value}) tuples; property values are Python values as
+    accepted by format_value(), written in dict order.
+    """
+    lines = [f'[gd_resource type="{resource_type}" script_class="{script_class}" format=3]', ""]
+    for res_type, path, eid in ext_resources:
+        lines.append(f'[ext_resource type="{res_type}" path="{path}" id="{eid}"]')
+    lines.append("")
+    for res_type, sid, props in sub_resources:
+        lines.append(f'[sub_resource type="{res_type}" id="{sid}"]')
+        lines.extend(f"{k} = {format_value(v)}" for k, v in props.items())
+        lines.append("")
+    lines.append("[resource]")
+    lines.extend(f"{k} = {format_value(v)}" for k, v in properties.items())
+    lines.append("")
+    return "\n".join(lines)
+
+
+def write_if_changed(path, content: str, apply: bool = True) -> str:
+    """Write `content` to `path` unless the file already holds exactly these bytes.
+
+    Returns "created", "modified" or "unchanged". Unchanged files are not
+    touched, so their mtime stays and Godot does not reimport them. With
+    apply=False nothing is written and the status says what would happen.
+    """
+    data = content.encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return "unchanged"
+        status = "modified"
+    except FileNotFoundError:
+        status = "created"
+    if apply:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+    return status